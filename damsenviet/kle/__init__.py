@@ -2,16 +2,67 @@ from .keyboard import Keyboard
 from .metadata import Metadata
 from .background import Background
 from .key import Key
+from .keylist import KeyList
 from .switch import Switch
-from .label import Label
+from .label import Label, Labels
+from .playback import (
+    PlaybackState,
+    register_key_change,
+    unregister_key_change,
+    register_metadata_change,
+    unregister_metadata_change,
+)
 from .utils import json_dump_options
+from importlib import import_module
 
 __all__ = [
     "Keyboard",
     "Metadata",
     "Background",
     "Key",
+    "KeyList",
     "Switch",
     "Label",
+    "Labels",
+    "KeyTable",
+    "KeyboardBuffer",
+    "ParseCache",
+    "KeyboardCache",
+    "KeyGeometry",
+    "SpatialIndex",
+    "KeyGraph",
+    "render_svg",
+    "PlaybackState",
+    "register_key_change",
+    "unregister_key_change",
+    "register_metadata_change",
+    "unregister_metadata_change",
     "json_dump_options",
 ]
+
+_lazy_modules = {
+    "KeyTable": "table",
+    "KeyboardBuffer": "binary",
+    "ParseCache": "cache",
+    "KeyboardCache": "cache",
+    "KeyGeometry": "geometry",
+    "SpatialIndex": "spatial",
+    "KeyGraph": "adjacency",
+    "render_svg": "svg",
+}
+"""
+Exports imported on first access, to keep the package quick to import.
+"""
+
+
+def __getattr__(name):
+    module_name = _lazy_modules.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,264 @@
+from __future__ import annotations
+from typing import (
+    Optional,
+    Tuple,
+    List,
+    Dict,
+    Iterable,
+    Sequence,
+)
+from math import radians, cos, sin
+from operator import itemgetter
+from .key import Key
+from .geometry import (
+    _computed_rows,
+    _candidate_pairs,
+    _key_rectangles,
+    _rectangles_distance,
+)
+
+__all__ = ["KeyGraph"]
+
+
+Cluster = Optional[Tuple[float, float, float]]
+
+
+class KeyGraph:
+    """Neighbours of Keys, from their rotated shapes.
+
+    Keys are neighbours when their primary or secondary rectangles are at
+    most ``gap`` apart. Pairs of Keys whose bounds are apart by more are
+    pruned by a sweep over the bounds, only the remaining pairs are measured
+    exactly. The graph is a snapshot, it does not follow later changes to the
+    Keys.
+
+    .. code-block:: python
+
+        graph = keyboard.key_graph()
+        for i, key in enumerate(keyboard.keys):
+            neighbours = [keyboard.keys[j] for j in graph.neighbours(i)]
+        positions = graph.matrix()
+    """
+
+    __slots__ = (
+        "__keys",
+        "__rows",
+        "__neighbours",
+    )
+
+    def __init__(
+        self,
+        keys: Iterable[Key] = (),
+        gap: float = 0.25,
+        vectorized: Optional[bool] = None,
+    ):
+        """Finds the neighbours of Keys.
+
+        :param keys: Keys, indexes follow their order
+        :param gap: distance in key units Keys may be apart by and still be
+            neighbours
+        :param vectorized: True to require numpy, False to compute in pure
+            Python, None to use numpy when installed
+        """
+        self.__keys: List[Key] = list(keys)
+        self.__rows: List[Tuple[float, ...]] = [key._geometry for key in self.__keys]
+        corners, secondary_corners, _, bounds = _computed_rows(self.__rows, vectorized)
+        rectangles: List[List[Sequence[float]]] = [
+            _key_rectangles(
+                row,
+                corners[i * 8 : i * 8 + 8],
+                secondary_corners[i * 8 : i * 8 + 8],
+            )
+            for i, row in enumerate(self.__rows)
+        ]
+        self.__neighbours: List[List[int]] = [list() for _ in self.__keys]
+        for i, j in _candidate_pairs(bounds, gap):
+            if (
+                min(
+                    _rectangles_distance(rectangle, other_rectangle)
+                    for rectangle in rectangles[i]
+                    for other_rectangle in rectangles[j]
+                )
+                <= gap + 1e-9
+            ):
+                self.__neighbours[i].append(j)
+                self.__neighbours[j].append(i)
+        for neighbours in self.__neighbours:
+            neighbours.sort()
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+    @property
+    def keys(self) -> List[Key]:
+        """Keys of the graph, in index order."""
+        return list(self.__keys)
+
+    def neighbours(self, index: int) -> List[int]:
+        """Neighbours of a Key.
+
+        :param index: index of the Key
+        :return: indexes of the neighbouring Keys, in ascending order
+        """
+        return list(self.__neighbours[index])
+
+    def edges(self) -> List[Tuple[int, int]]:
+        """Pairs of neighbouring Keys.
+
+        :return: pairs of indexes, lowest first, in ascending order
+        """
+        return [
+            (i, j)
+            for i, neighbours in enumerate(self.__neighbours)
+            for j in neighbours
+            if i < j
+        ]
+
+    def clusters(self) -> List[List[int]]:
+        """Groups of Keys rotated by the same angle about the same origin.
+
+        Unrotated Keys form a single group, whatever their rotation origin.
+
+        :return: indexes of the Keys of each group, groups in order of their
+            first Key
+        """
+        clusters: Dict[Cluster, List[int]] = dict()
+        for i, row in enumerate(self.__rows):
+            clusters.setdefault(_cluster(row), list()).append(i)
+        return list(clusters.values())
+
+    def matrix(self, row_tolerance: float = 0.5) -> List[Optional[Tuple[int, int]]]:
+        """Infers a switch matrix row and column for each Key.
+
+        Rows are chains of neighbouring Keys of a cluster, see ``clusters``,
+        side by side in the unrotated frame of the cluster, so that column
+        staggered layouts keep their rows. Rows whose rotated positions line
+        up are merged, joining the Keys of other clusters, split halves and
+        gaps between blocks. Columns follow the rotated positions of the Keys
+        along their row. Decals are not switches and get no position.
+
+        :param row_tolerance: distance in key units the tops of Keys side by
+            side, or of rows lined up, may differ by
+        :return: row and column of each Key, None for decals
+        """
+        rows: List[Tuple[float, ...]] = self.__rows
+        keys: List[Key] = self.__keys
+        # keys side by side, each linked to at most one key on either side so
+        # that rows don't branch, closest tops first
+        links: List[Tuple[float, int, int]] = list()
+        for i, j in self.edges():
+            if keys[i].is_decal or keys[j].is_decal:
+                continue
+            if _cluster(rows[i]) != _cluster(rows[j]):
+                continue
+            x, y = _row_point(rows[i])
+            other_x, other_y = _row_point(rows[j])
+            offset: float = abs(y - other_y)
+            if offset <= row_tolerance and abs(x - other_x) > offset:
+                links.append((offset, i, j) if x < other_x else (offset, j, i))
+        links.sort()
+        parents: List[int] = list(range(len(keys)))
+        linked_right: List[bool] = [False] * len(keys)
+        linked_left: List[bool] = [False] * len(keys)
+        for _, left, right in links:
+            if linked_right[left] or linked_left[right]:
+                continue
+            linked_right[left] = linked_left[right] = True
+            parents[_root(parents, left)] = _root(parents, right)
+        chains: Dict[int, List[int]] = dict()
+        for i in range(len(keys)):
+            if not keys[i].is_decal:
+                chains.setdefault(_root(parents, i), list()).append(i)
+        groups: List[Tuple[float, List[Tuple[float, int]]]] = sorted(
+            (_row_group(rows, chain) for chain in chains.values()),
+            key=itemgetter(0),
+        )
+        # chains lined up after rotation are merged
+        matrix_rows: List[List[Tuple[float, int]]] = list()
+        row_start: float = 0.0
+        for position, row_keys in groups:
+            if matrix_rows and position - row_start <= row_tolerance:
+                matrix_rows[-1].extend(row_keys)
+            else:
+                row_start = position
+                matrix_rows.append(row_keys)
+        positions: List[Optional[Tuple[int, int]]] = [None] * len(keys)
+        for row, row_keys in enumerate(matrix_rows):
+            row_keys.sort()
+            for column, (_, i) in enumerate(row_keys):
+                positions[i] = (row, column)
+        return positions
+
+
+def _root(parents: List[int], i: int) -> int:
+    """Finds the representative of a set, halving the path to it.
+
+    :param parents: parent of each element, roots are their own parent
+    :param i: element of the set
+    :return: root of the set
+    """
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+
+def _row_group(
+    rows: List[Tuple[float, ...]],
+    chain: List[int],
+) -> Tuple[float, List[Tuple[float, int]]]:
+    """Rotated position of a row of Keys.
+
+    :param rows: geometry of each Key, see ``Key._geometry``
+    :param chain: indexes of the Keys of the row
+    :return: mean rotated y of the Keys and their rotated x and index
+    """
+    keys: List[Tuple[float, int]] = list()
+    total: float = 0.0
+    for i in chain:
+        x, y = _rotated_row_point(rows[i])
+        total += y
+        keys.append((x, i))
+    return (total / len(chain), keys)
+
+
+def _cluster(row: Tuple[float, ...]) -> Cluster:
+    """Rotation shared by the Keys of a cluster.
+
+    :param row: geometry of a Key, see ``Key._geometry``
+    :return: angle and origin of the rotation, None for unrotated Keys
+    """
+    if row[10] == 0:
+        return None
+    return (row[10], row[8], row[9])
+
+
+def _row_point(row: Tuple[float, ...]) -> Tuple[float, float]:
+    """Point a Key is placed in its row by, before rotation.
+
+    The middle of the top key unit, so that tall Keys sit in their top row.
+
+    :param row: geometry of a Key, see ``Key._geometry``
+    :return: x, y of the point
+    """
+    x, y, width, height = row[:4]
+    return (x + width / 2, y + min(height, 1.0) / 2)
+
+
+def _rotated_row_point(row: Tuple[float, ...]) -> Tuple[float, float]:
+    """Point a Key is placed in its row by, after rotation.
+
+    :param row: geometry of a Key, see ``Key._geometry``
+    :return: x, y of the point
+    """
+    x, y = _row_point(row)
+    rotation_x, rotation_y, rotation_angle = row[8:11]
+    if rotation_angle == 0:
+        return (x, y)
+    angle: float = radians(rotation_angle)
+    dx: float = x - rotation_x
+    dy: float = y - rotation_y
+    return (
+        rotation_x + dx * cos(angle) - dy * sin(angle),
+        rotation_y + dx * sin(angle) + dy * cos(angle),
+    )
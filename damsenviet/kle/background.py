@@ -1,4 +1,6 @@
 from __future__ import annotations
+from typing import Any, Tuple
+from .utils import _fingerprint, _frozen_class
 
 __all__ = ["Background"]
 
@@ -6,11 +8,60 @@ __all__ = ["Background"]
 class Background:
     """Background information."""
 
+    __slots__ = (
+        "__name",
+        "__style",
+    )
+
     def __init__(self):
         """Initializes a Background."""
         self.__name: str = ""
         self.__style: str = ""
 
+    def __getstate__(self) -> Tuple[str, str]:
+        """Compact pickled state."""
+        return (self.__name, self.__style)
+
+    def __setstate__(self, state: Tuple[str, str]) -> None:
+        self.__name, self.__style = state
+
+    def _frozen(self) -> Background:
+        """Immutable copy of the Background, see ``Keyboard.freeze``.
+
+        :return: frozen Background
+        """
+        background = _FrozenBackground.__new__(_FrozenBackground)
+        background.__setstate__(self.__getstate__())
+        return background
+
+    def _thawed(self) -> Background:
+        """Mutable copy of the Background, see ``Keyboard.thaw``.
+
+        :return: Background instance
+        """
+        background = Background.__new__(Background)
+        background.__setstate__(self.__getstate__())
+        return background
+
+    def equals(self, other: Any) -> bool:
+        """Compares the name and style with another Background.
+
+        :param other: object to compare
+        :return: whether other is a Background with the same name and style
+        """
+        return (
+            isinstance(other, Background)
+            and self.__name == other.__name
+            and self.__style == other.__style
+        )
+
+    def fingerprint(self) -> int:
+        """Stable 128-bit hash of the name and style.
+
+        :return: fingerprint
+        """
+        return _fingerprint((), (self.__name, self.__style))
+
     @property
     def name(self) -> str:
         """Name of the background option."""
@@ -28,3 +79,6 @@ class Background:
     @style.setter
     def style(self, style: str) -> None:
         self.__style = style
+
+
+_FrozenBackground = _frozen_class(Background)
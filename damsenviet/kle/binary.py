@@ -0,0 +1,790 @@
+from __future__ import annotations
+from typing import (
+    Any,
+    Union,
+    Optional,
+    Tuple,
+    List,
+    Dict,
+    Callable,
+    Iterator,
+    Sequence,
+)
+from itertools import accumulate
+from operator import gt
+from mmap import mmap, ACCESS_READ
+from os import PathLike
+from struct import Struct, pack, unpack_from, error as StructError
+from .metadata import Metadata
+from .key import Key
+from .label import _LabelStyle, _label_style
+from .switch import _switch_record
+from .keyboard import Keyboard
+
+__all__ = ["KeyboardBuffer"]
+
+
+_magic = b"KLEB"
+"""
+Leading bytes of the binary encoding.
+"""
+
+_version = 2
+"""
+Version of the binary encoding, incremented on incompatible changes.
+"""
+
+_header = Struct("<4sHHIIIIIIII")
+"""
+Magic, version, flags, then the key, template and label style counts, the size
+of the templates, the label, escaped position and string counts and the
+string data size.
+"""
+
+_wide = 1
+"""
+Header flag of encodings with 32-bit indexes and offsets, see _is_wide.
+"""
+
+_metadata_record = Struct("<11IB")
+"""
+String indexes of the name, author, notes, background name and style,
+background color, radii, css, switch mount, brand and type, followed by the
+pcb and plate mount flags.
+"""
+
+# records with 16-bit and 32-bit indexes, by the wide flag
+
+_template_records = (Struct("<HHB6H"), Struct("<HHB6I"))
+"""
+Everything but the position and labels of a key, shared by the keys that are
+alike. A mask of the numbers that are stored and a mask of the ones that are
+ints, flags, then string indexes of the color, default text color, profile
+and row, switch mount, brand and type. The stored numbers follow as doubles,
+see _template_defaults.
+"""
+
+_template_defaults = (1.0, 1.0, 0.0, 0.0, None, None, 0.0, 0.0, 0.0, 3)
+"""
+Values of the width, height, x2, y2, width2, height2, rotation x, rotation y,
+rotation angle and default text size of a template when they are not stored,
+None for width2 and height2 that default to the width and height.
+"""
+
+_style_records = (Struct("<dBH"), Struct("<dBI"))
+"""
+Label size, whether it is an int and string index of the color.
+"""
+
+_key_records = (Struct("<HhhBB"), Struct("<IhhBB"))
+"""
+Template index, x and y in hundredths of a key unit, label count and position
+flags, see _encoded_position.
+"""
+
+_label_records = (Struct("<BBH"), Struct("<BII"))
+"""
+Label index, label style index and string index of the text.
+"""
+
+_offset_formats = ("H", "I")
+"""
+Format of the offsets of the strings in the string data.
+"""
+
+_position_scale = 100
+"""
+Positions are stored as int16 multiples of ``1 / _position_scale`` key units,
+others are escaped to doubles.
+"""
+
+_escape_counts = bytes((flags & 1) + (flags >> 2 & 1) for flags in range(256))
+"""
+Number of escaped positions of a key by its position flags.
+"""
+
+_decode_errors = (IndexError, StructError, OverflowError)
+"""
+Errors raised by decoding a corrupt body, out of range indexes, truncated
+records and infinite ints, reported as ValueError.
+"""
+
+_flags: List[Tuple[bool, bool, bool, bool]] = [
+    (bool(flags & 1), bool(flags & 2), bool(flags & 4), bool(flags & 8))
+    for flags in range(16)
+]
+"""
+Ghosted, stepped, homing and decal flags by their packed value.
+"""
+
+
+class _StringTable:
+    """Deduplicated strings being encoded, referenced by index."""
+
+    __slots__ = (
+        "indexes",
+        "data",
+        "offsets",
+    )
+
+    def __init__(self):
+        self.indexes: Dict[str, int] = {"": 0}
+        self.data: List[bytes] = [b""]
+        self.offsets: List[int] = [0, 0]
+
+    def index(self, string: str) -> int:
+        """Adds a string to the table.
+
+        :param string: string to reference
+        :return: index of the string
+        """
+        index: Optional[int] = self.indexes.get(string)
+        if index is None:
+            index = self.indexes[string] = len(self.data)
+            encoded: bytes = string.encode("utf-8", "surrogatepass")
+            self.data.append(encoded)
+            self.offsets.append(self.offsets[-1] + len(encoded))
+        return index
+
+
+def _is_default(value: Union[int, float], default: Union[int, float]) -> bool:
+    """Determines whether a number can be left out for its default.
+
+    :param value: number to store
+    :param default: value decoded when the number is not stored
+    :return: whether the default decodes to the same type, value and sign
+    """
+    return (
+        type(value) is type(default)
+        and value == default
+        and (value != 0 or str(value)[0] != "-")
+    )
+
+
+def _encoded_position(
+    value: Union[int, float],
+    escapes: List[float],
+) -> Tuple[int, int]:
+    """Encodes a position as an int16, escaping it to a double when inexact.
+
+    :param value: x or y of a key
+    :param escapes: escaped positions, appended to
+    :return: stored int16 and flags, bit 0 marks the value as escaped and bit
+        1 as an int
+    """
+    is_int: int = 2 if type(value) is int else 0
+    # also rules out nan and infinities
+    if -32768 / _position_scale <= value <= 32767 / _position_scale:
+        scaled: int = round(value * _position_scale)
+        if is_int:
+            if scaled // _position_scale == value:
+                return (scaled, is_int)
+        # -0.0 would decode as 0.0
+        elif scaled / _position_scale == value and (scaled or str(value)[0] != "-"):
+            return (scaled, is_int)
+    escapes.append(value)
+    return (0, is_int | 1)
+
+
+def _is_wide(
+    template_count: int,
+    style_count: int,
+    string_count: int,
+    string_data_size: int,
+) -> bool:
+    """Determines whether indexes and offsets need 32 bits.
+
+    :param template_count: number of templates
+    :param style_count: number of label styles
+    :param string_count: number of strings
+    :param string_data_size: size of the string data
+    :return: whether any index or offset overflows the 16-bit records
+    """
+    return (
+        template_count > 1 << 16
+        or style_count > 1 << 8
+        or string_count > 1 << 16
+        or string_data_size >= 1 << 16
+    )
+
+
+def _encoded_keyboard(keyboard: Keyboard) -> bytes:
+    """Encodes a Keyboard into the binary encoding.
+
+    :param keyboard: Keyboard to encode
+    :return: encoded bytes
+    """
+    strings: _StringTable = _StringTable()
+    index = strings.index
+    metadata: Metadata = keyboard.metadata
+    metadata_bytes: bytes = _metadata_record.pack(
+        index(metadata.name),
+        index(metadata.author),
+        index(metadata.notes),
+        index(metadata.background.name),
+        index(metadata.background.style),
+        index(metadata.background_color),
+        index(metadata.radii),
+        index(metadata.css),
+        index(metadata.switch.mount),
+        index(metadata.switch.brand),
+        index(metadata.switch.type),
+        metadata.is_switches_pcb_mounted
+        | metadata.include_switches_pcb_mounted << 1
+        | metadata.is_switches_plate_mounted << 2
+        | metadata.include_switches_plate_mounted << 3,
+    )
+    # deduplicated with their numbers packed, which tells ints, floats and
+    # signed zeros apart
+    templates: Dict[Tuple, int] = dict()
+    styles: Dict[Tuple, int] = dict()
+    key_records: List[Tuple] = list()
+    label_records: List[Tuple] = list()
+    escapes: List[float] = list()
+    for key in keyboard.keys:
+        state: Tuple = key.__getstate__()
+        default_label_style = state[1]
+        numbers = state[4:13] + (default_label_style.size,)
+        stored_mask: int = 0
+        int_mask: int = 0
+        stored: List[Union[int, float]] = list()
+        for i, number in enumerate(numbers):
+            if type(number) is int:
+                int_mask |= 1 << i
+            default = _template_defaults[i]
+            if not _is_default(number, numbers[i - 4] if default is None else default):
+                stored_mask |= 1 << i
+                stored.append(number)
+        switch_record = state[18]
+        template: Tuple = (
+            stored_mask,
+            int_mask,
+            state[13] | state[14] << 1 | state[15] << 2 | state[16] << 3,
+            index(state[0]),
+            index(default_label_style.color),
+            index(state[17]),
+            index(switch_record.mount),
+            index(switch_record.brand),
+            index(switch_record.type),
+            pack(f"<{len(stored)}d", *stored),
+        )
+        template_index: Optional[int] = templates.get(template)
+        if template_index is None:
+            template_index = templates[template] = len(templates)
+        x, x_flags = _encoded_position(state[2], escapes)
+        y, y_flags = _encoded_position(state[3], escapes)
+        labels = state[19]
+        key_records.append(
+            (template_index, x, y, len(labels) // 3, x_flags | y_flags << 2)
+        )
+        for i in range(0, len(labels), 3):
+            label_style = labels[i + 2]
+            style: Tuple = (
+                pack("<d", label_style.size),
+                type(label_style.size) is int,
+                index(label_style.color),
+            )
+            style_index: Optional[int] = styles.get(style)
+            if style_index is None:
+                style_index = styles[style] = len(styles)
+            label_records.append((labels[i], style_index, index(labels[i + 1])))
+    string_data: bytes = b"".join(strings.data)
+    wide: bool = _is_wide(
+        len(templates), len(styles), len(strings.data), len(string_data)
+    )
+    pack_template = _template_records[wide].pack
+    template_bytes: bytes = b"".join(
+        pack_template(*template[:-1]) + template[-1] for template in templates
+    )
+    pack_style = _style_records[wide].pack
+    pack_key = _key_records[wide].pack
+    pack_label = _label_records[wide].pack
+    return b"".join(
+        [
+            _header.pack(
+                _magic,
+                _version,
+                _wide if wide else 0,
+                len(key_records),
+                len(templates),
+                len(styles),
+                len(template_bytes),
+                len(label_records),
+                len(escapes),
+                len(strings.data),
+                len(string_data),
+            ),
+            metadata_bytes,
+            template_bytes,
+            *(
+                pack_style(unpack_from("<d", size)[0], is_int, color)
+                for size, is_int, color in styles
+            ),
+            *(pack_key(*record) for record in key_records),
+            *(pack_label(*record) for record in label_records),
+            pack(f"<{len(escapes)}d", *escapes),
+            pack(f"<{len(strings.offsets)}{_offset_formats[wide]}", *strings.offsets),
+            string_data,
+        ]
+    )
+
+
+def _corrupt(error: Exception) -> ValueError:
+    """Creates the error reported for a corrupt body.
+
+    :param error: error raised while decoding
+    :return: error to be raised
+    """
+    return ValueError(f"Buffer holds a corrupt Keyboard encoding: {error}")
+
+
+def _decoded_metadata(record: Tuple, string: Callable[[int], str]) -> Metadata:
+    """Materializes Metadata from its record.
+
+    :param record: metadata record
+    :param string: string by index
+    :return: Metadata instance
+    """
+    metadata: Metadata = Metadata()
+    metadata.name = string(record[0])
+    metadata.author = string(record[1])
+    metadata.notes = string(record[2])
+    metadata.background.name = string(record[3])
+    metadata.background.style = string(record[4])
+    metadata.background_color = string(record[5])
+    metadata.radii = string(record[6])
+    metadata.css = string(record[7])
+    metadata.switch.mount = string(record[8])
+    metadata.switch.brand = string(record[9])
+    metadata.switch.type = string(record[10])
+    flags: int = record[11]
+    metadata.is_switches_pcb_mounted = bool(flags & 1)
+    metadata.include_switches_pcb_mounted = bool(flags & 2)
+    metadata.is_switches_plate_mounted = bool(flags & 4)
+    metadata.include_switches_plate_mounted = bool(flags & 8)
+    return metadata
+
+
+def _decoded_template(
+    record: Tuple,
+    stored: Tuple[float, ...],
+    string: Callable[[int], str],
+) -> Tuple[Tuple, Tuple]:
+    """Decodes the state shared by the keys of a template.
+
+    :param record: template record
+    :param stored: stored numbers of the template
+    :param string: string by index
+    :return: Key state before and after the position, see ``Key.__getstate__``
+    """
+    stored_mask, int_mask = record[:2]
+    numbers: List = list(_template_defaults)
+    position: int = 0
+    for i in range(10):
+        if stored_mask & 1 << i:
+            number = stored[position]
+            numbers[i] = int(number) if int_mask & 1 << i else number
+            position += 1
+        elif numbers[i] is None:
+            numbers[i] = numbers[i - 4]
+    return (
+        (
+            string(record[3]),
+            _label_style(string(record[4]), numbers[9]),
+        ),
+        (
+            *numbers[:9],
+            *_flags[record[2]],
+            string(record[5]),
+            _switch_record(string(record[6]), string(record[7]), string(record[8])),
+        ),
+    )
+
+
+def _decoded_position(
+    value: int,
+    flags: int,
+    escapes: Sequence[float],
+    escape: int,
+) -> Union[int, float]:
+    """Decodes a position, see _encoded_position.
+
+    :param value: stored int16
+    :param flags: flags of the position
+    :param escapes: escaped positions
+    :param escape: index of the escaped position, if the value is escaped
+    :return: x or y of a key
+    """
+    if flags & 1:
+        return int(escapes[escape]) if flags & 2 else escapes[escape]
+    return value // _position_scale if flags & 2 else value / _position_scale
+
+
+class KeyboardBuffer(Sequence):
+    """Read-only view of a Keyboard in the binary encoding of ``Keyboard.to_bytes``.
+
+    The buffer is read in place, strings are decoded and Keys are materialized
+    only when accessed. Files are memory mapped by ``KeyboardBuffer.open``.
+
+    .. code-block:: python
+
+        with KeyboardBuffer.open("keyboard.kleb") as buffer:
+            key = buffer[0]
+            keyboard = buffer.to_keyboard()
+    """
+
+    def __init__(self, buffer: Any):
+        """Initializes a KeyboardBuffer over a bytes-like object.
+
+        :param buffer: bytes, bytearray, memoryview or mmap of the encoding
+        :raises ValueError: if the buffer is not a supported encoding
+        """
+        self.__mmap: Optional[mmap] = None
+        self.__view: memoryview = memoryview(buffer).cast("B")
+        try:
+            self.__read_header()
+        except Exception:
+            # a view left exported would keep an mmap from closing
+            self.__view.release()
+            raise
+        self.__strings: List[Optional[str]] = [None] * self.__string_count
+        self.__keys: List[Optional[Key]] = [None] * self.__key_count
+        self.__metadata: Optional[Metadata] = None
+        # decoded on first access to a key
+        self.__templates: Optional[List[Tuple[Tuple, Tuple]]] = None
+        self.__styles: Optional[List[_LabelStyle]] = None
+        self.__label_starts: Optional[List[int]] = None
+        self.__escape_starts: Optional[List[int]] = None
+
+    def __read_header(self) -> None:
+        """Reads the counts and offsets of the encoding.
+
+        :raises ValueError: if the buffer is not a supported encoding
+        """
+        if len(self.__view) < _header.size:
+            raise ValueError("Buffer is too short to hold a Keyboard encoding.")
+        (
+            magic,
+            version,
+            flags,
+            self.__key_count,
+            self.__template_count,
+            self.__style_count,
+            template_size,
+            self.__label_count,
+            self.__escape_count,
+            self.__string_count,
+            string_data_size,
+        ) = _header.unpack_from(self.__view, 0)
+        if magic != _magic:
+            raise ValueError("Buffer is not a Keyboard encoding.")
+        if version != _version:
+            raise ValueError(
+                f"Unsupported Keyboard encoding version {version}, "
+                f"expected {_version}."
+            )
+        wide: bool = bool(flags & _wide)
+        self.__template_record: Struct = _template_records[wide]
+        self.__style_record: Struct = _style_records[wide]
+        self.__key_record: Struct = _key_records[wide]
+        self.__label_record: Struct = _label_records[wide]
+        self.__offset_format: str = _offset_formats[wide]
+        self.__metadata_offset: int = _header.size
+        self.__templates_offset: int = self.__metadata_offset + _metadata_record.size
+        self.__styles_offset: int = self.__templates_offset + template_size
+        self.__keys_offset: int = (
+            self.__styles_offset + self.__style_count * self.__style_record.size
+        )
+        self.__labels_offset: int = (
+            self.__keys_offset + self.__key_count * self.__key_record.size
+        )
+        self.__escapes_offset: int = (
+            self.__labels_offset + self.__label_count * self.__label_record.size
+        )
+        self.__offsets_offset: int = self.__escapes_offset + self.__escape_count * 8
+        self.__strings_offset: int = self.__offsets_offset + (
+            self.__string_count + 1
+        ) * (4 if wide else 2)
+        if len(self.__view) < self.__strings_offset + string_data_size:
+            raise ValueError("Buffer is too short for its Keyboard encoding.")
+        self.__string_data_size: int = string_data_size
+
+    @classmethod
+    def open(cls, path: Union[str, PathLike]) -> KeyboardBuffer:
+        """Memory maps a file holding the binary encoding of a Keyboard.
+
+        :param path: path of the file
+        :return: KeyboardBuffer instance, to be closed
+        """
+        with open(path, "rb") as fp:
+            mapped: mmap = mmap(fp.fileno(), 0, access=ACCESS_READ)
+        try:
+            buffer: KeyboardBuffer = cls(mapped)
+        except Exception:
+            mapped.close()
+            raise
+        buffer.__mmap = mapped
+        return buffer
+
+    def close(self) -> None:
+        """Releases the buffer, materialized Keys remain valid."""
+        self.__view.release()
+        if self.__mmap is not None:
+            self.__mmap.close()
+            self.__mmap = None
+
+    def __enter__(self) -> KeyboardBuffer:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of keys in the buffer."""
+        return self.__key_count
+
+    def __string(self, index: int) -> str:
+        string: Optional[str] = self.__strings[index]
+        if string is None:
+            start, end = unpack_from(
+                f"<2{self.__offset_format}",
+                self.__view,
+                self.__offsets_offset
+                + index * (2 if self.__offset_format == "H" else 4),
+            )
+            if not start <= end <= self.__string_data_size:
+                raise IndexError(f"string {index} out of the string data")
+            string = self.__strings[index] = str(
+                self.__view[
+                    self.__strings_offset + start : self.__strings_offset + end
+                ],
+                "utf-8",
+                "surrogatepass",
+            )
+        return string
+
+    def __decoded_strings(self) -> List[str]:
+        """Decodes every string at once, keeping those already decoded.
+
+        :return: strings by index
+        """
+        view: memoryview = self.__view
+        offsets: Tuple[int, ...] = unpack_from(
+            f"<{self.__string_count + 1}{self.__offset_format}",
+            view,
+            self.__offsets_offset,
+        )
+        if offsets[-1] > self.__string_data_size or any(map(gt, offsets, offsets[1:])):
+            raise IndexError("strings out of the string data")
+        string_data: bytes = bytes(view[self.__strings_offset :])
+        self.__strings = [
+            (
+                string
+                if string is not None
+                else str(
+                    string_data[offsets[i] : offsets[i + 1]], "utf-8", "surrogatepass"
+                )
+            )
+            for i, string in enumerate(self.__strings)
+        ]
+        return self.__strings
+
+    def __records(self, record: Struct, offset: int, count: int) -> List[Tuple]:
+        """Unpacks consecutive records.
+
+        :param record: record layout
+        :param offset: offset of the first record
+        :param count: number of records
+        :return: unpacked records
+        """
+        with self.__view[offset : offset + count * record.size] as view:
+            return list(record.iter_unpack(view))
+
+    def __tables(self, string: Callable[[int], str]) -> None:
+        """Decodes the templates and label styles, and where the labels and
+        escaped positions of each key start.
+
+        :param string: string by index
+        """
+        if self.__templates is not None:
+            return
+        view: memoryview = self.__view
+        template_record: Struct = self.__template_record
+        templates: List[Tuple[Tuple, Tuple]] = list()
+        offset: int = self.__templates_offset
+        for _ in range(self.__template_count):
+            record: Tuple = template_record.unpack_from(view, offset)
+            offset += template_record.size
+            count: int = bin(record[0]).count("1")
+            templates.append(
+                _decoded_template(
+                    record, unpack_from(f"<{count}d", view, offset), string
+                )
+            )
+            offset += count * 8
+        if offset != self.__styles_offset:
+            raise IndexError("templates out of the template data")
+        styles: List[_LabelStyle] = [
+            _label_style(string(color), int(size) if is_int else size)
+            for size, is_int, color in self.__records(
+                self.__style_record, self.__styles_offset, self.__style_count
+            )
+        ]
+        # label counts and position flags are the last bytes of key records
+        size: int = self.__key_record.size
+        end: int = self.__keys_offset + self.__key_count * size
+        label_counts: bytes = bytes(view[self.__keys_offset + size - 2 : end : size])
+        escape_counts: bytes = bytes(
+            view[self.__keys_offset + size - 1 : end : size]
+        ).translate(_escape_counts)
+        label_starts: List[int] = [0, *accumulate(label_counts)]
+        escape_starts: List[int] = [0, *accumulate(escape_counts)]
+        if label_starts[-1] != self.__label_count:
+            raise IndexError("label counts don't add up to the labels")
+        if escape_starts[-1] != self.__escape_count:
+            raise IndexError("escaped positions don't add up")
+        self.__styles = styles
+        self.__label_starts = label_starts
+        self.__escape_starts = escape_starts
+        # last, the tables are only decoded once
+        self.__templates = templates
+
+    @property
+    def metadata(self) -> Metadata:
+        """Metadata Information, decoded on first access."""
+        if self.__metadata is None:
+            try:
+                self.__metadata = _decoded_metadata(
+                    _metadata_record.unpack_from(self.__view, self.__metadata_offset),
+                    self.__string,
+                )
+            except _decode_errors as error:
+                raise _corrupt(error) from error
+        return self.__metadata
+
+    def __key(self, index: int) -> Key:
+        string: Callable[[int], str] = self.__string
+        self.__tables(string)
+        view: memoryview = self.__view
+        template, x, y, label_count, flags = self.__key_record.unpack_from(
+            view, self.__keys_offset + index * self.__key_record.size
+        )
+        escapes: Tuple[float, ...] = unpack_from(
+            f"<{_escape_counts[flags]}d",
+            view,
+            self.__escapes_offset + self.__escape_starts[index] * 8,
+        )
+        x = _decoded_position(x, flags, escapes, 0)
+        y = _decoded_position(y, flags >> 2, escapes, flags & 1)
+        labels: List = list()
+        label_record: Struct = self.__label_record
+        offset: int = (
+            self.__labels_offset + self.__label_starts[index] * label_record.size
+        )
+        for i in range(label_count):
+            position, style, text = label_record.unpack_from(
+                view, offset + i * label_record.size
+            )
+            if position >= 12:
+                raise IndexError(f"label index {position} out of range")
+            labels.extend((position, string(text), self.__styles[style]))
+        head, tail = self.__templates[template]
+        key: Key = Key.__new__(Key)
+        key.__setstate__(head + (x, y) + tail + (tuple(labels),))
+        return key
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Key, List[Key]]:
+        """Materializes a Key on first access.
+
+        :param index: key index or slice
+        :return: Key, or list of Keys for slices
+        """
+        if type(index) is slice:
+            return [self[i] for i in range(self.__key_count)[index]]
+        if index < 0:
+            index += self.__key_count
+        if index < 0 or index >= self.__key_count:
+            raise IndexError("key index out of range")
+        key: Optional[Key] = self.__keys[index]
+        if key is None:
+            try:
+                key = self.__keys[index] = self.__key(index)
+            except _decode_errors as error:
+                raise _corrupt(error) from error
+        return key
+
+    def __iter__(self) -> Iterator[Key]:
+        for i in range(self.__key_count):
+            yield self[i]
+
+    def to_keyboard(self) -> Keyboard:
+        """Materializes every Key into a Keyboard.
+
+        Keys already materialized are copied, the Keyboard is independent of
+        the buffer.
+
+        :return: Keyboard instance
+        :raises ValueError: if the buffer holds a corrupt encoding
+        """
+        try:
+            return self.__materialized()
+        except _decode_errors as error:
+            raise _corrupt(error) from error
+
+    def __materialized(self) -> Keyboard:
+        """Materializes every Key, see ``to_keyboard``.
+
+        :return: Keyboard instance
+        """
+        # decoded all at once, unlike on access
+        strings: List[str] = self.__decoded_strings()
+        string: Callable[[int], str] = strings.__getitem__
+        self.__tables(string)
+        keyboard: Keyboard = Keyboard()
+        keyboard.metadata = _decoded_metadata(
+            _metadata_record.unpack_from(self.__view, self.__metadata_offset), string
+        )
+        templates: List[Tuple[Tuple, Tuple]] = self.__templates
+        styles: List[_LabelStyle] = self.__styles
+        # flattened like the labels of Key.__getstate__
+        labels: Tuple = tuple(
+            value
+            for position, style, text in self.__records(
+                self.__label_record, self.__labels_offset, self.__label_count
+            )
+            for value in (position, strings[text], styles[style])
+        )
+        if labels and max(labels[::3]) >= 12:
+            raise IndexError("label index out of range")
+        escapes: Tuple[float, ...] = unpack_from(
+            f"<{self.__escape_count}d", self.__view, self.__escapes_offset
+        )
+        materialized: List[Optional[Key]] = self.__keys
+        keys: List[Key] = list()
+        append = keys.append
+        new = Key.__new__
+        setstate = Key.__setstate__
+        label_start: int = 0
+        escape: int = 0
+        for i, (template, x, y, label_count, flags) in enumerate(
+            self.__records(self.__key_record, self.__keys_offset, self.__key_count)
+        ):
+            label_end: int = label_start + label_count * 3
+            if flags:
+                x = _decoded_position(x, flags, escapes, escape)
+                escape += flags & 1
+                y = _decoded_position(y, flags >> 2, escapes, escape)
+                escape += flags >> 2 & 1
+            else:
+                x /= _position_scale
+                y /= _position_scale
+            if materialized[i] is not None:
+                append(materialized[i].__deepcopy__({}))
+            else:
+                head, tail = templates[template]
+                key: Key = new(Key)
+                setstate(key, head + (x, y) + tail + (labels[label_start:label_end],))
+                append(key)
+            label_start = label_end
+        keyboard.keys = keys
+        return keyboard
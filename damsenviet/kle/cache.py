@@ -0,0 +1,551 @@
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Union,
+    Optional,
+    Tuple,
+    List,
+    Dict,
+)
+import os
+from os import PathLike
+from sys import getsizeof
+from json import loads, dumps
+from threading import Lock
+from collections import OrderedDict
+
+if TYPE_CHECKING:
+    from .keyboard import Keyboard, Keyboard_JSON
+
+__all__ = ["ParseCache", "KeyboardCache"]
+
+
+_entry_suffix = ".kleb"
+_alias_suffix = ".ref"
+_digest_size = 20
+
+_satisfying_modes = {
+    "full": ("full",),
+    "fast": ("fast", "full"),
+    "off": ("off", "fast", "full"),
+}
+"""
+Validation modes of the entries accepted for each requested validation mode.
+"""
+
+
+def _digest(*parts: bytes) -> str:
+    """Hashes the parts of a cache key.
+
+    :param parts: parts of the key
+    :return: hexadecimal digest
+    """
+    from hashlib import blake2b
+
+    h = blake2b(digest_size=_digest_size)
+    for part in parts:
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.hexdigest()
+
+
+def _check_validate(validate: str) -> None:
+    """Checks a validation mode.
+
+    :param validate: validation mode
+    :raises ValueError: if the mode is invalid
+    """
+    if validate not in _satisfying_modes:
+        raise ValueError(
+            f"Invalid validate mode {validate!r}, "
+            "expected one of ('full', 'fast', 'off')."
+        )
+
+
+class ParseCache:
+    """Content-addressed on-disk cache of parsed layouts.
+
+    Layouts are stored in the binary encoding of ``Keyboard.to_bytes``, keyed
+    by a hash of the raw KLE JSON bytes and the validation mode. Files are
+    also looked up by path, modification time and size, so that unchanged
+    files are neither read nor hashed. Entries validated more strictly are
+    reused for less strict requests.
+
+    The directory can be shared by many processes. Entries are written to a
+    temporary file then atomically renamed, readers only ever see complete
+    entries. Once the entries exceed ``max_bytes``, the least recently used
+    are evicted. The directory is scanned on the first write, then only once
+    the entries written since exceed the limit, counting the entries written
+    by other processes then.
+
+    .. code-block:: python
+
+        cache = ParseCache(".kle-cache")
+        keyboard = cache.load("keyboard.json")
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, PathLike],
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        """Initializes a ParseCache, creating its directory.
+
+        :param directory: directory holding the entries
+        :param max_bytes: total size of the entries kept
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be positive.")
+        self.__directory: str = os.path.abspath(directory)
+        self.__max_bytes: int = max_bytes
+        # total size of the entries, scanned on the first write
+        self.__size: Optional[int] = None
+        os.makedirs(self.__directory, exist_ok=True)
+
+    def __getstate__(self) -> Tuple[str, int]:
+        """Pickled to be shared with the workers of ``Keyboard.load_many``."""
+        return (self.__directory, self.__max_bytes)
+
+    def __setstate__(self, state: Tuple[str, int]) -> None:
+        self.__directory, self.__max_bytes = state
+        self.__size = None
+
+    @property
+    def directory(self) -> str:
+        """Directory holding the entries."""
+        return self.__directory
+
+    @property
+    def max_bytes(self) -> int:
+        """Total size of the entries kept."""
+        return self.__max_bytes
+
+    def loads(self, data: Union[str, bytes], validate: str = "full") -> Keyboard:
+        """Deserializes a KLE JSON document, parsing it only on a miss.
+
+        :param data: KLE JSON text or UTF-8 encoded bytes
+        :param validate: validation mode, one of ``"full"``, ``"fast"``, ``"off"``
+        :return: Keyboard instance, independent of the cache
+        """
+        _check_validate(validate)
+        data = data.encode("utf-8", "surrogatepass") if type(data) is str else data
+        keyboard, _ = self.__loaded_data(data, validate)
+        return keyboard
+
+    def load(self, path: Union[str, PathLike], validate: str = "full") -> Keyboard:
+        """Loads and deserializes a KLE JSON file, parsing it only on a miss.
+
+        :param path: path of the KLE JSON file
+        :param validate: validation mode, one of ``"full"``, ``"fast"``, ``"off"``
+        :return: Keyboard instance, independent of the cache
+        """
+        _check_validate(validate)
+        with open(path, "rb") as fp:
+            stat = os.fstat(fp.fileno())
+            file_keys: List[str] = [
+                _digest(
+                    os.fsencode(os.path.abspath(path)),
+                    str(stat.st_mtime_ns).encode(),
+                    str(stat.st_size).encode(),
+                    mode.encode(),
+                )
+                for mode in _satisfying_modes[validate]
+            ]
+            for file_key in file_keys:
+                digest: Optional[bytes] = self.__read(file_key + _alias_suffix)
+                if digest is None:
+                    continue
+                keyboard: Optional[Keyboard] = self.__decoded(
+                    digest.decode("ascii") + _entry_suffix
+                )
+                if keyboard is not None:
+                    self.__touch(file_key + _alias_suffix)
+                    return keyboard
+            data: bytes = fp.read()
+        keyboard, key = self.__loaded_data(data, validate)
+        self.__write(file_keys[0] + _alias_suffix, key.encode("ascii"))
+        return keyboard
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        for name, _, _ in self.__entries():
+            self.__remove(name)
+        self.__size = None
+
+    def __loaded_data(self, data: bytes, validate: str) -> Tuple[Keyboard, str]:
+        """Deserializes KLE JSON bytes through the entries.
+
+        :param data: UTF-8 encoded KLE JSON
+        :param validate: validation mode
+        :return: Keyboard instance and the key of its entry
+        """
+        from .keyboard import Keyboard
+
+        for mode in _satisfying_modes[validate]:
+            key: str = _digest(data, mode.encode())
+            keyboard: Optional[Keyboard] = self.__decoded(key + _entry_suffix)
+            if keyboard is not None:
+                return keyboard, key
+        key = _digest(data, validate.encode())
+        keyboard = Keyboard.from_json(loads(data), validate)
+        self.__write(key + _entry_suffix, keyboard.to_bytes())
+        return keyboard, key
+
+    def __decoded(self, name: str) -> Optional[Keyboard]:
+        """Decodes an entry, marking it as recently used.
+
+        :param name: file name of the entry
+        :return: Keyboard instance, None on a miss
+        """
+        from .keyboard import Keyboard
+
+        data: Optional[bytes] = self.__read(name)
+        if data is None:
+            return None
+        try:
+            keyboard: Keyboard = Keyboard.from_bytes(data)
+        except ValueError:
+            # written by an incompatible version
+            self.__remove(name)
+            return None
+        self.__touch(name)
+        return keyboard
+
+    def __read(self, name: str) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.__directory, name), "rb") as fp:
+                return fp.read()
+        except OSError:
+            # missing or evicted by another process
+            return None
+
+    def __touch(self, name: str) -> None:
+        try:
+            os.utime(os.path.join(self.__directory, name))
+        except OSError:
+            pass
+
+    def __remove(self, name: str) -> None:
+        try:
+            os.remove(os.path.join(self.__directory, name))
+        except OSError:
+            pass
+
+    def __write(self, name: str, data: bytes) -> None:
+        """Atomically writes an entry, then evicts entries over the limit.
+
+        Failing to write only loses the entry.
+
+        :param name: file name of the entry
+        :param data: content of the entry
+        """
+        from tempfile import mkstemp
+
+        try:
+            fd, temporary_path = mkstemp(dir=self.__directory, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(data)
+            os.replace(temporary_path, os.path.join(self.__directory, name))
+        except OSError:
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+            return
+        self.__evict(len(data))
+
+    def __entries(self) -> List[Tuple[str, int, int]]:
+        """Lists the entries.
+
+        :return: file names with their last use and size
+        """
+        entries: List[Tuple[str, int, int]] = list()
+        try:
+            scanned = os.scandir(self.__directory)
+        except OSError:
+            return entries
+        with scanned:
+            for entry in scanned:
+                if not entry.name.endswith((_entry_suffix, _alias_suffix)):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        return entries
+
+    def __evict(self, written: int) -> None:
+        """Counts a written entry, evicting the least recently used over the limit.
+
+        :param written: size of the written entry
+        """
+        if self.__size is not None:
+            self.__size += written
+            if self.__size <= self.__max_bytes:
+                return
+        entries: List[Tuple[str, int, int]] = self.__entries()
+        size: int = sum(entry_size for _, _, entry_size in entries)
+        if size > self.__max_bytes:
+            entries.sort(key=lambda entry: entry[1])
+            for name, _, entry_size in entries:
+                if size <= self.__max_bytes:
+                    break
+                self.__remove(name)
+                size -= entry_size
+        self.__size = size
+
+
+def _canonical_digest(keyboard_json: Keyboard_JSON) -> str:
+    """Hashes a KLE JSON regardless of its formatting and key order.
+
+    :param keyboard_json: parsed KLE JSON
+    :return: hexadecimal digest
+    """
+    return _digest(
+        dumps(
+            keyboard_json,
+            ensure_ascii=False,
+            allow_nan=True,
+            separators=(",", ":"),
+            sort_keys=True,
+        ).encode("utf-8", "surrogatepass")
+    )
+
+
+def _estimated_size(keyboard: Keyboard) -> int:
+    """Estimates the memory held by a Keyboard.
+
+    Label styles and switch records shared between Keys are not counted.
+
+    :param keyboard: Keyboard to measure
+    :return: size in bytes
+    """
+    keys = keyboard.keys
+    if len(keys) == 0:
+        return getsizeof(keys)
+    key = keys[0]
+    key_size: int = getsizeof(key) + getsizeof(key.labels) + getsizeof(key.switch)
+    label_size: int = getsizeof(key.labels[0])
+    size: int = getsizeof(keys) + key_size * len(keys)
+    for key in keys:
+        labels = key.__getstate__()[19]
+        size += getsizeof(labels) + label_size * (len(labels) // 3)
+        for i in range(1, len(labels), 3):
+            size += getsizeof(labels[i])
+    return size
+
+
+class _CacheEntry:
+    """Keyboard held by a KeyboardCache.
+
+    :ivar keyboard: frozen snapshot of the cached Keyboard
+    :ivar size: estimated size of the Keyboard
+    :ivar aliases: digests of the raw documents that resolved to the entry
+    """
+
+    __slots__ = (
+        "keyboard",
+        "size",
+        "aliases",
+    )
+
+    def __init__(self, keyboard: Keyboard, size: int):
+        self.keyboard: Keyboard = keyboard
+        self.size: int = size
+        self.aliases: List[Tuple[str, str]] = list()
+
+
+class KeyboardCache:
+    """Bounded in-process LRU cache of parsed layouts.
+
+    Documents are keyed by a canonical hash of their KLE JSON, so that the
+    formatting and key order of the documents don't matter. Raw documents are
+    also looked up by a hash of their text, skipping the JSON parsing. The
+    cache holds frozen snapshots, see ``Keyboard.freeze``, callers get mutable
+    copies, made in full by ``Keyboard.thaw`` on every call, or the shared
+    snapshots. The cache can be shared by threads.
+
+    .. code-block:: python
+
+        cache = KeyboardCache(max_items=256, max_bytes=64 * 1024 * 1024)
+        keyboard = cache.get(request_body)
+        snapshot = cache.get(request_body, frozen=True)
+        print(cache.hits, cache.misses, cache.evictions)
+    """
+
+    def __init__(self, max_items: int = 128, max_bytes: Optional[int] = None):
+        """Initializes a KeyboardCache.
+
+        :param max_items: number of Keyboards kept
+        :param max_bytes: estimated memory held by the kept Keyboards,
+            unbounded by default
+        """
+        if max_items < 0:
+            raise ValueError("max_items must be positive.")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must be positive.")
+        self.__max_items: int = max_items
+        self.__max_bytes: Optional[int] = max_bytes
+        self.__entries: OrderedDict[Tuple[str, str], _CacheEntry] = OrderedDict()
+        # raw document digests, by validation mode, to canonical entry keys
+        self.__aliases: Dict[Tuple[str, str], Tuple[str, str]] = dict()
+        self.__size: int = 0
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__evictions: int = 0
+        self.__lock: Lock = Lock()
+
+    @property
+    def max_items(self) -> int:
+        """Number of Keyboards kept."""
+        return self.__max_items
+
+    @property
+    def max_bytes(self) -> Optional[int]:
+        """Estimated memory held by the kept Keyboards."""
+        return self.__max_bytes
+
+    @property
+    def size(self) -> int:
+        """Estimated memory held by the cached Keyboards."""
+        return self.__size
+
+    @property
+    def hits(self) -> int:
+        """Number of lookups served from the cache."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups that parsed their document."""
+        return self.__misses
+
+    @property
+    def evictions(self) -> int:
+        """Number of Keyboards evicted to stay within the limits."""
+        return self.__evictions
+
+    def __len__(self) -> int:
+        """Number of cached Keyboards."""
+        return len(self.__entries)
+
+    def get(
+        self,
+        keyboard_json: Union[str, bytes, Keyboard_JSON],
+        validate: str = "full",
+        frozen: bool = False,
+    ) -> Keyboard:
+        """Deserializes a KLE JSON, parsing it only on a miss.
+
+        :param keyboard_json: KLE JSON text, UTF-8 encoded bytes or parsed
+        :param validate: validation mode, one of ``"full"``, ``"fast"``, ``"off"``
+        :param frozen: whether to return the shared snapshot, without copying
+        :return: Keyboard instance, a mutable copy of every Key owned by the
+            caller unless frozen
+        """
+        from .keyboard import Keyboard
+
+        _check_validate(validate)
+        modes: Tuple[str, ...] = _satisfying_modes[validate]
+        raw_digest: Optional[str] = None
+        if isinstance(keyboard_json, (str, bytes)):
+            raw_digest = _digest(
+                keyboard_json.encode("utf-8", "surrogatepass")
+                if isinstance(keyboard_json, str)
+                else keyboard_json
+            )
+            keyboard: Optional[Keyboard] = self.__lookup(
+                [self.__aliases.get((raw_digest, mode)) for mode in modes]
+            )
+            if keyboard is not None:
+                return keyboard if frozen else keyboard.thaw()
+            keyboard_json = loads(keyboard_json)
+        canonical_digest: str = _canonical_digest(keyboard_json)
+        keyboard = self.__lookup(
+            [(canonical_digest, mode) for mode in modes],
+            None if raw_digest is None else (raw_digest, validate),
+        )
+        if keyboard is not None:
+            return keyboard if frozen else keyboard.thaw()
+        keyboard = Keyboard.from_json(keyboard_json, validate)
+        snapshot: Keyboard = keyboard.freeze()
+        self.__insert(
+            (canonical_digest, validate),
+            snapshot,
+            None if raw_digest is None else (raw_digest, validate),
+        )
+        return snapshot if frozen else keyboard
+
+    def clear(self) -> None:
+        """Removes every Keyboard, the counters are kept."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__aliases.clear()
+            self.__size = 0
+
+    def __lookup(
+        self,
+        entry_keys: List[Optional[Tuple[str, str]]],
+        alias: Optional[Tuple[str, str]] = None,
+    ) -> Optional[Keyboard]:
+        """Finds the first cached entry of a lookup.
+
+        :param entry_keys: keys of the entries accepted, in order of preference
+        :param alias: raw document digest to resolve to the entry found
+        :return: frozen snapshot of the cached Keyboard, None on a miss
+        """
+        with self.__lock:
+            for entry_key in entry_keys:
+                entry: Optional[_CacheEntry] = (
+                    None if entry_key is None else self.__entries.get(entry_key)
+                )
+                if entry is None:
+                    continue
+                self.__entries.move_to_end(entry_key)
+                self.__hits += 1
+                if alias is not None and alias not in self.__aliases:
+                    self.__aliases[alias] = entry_key
+                    entry.aliases.append(alias)
+                return entry.keyboard
+        return None
+
+    def __insert(
+        self,
+        entry_key: Tuple[str, str],
+        keyboard: Keyboard,
+        alias: Optional[Tuple[str, str]],
+    ) -> None:
+        """Caches a parsed Keyboard, evicting the least recently used.
+
+        :param entry_key: canonical digest and validation mode
+        :param keyboard: frozen snapshot of the parsed Keyboard
+        :param alias: raw document digest resolving to the entry
+        """
+        size: int = _estimated_size(keyboard)
+        with self.__lock:
+            self.__misses += 1
+            if self.__max_items == 0 or (
+                self.__max_bytes is not None and size > self.__max_bytes
+            ):
+                return
+            entry: Optional[_CacheEntry] = self.__entries.get(entry_key)
+            if entry is None:
+                # not parsed concurrently by another thread
+                entry = self.__entries[entry_key] = _CacheEntry(keyboard, size)
+                self.__size += size
+            self.__entries.move_to_end(entry_key)
+            if alias is not None and alias not in self.__aliases:
+                self.__aliases[alias] = entry_key
+                entry.aliases.append(alias)
+            while len(self.__entries) > self.__max_items or (
+                self.__max_bytes is not None and self.__size > self.__max_bytes
+            ):
+                _, evicted = self.__entries.popitem(last=False)
+                for evicted_alias in evicted.aliases:
+                    del self.__aliases[evicted_alias]
+                self.__size -= evicted.size
+                self.__evictions += 1
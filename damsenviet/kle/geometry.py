@@ -0,0 +1,710 @@
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Optional,
+    Tuple,
+    List,
+    Dict,
+    Iterable,
+    Sequence,
+)
+from array import array
+from itertools import chain
+from math import radians, cos, sin, hypot, inf
+from .key import Key
+
+if TYPE_CHECKING:
+    from .table import KeyTable
+
+__all__ = ["KeyGeometry"]
+
+
+Point = Tuple[float, float]
+Bounds = Tuple[float, float, float, float]
+
+_geometry_columns = [
+    "x",
+    "y",
+    "width",
+    "height",
+    "x2",
+    "y2",
+    "width2",
+    "height2",
+    "rotation_x",
+    "rotation_y",
+    "rotation_angle",
+]
+"""
+Key properties the geometry is computed from, in the order of ``Key._geometry``.
+"""
+
+
+def _numpy(vectorized: Optional[bool]) -> Any:
+    """Imports numpy when computations are vectorized.
+
+    :param vectorized: True to require numpy, None to use it when installed
+    :return: numpy module, None to compute in pure Python
+    """
+    if vectorized is False:
+        return None
+    try:
+        import numpy
+    except ImportError as error:
+        if vectorized:
+            raise ImportError(
+                "vectorized KeyGeometry requires numpy, "
+                "install it with: pip3 install damsenviet.kle[numpy]"
+            ) from error
+        return None
+    return numpy
+
+
+def _outline(
+    left: float,
+    top: float,
+    width: float,
+    height: float,
+    rotation_x: float,
+    rotation_y: float,
+    cos_1: float,
+    sin_: float,
+) -> Tuple[float, ...]:
+    """Corners of a rectangle rotated about the rotation origin.
+
+    Offsets are applied with the cosine minus one, unrotated rectangles keep
+    their exact coordinates.
+
+    :param left: unrotated left edge
+    :param top: unrotated top edge
+    :param width: rectangle width
+    :param height: rectangle height
+    :param rotation_x: x of the rotation origin
+    :param rotation_y: y of the rotation origin
+    :param cos_1: cosine of the rotation angle minus one
+    :param sin_: sine of the rotation angle
+    :return: flattened x, y of the top left, top right, bottom right and
+        bottom left corners
+    """
+    dx: float = left - rotation_x
+    dy: float = top - rotation_y
+    x0: float = left + dx * cos_1 - dy * sin_
+    y0: float = top + dx * sin_ + dy * cos_1
+    width_x: float = width * (cos_1 + 1.0)
+    width_y: float = width * sin_
+    height_x: float = -height * sin_
+    height_y: float = height * (cos_1 + 1.0)
+    return (
+        x0,
+        y0,
+        x0 + width_x,
+        y0 + width_y,
+        x0 + width_x + height_x,
+        y0 + width_y + height_y,
+        x0 + height_x,
+        y0 + height_y,
+    )
+
+
+def _computed(
+    rows: Iterable[Tuple[float, ...]],
+) -> Tuple[array, array, array, array]:
+    """Computes the outlines, centers and bounds key by key.
+
+    :param rows: geometry of each key, see ``Key._geometry``
+    :return: flattened corners, secondary corners, centers and bounds
+    """
+    corners: List[float] = list()
+    secondary_corners: List[float] = list()
+    centers: List[float] = list()
+    bounds: List[float] = list()
+    rotations: Dict[float, Tuple[float, float]] = dict()
+    for (
+        x,
+        y,
+        width,
+        height,
+        x2,
+        y2,
+        width2,
+        height2,
+        rotation_x,
+        rotation_y,
+        rotation_angle,
+    ) in rows:
+        if rotation_angle == 0:
+            primary = (x, y, x + width, y, x + width, y + height, x, y + height)
+            left: float = x + x2
+            top: float = y + y2
+            secondary = (
+                left,
+                top,
+                left + width2,
+                top,
+                left + width2,
+                top + height2,
+                left,
+                top + height2,
+            )
+            centers.extend((x + width / 2, y + height / 2))
+        else:
+            rotation: Optional[Tuple[float, float]] = rotations.get(rotation_angle)
+            if rotation is None:
+                angle: float = radians(rotation_angle)
+                rotation = rotations[rotation_angle] = (cos(angle) - 1.0, sin(angle))
+            cos_1, sin_ = rotation
+            primary = _outline(x, y, width, height, rotation_x, rotation_y, cos_1, sin_)
+            secondary = _outline(
+                x + x2, y + y2, width2, height2, rotation_x, rotation_y, cos_1, sin_
+            )
+            center_x: float = x + width / 2
+            center_y: float = y + height / 2
+            dx: float = center_x - rotation_x
+            dy: float = center_y - rotation_y
+            centers.extend(
+                (
+                    center_x + dx * cos_1 - dy * sin_,
+                    center_y + dx * sin_ + dy * cos_1,
+                )
+            )
+        corners.extend(primary)
+        secondary_corners.extend(secondary)
+        xs = primary[0::2] + secondary[0::2]
+        ys = primary[1::2] + secondary[1::2]
+        bounds.extend((min(xs), min(ys), max(xs), max(ys)))
+    return (
+        array("d", corners),
+        array("d", secondary_corners),
+        array("d", centers),
+        array("d", bounds),
+    )
+
+
+def _vectorized_outline(
+    numpy: Any,
+    left: Any,
+    top: Any,
+    width: Any,
+    height: Any,
+    rotation_x: Any,
+    rotation_y: Any,
+    cos_1: Any,
+    sin_: Any,
+) -> Tuple[Any, Any]:
+    """Corners of rectangles rotated about their rotation origins.
+
+    Vectorized ``_outline``, computed in the same order.
+
+    :return: x and y of the corners, arrays of shape (4, keys)
+    """
+    dx = left - rotation_x
+    dy = top - rotation_y
+    x0 = left + dx * cos_1 - dy * sin_
+    y0 = top + dx * sin_ + dy * cos_1
+    width_x = width * (cos_1 + 1.0)
+    width_y = width * sin_
+    height_x = -height * sin_
+    height_y = height * (cos_1 + 1.0)
+    return (
+        numpy.stack((x0, x0 + width_x, x0 + width_x + height_x, x0 + height_x)),
+        numpy.stack((y0, y0 + width_y, y0 + width_y + height_y, y0 + height_y)),
+    )
+
+
+def _vectorized(
+    numpy: Any,
+    columns: Sequence[Any],
+) -> Tuple[array, array, array, array]:
+    """Computes the outlines, centers and bounds of all keys at once.
+
+    Values are computed key-minor, reductions run across whole rows.
+
+    :param numpy: numpy module
+    :param columns: arrays of the properties in ``_geometry_columns``
+    :return: flattened corners, secondary corners, centers and bounds
+    """
+    (
+        x,
+        y,
+        width,
+        height,
+        x2,
+        y2,
+        width2,
+        height2,
+        rotation_x,
+        rotation_y,
+        rotation_angle,
+    ) = columns
+    angle = numpy.radians(rotation_angle)
+    cos_1 = numpy.cos(angle) - 1.0
+    sin_ = numpy.sin(angle)
+    xs, ys = _vectorized_outline(
+        numpy, x, y, width, height, rotation_x, rotation_y, cos_1, sin_
+    )
+    xs2, ys2 = _vectorized_outline(
+        numpy, x + x2, y + y2, width2, height2, rotation_x, rotation_y, cos_1, sin_
+    )
+    center_x = x + width / 2
+    center_y = y + height / 2
+    dx = center_x - rotation_x
+    dy = center_y - rotation_y
+    all_xs = numpy.concatenate((xs, xs2))
+    all_ys = numpy.concatenate((ys, ys2))
+    # transposed into key-major order while copied
+    return tuple(
+        array("d", numpy.stack(result, axis=-1).tobytes())
+        for result in (
+            (xs.T, ys.T),
+            (xs2.T, ys2.T),
+            (
+                center_x + dx * cos_1 - dy * sin_,
+                center_y + dx * sin_ + dy * cos_1,
+            ),
+            (
+                all_xs.min(axis=0),
+                all_ys.min(axis=0),
+                all_xs.max(axis=0),
+                all_ys.max(axis=0),
+            ),
+        )
+    )
+
+
+def _computed_rows(
+    rows: List[Tuple[float, ...]],
+    vectorized: Optional[bool],
+) -> Tuple[array, array, array, array]:
+    """Computes the outlines, centers and bounds of keys.
+
+    :param rows: geometry of each key, see ``Key._geometry``
+    :param vectorized: True to require numpy, False to compute in pure
+        Python, None to use numpy when installed
+    :return: flattened corners, secondary corners, centers and bounds
+    """
+    numpy: Any = _numpy(vectorized)
+    if numpy is None:
+        return _computed(rows)
+    values = numpy.fromiter(
+        chain.from_iterable(rows),
+        dtype=numpy.float64,
+        count=len(rows) * len(_geometry_columns),
+    ).reshape((len(rows), len(_geometry_columns)))
+    return _vectorized(numpy, values.T)
+
+
+def _axes(corners: Sequence[float]) -> Tuple[Point, Point]:
+    """Unit vectors along the edges of a rotated rectangle.
+
+    :param corners: flattened corners, as computed by ``_outline``
+    :return: directions of the top and left edges
+    """
+    axis_x: float = corners[2] - corners[0]
+    axis_y: float = corners[3] - corners[1]
+    length: float = hypot(axis_x, axis_y)
+    if length == 0:
+        # no width, perpendicular to the left edge
+        axis_x = corners[7] - corners[1]
+        axis_y = corners[0] - corners[6]
+        length = hypot(axis_x, axis_y)
+        if length == 0:
+            return ((1.0, 0.0), (0.0, 1.0))
+    axis_x /= length
+    axis_y /= length
+    return ((axis_x, axis_y), (-axis_y, axis_x))
+
+
+def _aligned(corners: Sequence[float]) -> bool:
+    """Whether a rectangle is axis-aligned, as unrotated rectangles are.
+
+    :param corners: flattened corners, as computed by ``_outline``
+    :return: whether the top edge is horizontal and the left edge vertical
+    """
+    return corners[1] == corners[3] and corners[0] == corners[6]
+
+
+def _rectangles_overlap(
+    corners: Sequence[float],
+    other_corners: Sequence[float],
+    tolerance: float,
+) -> bool:
+    """Separating axis test of two rotated rectangles.
+
+    :param corners: flattened corners, as computed by ``_outline``
+    :param other_corners: flattened corners of the other rectangle
+    :param tolerance: depth the rectangles must overlap by, negative to also
+        count rectangles apart by less
+    :return: whether no edge direction separates the rectangles
+    """
+    if _aligned(corners) and _aligned(other_corners):
+        return (
+            min(max(corners[0], corners[4]), max(other_corners[0], other_corners[4]))
+            - max(min(corners[0], corners[4]), min(other_corners[0], other_corners[4]))
+            > tolerance
+            and min(
+                max(corners[1], corners[5]), max(other_corners[1], other_corners[5])
+            )
+            - max(min(corners[1], corners[5]), min(other_corners[1], other_corners[5]))
+            > tolerance
+        )
+    for axis_x, axis_y in _axes(corners) + _axes(other_corners):
+        projections: List[float] = [
+            corners[i] * axis_x + corners[i + 1] * axis_y for i in range(0, 8, 2)
+        ]
+        other_projections: List[float] = [
+            other_corners[i] * axis_x + other_corners[i + 1] * axis_y
+            for i in range(0, 8, 2)
+        ]
+        if (
+            max(projections) - min(other_projections) <= tolerance
+            or max(other_projections) - min(projections) <= tolerance
+        ):
+            return False
+    return True
+
+
+def _point_segment_distance(
+    x: float,
+    y: float,
+    x0: float,
+    y0: float,
+    x1: float,
+    y1: float,
+) -> float:
+    """Distance from a point to a segment.
+
+    :return: distance from (x, y) to the segment from (x0, y0) to (x1, y1)
+    """
+    dx: float = x1 - x0
+    dy: float = y1 - y0
+    length: float = dx * dx + dy * dy
+    t: float = 0.0
+    if length != 0:
+        t = max(0.0, min(1.0, ((x - x0) * dx + (y - y0) * dy) / length))
+    return hypot(x0 + t * dx - x, y0 + t * dy - y)
+
+
+def _rectangles_distance(
+    corners: Sequence[float],
+    other_corners: Sequence[float],
+) -> float:
+    """Distance between two rotated rectangles.
+
+    :param corners: flattened corners, as computed by ``_outline``
+    :param other_corners: flattened corners of the other rectangle
+    :return: distance, 0 when they overlap or touch
+    """
+    if _aligned(corners) and _aligned(other_corners):
+        return hypot(
+            max(
+                0.0,
+                min(other_corners[0], other_corners[4]) - max(corners[0], corners[4]),
+                min(corners[0], corners[4]) - max(other_corners[0], other_corners[4]),
+            ),
+            max(
+                0.0,
+                min(other_corners[1], other_corners[5]) - max(corners[1], corners[5]),
+                min(corners[1], corners[5]) - max(other_corners[1], other_corners[5]),
+            ),
+        )
+    if _rectangles_overlap(corners, other_corners, 0.0):
+        return 0.0
+    distance: float = inf
+    # apart rectangles are nearest at a corner of either
+    for points, edges in ((corners, other_corners), (other_corners, corners)):
+        for i in range(0, 8, 2):
+            for j in range(0, 8, 2):
+                k: int = (j + 2) % 8
+                distance = min(
+                    distance,
+                    _point_segment_distance(
+                        points[i],
+                        points[i + 1],
+                        edges[j],
+                        edges[j + 1],
+                        edges[k],
+                        edges[k + 1],
+                    ),
+                )
+    return distance
+
+
+def _key_rectangles(
+    row: Tuple[float, ...],
+    corners: Sequence[float],
+    secondary_corners: Sequence[float],
+) -> List[Sequence[float]]:
+    """Distinct rectangles of a key.
+
+    :param row: geometry of the key, see ``Key._geometry``
+    :param corners: flattened corners of the primary rectangle
+    :param secondary_corners: flattened corners of the secondary rectangle
+    :return: primary rectangle, then the secondary one unless it is the same
+    """
+    if row[4] == 0 and row[5] == 0 and row[6] == row[2] and row[7] == row[3]:
+        return [corners]
+    return [corners, secondary_corners]
+
+
+def _candidate_pairs(bounds: Sequence[float], margin: float) -> List[Tuple[int, int]]:
+    """Sweep and prune of axis-aligned bounds.
+
+    Bounds are sorted along the axis the keys spread the most on, each is
+    only compared to the following bounds that start before it ends.
+
+    :param bounds: flattened min x, min y, max x, max y of each key
+    :param margin: distance bounds may be apart by and still be paired
+    :return: pairs of indexes, lowest first, of bounds apart by at most the
+        margin
+    """
+    if len(bounds) == 0:
+        return []
+    starts: Sequence[float] = bounds[0::4]
+    cross_starts: Sequence[float] = bounds[1::4]
+    ends: Sequence[float] = bounds[2::4]
+    cross_ends: Sequence[float] = bounds[3::4]
+    if max(cross_ends) - min(cross_starts) > max(ends) - min(starts):
+        starts, cross_starts, ends, cross_ends = cross_starts, starts, cross_ends, ends
+    order: List[int] = sorted(range(len(starts)), key=starts.__getitem__)
+    count: int = len(order)
+    pairs: List[Tuple[int, int]] = list()
+    for position in range(count):
+        i: int = order[position]
+        end: float = ends[i] + margin
+        cross_start: float = cross_starts[i] - margin
+        cross_end: float = cross_ends[i] + margin
+        for other_position in range(position + 1, count):
+            j: int = order[other_position]
+            if starts[j] > end:
+                break
+            if cross_starts[j] <= cross_end and cross_start <= cross_ends[j]:
+                pairs.append((i, j) if i < j else (j, i))
+    return pairs
+
+
+def _overlapping_pairs(
+    rows: List[Tuple[float, ...]],
+    tolerance: float,
+    vectorized: Optional[bool],
+) -> List[Tuple[int, int]]:
+    """Pairs of keys whose rotated shapes overlap.
+
+    Pairs whose bounds overlap are found by a sweep, only those are tested
+    exactly on their primary and secondary rectangles.
+
+    :param rows: geometry of each key, see ``Key._geometry``
+    :param tolerance: depth the shapes must overlap by, so that keys sharing
+        an edge don't overlap through rounding
+    :param vectorized: True to require numpy, False to compute in pure
+        Python, None to use numpy when installed
+    :return: pairs of indexes, lowest first, in ascending order
+    """
+    corners, secondary_corners, _, bounds = _computed_rows(rows, vectorized)
+    rectangles: List[List[Sequence[float]]] = [
+        _key_rectangles(
+            row,
+            corners[i * 8 : i * 8 + 8],
+            secondary_corners[i * 8 : i * 8 + 8],
+        )
+        for i, row in enumerate(rows)
+    ]
+    pairs: List[Tuple[int, int]] = [
+        (i, j)
+        for i, j in _candidate_pairs(bounds, 0.0)
+        if any(
+            _rectangles_overlap(rectangle, other_rectangle, tolerance)
+            for rectangle in rectangles[i]
+            for other_rectangle in rectangles[j]
+        )
+    ]
+    pairs.sort()
+    return pairs
+
+
+class KeyGeometry:
+    """Rotated outlines, centers and bounds of Keys, computed in one pass.
+
+    Each Key has a primary rectangle at ``x``, ``y`` sized ``width`` by
+    ``height`` and a secondary rectangle offset by ``x2``, ``y2`` sized
+    ``width2`` by ``height2``, used by stepped and ISO shaped keys. Both are
+    rotated clockwise by ``rotation_angle`` degrees about ``rotation_x``,
+    ``rotation_y``. Coordinates are in key units, y grows downwards.
+
+    The computations are vectorized with numpy when it is installed. The
+    geometry is a snapshot, it does not follow later changes to the Keys.
+
+    .. code-block:: python
+
+        geometry = keyboard.geometry()
+        min_x, min_y, max_x, max_y = geometry.extent
+        for i, key in enumerate(keyboard.keys):
+            top_left, top_right, bottom_right, bottom_left = geometry.corners(i)
+    """
+
+    __slots__ = (
+        "__corners",
+        "__secondary_corners",
+        "__centers",
+        "__bounds",
+        "__extent",
+    )
+
+    def __init__(
+        self,
+        keys: Iterable[Key] = (),
+        vectorized: Optional[bool] = None,
+    ):
+        """Computes the geometry of Keys.
+
+        :param keys: Keys, indexes follow their order
+        :param vectorized: True to require numpy, False to compute in pure
+            Python, None to use numpy when installed
+        """
+        self.__set(_computed_rows([key._geometry for key in keys], vectorized))
+
+    @classmethod
+    def from_table(
+        cls,
+        table: KeyTable,
+        vectorized: Optional[bool] = None,
+    ) -> KeyGeometry:
+        """Computes the geometry of the rows of a KeyTable.
+
+        Vectorized computations read the table's columns without copying.
+
+        :param table: KeyTable, indexes follow its rows
+        :param vectorized: True to require numpy, False to compute in pure
+            Python, None to use numpy when installed
+        :return: KeyGeometry instance
+        """
+        geometry: KeyGeometry = cls.__new__(cls)
+        columns: Dict[str, Any] = table.columns
+        numpy: Any = _numpy(vectorized)
+        if numpy is None:
+            geometry.__set(
+                _computed(zip(*[columns[name] for name in _geometry_columns]))
+            )
+        else:
+            geometry.__set(
+                _vectorized(
+                    numpy,
+                    [
+                        numpy.frombuffer(columns[name], dtype=numpy.float64)
+                        for name in _geometry_columns
+                    ],
+                )
+            )
+        return geometry
+
+    def __set(self, computed: Tuple[array, array, array, array]) -> None:
+        """Stores the computed geometry and the extent of all keys.
+
+        :param computed: flattened corners, secondary corners, centers and
+            bounds
+        """
+        (
+            self.__corners,
+            self.__secondary_corners,
+            self.__centers,
+            self.__bounds,
+        ) = computed
+        bounds: array = self.__bounds
+        self.__extent: Optional[Bounds] = (
+            (
+                min(bounds[0::4]),
+                min(bounds[1::4]),
+                max(bounds[2::4]),
+                max(bounds[3::4]),
+            )
+            if len(bounds) > 0
+            else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.__centers) // 2
+
+    def __index(self, index: int) -> int:
+        """Resolves negative indexes.
+
+        :param index: index of the key
+        :return: positive index of the key
+        :raises IndexError: if there is no such key
+        """
+        length: int = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("key index out of range")
+        return index
+
+    def corners(self, index: int) -> List[Point]:
+        """Corners of the primary rectangle of a key.
+
+        :param index: index of the key
+        :return: top left, top right, bottom right and bottom left corners,
+            named by their position before rotation
+        """
+        start: int = self.__index(index) * 8
+        values: array = self.__corners
+        return [(values[i], values[i + 1]) for i in range(start, start + 8, 2)]
+
+    def secondary_corners(self, index: int) -> List[Point]:
+        """Corners of the secondary rectangle of a key.
+
+        :param index: index of the key
+        :return: top left, top right, bottom right and bottom left corners,
+            named by their position before rotation
+        """
+        start: int = self.__index(index) * 8
+        values: array = self.__secondary_corners
+        return [(values[i], values[i + 1]) for i in range(start, start + 8, 2)]
+
+    def center(self, index: int) -> Point:
+        """Center of the primary rectangle of a key.
+
+        :param index: index of the key
+        :return: x, y of the center
+        """
+        start: int = self.__index(index) * 2
+        return (self.__centers[start], self.__centers[start + 1])
+
+    def bounds(self, index: int) -> Bounds:
+        """Axis-aligned bounds of both rectangles of a key.
+
+        :param index: index of the key
+        :return: min x, min y, max x, max y
+        """
+        start: int = self.__index(index) * 4
+        return tuple(self.__bounds[start : start + 4])
+
+    @property
+    def extent(self) -> Optional[Bounds]:
+        """Axis-aligned bounds of all keys, None without keys."""
+        return self.__extent
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """Views the computed geometry as NumPy arrays without copying.
+
+        Arrays are named ``corners`` and ``secondary_corners`` shaped
+        (keys, 4, 2), ``centers`` shaped (keys, 2) and ``bounds`` shaped
+        (keys, 4).
+
+        :return: NumPy arrays by name
+        """
+        numpy: Any = _numpy(True)
+        length: int = len(self)
+        return {
+            "corners": numpy.frombuffer(self.__corners, dtype=numpy.float64).reshape(
+                (length, 4, 2)
+            ),
+            "secondary_corners": numpy.frombuffer(
+                self.__secondary_corners, dtype=numpy.float64
+            ).reshape((length, 4, 2)),
+            "centers": numpy.frombuffer(self.__centers, dtype=numpy.float64).reshape(
+                (length, 2)
+            ),
+            "bounds": numpy.frombuffer(self.__bounds, dtype=numpy.float64).reshape(
+                (length, 4)
+            ),
+        }
@@ -1,10 +1,16 @@
 from __future__ import annotations
 from typing import (
+    Any,
     Union,
+    Optional,
+    Tuple,
     List,
+    Dict,
+    Iterable,
 )
-from .label import Label
-from .switch import Switch
+from .label import Label, Labels, _LabelStyle, _label_style
+from .switch import Switch, _FrozenSwitch
+from .utils import _fingerprint, _frozen_class
 
 __all__ = ["Key"]
 
@@ -12,12 +18,37 @@ __all__ = ["Key"]
 class Key:
     """Key information."""
 
+    __slots__ = (
+        "__color",
+        "__labels",
+        "__default_label_style",
+        "__x",
+        "__y",
+        "__width",
+        "__height",
+        "__x2",
+        "__y2",
+        "__width2",
+        "__height2",
+        "__rotation_x",
+        "__rotation_y",
+        "__rotation_angle",
+        "__is_ghosted",
+        "__is_stepped",
+        "__is_homing",
+        "__is_decal",
+        "__profile_and_row",
+        "__switch",
+        "__observers",
+        "__fingerprint",
+    )
+
     def __init__(self):
         """Initializes a Key."""
         self.__color: str = "#cccccc"
-        self.__labels: List[Label] = [Label() for i in range(12)]
-        self.__default_text_color: str = "#000000"
-        self.__default_text_size: str = 3
+        self.__labels: Labels = Labels(self)
+        # shared with the labels that use the defaults
+        self.__default_label_style: _LabelStyle = _label_style("#000000", 3)
         self.__x: float = 0.0
         self.__y: float = 0.0
         self.__width: float = 1.0
@@ -35,6 +66,230 @@ class Key:
         self.__is_decal: bool = False
         self.__profile_and_row: str = ""
         self.__switch: Switch = Switch()
+        self.__switch._observe(self)
+        # notified of changes, see _observe
+        self.__observers: Tuple = ()
+        # cached while changes are notified, see fingerprint
+        self.__fingerprint: Optional[int] = None
+
+    def __deepcopy__(self, memo: Dict) -> Key:
+        """Copies the Key field by field.
+
+        Used to stamp out keys during deserialization, where the generic copy
+        machinery dominates parse time.
+        """
+        key = self.__class__.__new__(self.__class__)
+        memo[id(self)] = key
+        self.__copy_values(key)
+        key.__labels = self.__labels.__deepcopy__(memo)
+        key.__switch = self.__switch.__deepcopy__(memo)
+        key.__switch._observe(key)
+        key.__observers = ()
+        key.__fingerprint = None
+        return key
+
+    def __copy_values(self, key: Key) -> None:
+        """Copies the values of the Key, other than its Labels and Switch.
+
+        :param key: Key to copy into
+        """
+        key.__color = self.__color
+        key.__default_label_style = self.__default_label_style
+        key.__x = self.__x
+        key.__y = self.__y
+        key.__width = self.__width
+        key.__height = self.__height
+        key.__x2 = self.__x2
+        key.__y2 = self.__y2
+        key.__width2 = self.__width2
+        key.__height2 = self.__height2
+        key.__rotation_x = self.__rotation_x
+        key.__rotation_y = self.__rotation_y
+        key.__rotation_angle = self.__rotation_angle
+        key.__is_ghosted = self.__is_ghosted
+        key.__is_stepped = self.__is_stepped
+        key.__is_homing = self.__is_homing
+        key.__is_decal = self.__is_decal
+        key.__profile_and_row = self.__profile_and_row
+
+    def __getstate__(self) -> Tuple:
+        """Compact pickled state, flattening the populated Labels and Switch.
+
+        Styles and switch records are pickled once per pickle and stay shared
+        when unpickled.
+        """
+        labels: List[Union[int, str, _LabelStyle]] = list()
+        for i, label in self.__labels.items():
+            labels.extend((i, label.text, label._style))
+        return (
+            self.__color,
+            self.__default_label_style,
+            self.__x,
+            self.__y,
+            self.__width,
+            self.__height,
+            self.__x2,
+            self.__y2,
+            self.__width2,
+            self.__height2,
+            self.__rotation_x,
+            self.__rotation_y,
+            self.__rotation_angle,
+            self.__is_ghosted,
+            self.__is_stepped,
+            self.__is_homing,
+            self.__is_decal,
+            self.__profile_and_row,
+            self.__switch._record,
+            tuple(labels),
+        )
+
+    def __setstate__(self, state: Tuple) -> None:
+        (
+            self.__color,
+            self.__default_label_style,
+            self.__x,
+            self.__y,
+            self.__width,
+            self.__height,
+            self.__x2,
+            self.__y2,
+            self.__width2,
+            self.__height2,
+            self.__rotation_x,
+            self.__rotation_y,
+            self.__rotation_angle,
+            self.__is_ghosted,
+            self.__is_stepped,
+            self.__is_homing,
+            self.__is_decal,
+            self.__profile_and_row,
+            switch_record,
+            labels,
+        ) = state
+        self.__switch = Switch._of(self, switch_record)
+        self.__observers = ()
+        self.__fingerprint = None
+        mask: int = 0
+        for i in labels[::3]:
+            mask |= 1 << i
+        self.__labels = Labels._of(
+            self,
+            mask,
+            tuple(
+                Label._of(self, labels[i + 2], labels[i + 1])
+                for i in range(0, len(labels), 3)
+            ),
+        )
+
+    def _frozen(self) -> Key:
+        """Immutable copy of the Key, its Labels and Switch.
+
+        See ``Keyboard.freeze``, the fingerprint is kept.
+
+        :return: frozen Key
+        """
+        key = self.__deepcopy__({})
+        key.__class__ = _FrozenKey
+        key.__labels._freeze()
+        key.__switch.__class__ = _FrozenSwitch
+        key.__fingerprint = self.fingerprint()
+        return key
+
+    def _thawed(self) -> Key:
+        """Mutable copy of the Key, its Labels and Switch.
+
+        See ``Keyboard.thaw``.
+
+        :return: Key instance
+        """
+        key = Key.__new__(Key)
+        self.__copy_values(key)
+        key.__labels = self.__labels._thawed(key)
+        key.__switch = Switch._of(key, self.__switch._record)
+        key.__observers = ()
+        key.__fingerprint = None
+        return key
+
+    def equals(self, other: Any) -> bool:
+        """Compares the properties, Labels and Switch with another Key.
+
+        Labels without text in the default text color and size are the same
+        as unpopulated Labels.
+
+        :param other: object to compare
+        :return: whether other is a Key with the same information
+        """
+        if not isinstance(other, Key):
+            return False
+        if self is other:
+            return True
+        if (
+            self.__fingerprint is not None
+            and other.__fingerprint is not None
+            and self.__fingerprint != other.__fingerprint
+        ):
+            return False
+        return self.__structure() == other.__structure()
+
+    def fingerprint(self) -> int:
+        """Stable 128-bit hash of the properties, Labels and Switch.
+
+        Equal Keys have equal fingerprints across processes and versions. The
+        fingerprint is cached while the Key is held by a Keyboard, until the
+        Key, its Labels or Switch change.
+
+        :return: fingerprint
+        """
+        fingerprint: Optional[int] = self.__fingerprint
+        if fingerprint is None:
+            structure: Tuple = self.__structure()
+            labels: Tuple[Tuple, ...] = structure[-1]
+            fingerprint = _fingerprint(
+                structure[4:-1] + tuple([label[3] for label in labels]),
+                structure[:4] + tuple([label[:3] for label in labels]),
+            )
+            # otherwise changes aren't notified
+            if self.__observers:
+                self.__fingerprint = fingerprint
+        return fingerprint
+
+    def __structure(self) -> Tuple:
+        """Values compared and hashed.
+
+        :return: strings, numbers then Labels of the Key
+        """
+        default_label_style: _LabelStyle = self.__default_label_style
+        labels: List[Tuple] = list()
+        for i, label in self.__labels.items():
+            style: _LabelStyle = label._style
+            text: str = label.text
+            if text == "" and style == default_label_style:
+                continue
+            labels.append((i, text, style.color, style.size))
+        return (
+            self.__color,
+            default_label_style.color,
+            self.__profile_and_row,
+            tuple(self.__switch._record),
+            default_label_style.size,
+            self.__x,
+            self.__y,
+            self.__width,
+            self.__height,
+            self.__x2,
+            self.__y2,
+            self.__width2,
+            self.__height2,
+            self.__rotation_x,
+            self.__rotation_y,
+            self.__rotation_angle,
+            self.__is_ghosted,
+            self.__is_stepped,
+            self.__is_homing,
+            self.__is_decal,
+            tuple(labels),
+        )
 
     @property
     def color(self) -> str:
@@ -44,11 +299,17 @@ class Key:
     @color.setter
     def color(self, color: str) -> None:
         self.__color = color
+        if self.__observers:
+            self._changed()
 
     @property
-    def labels(self) -> List[Label]:
+    def labels(self) -> Labels:
         """12 Labels.
 
+        Only populated Labels are stored, the others are read as detached
+        Labels with empty text and the key's default text color and size, that
+        are inserted when first changed.
+
         Index to position mapping is displayed below.
 
         .. image:: /_static/label_positions.svg
@@ -58,8 +319,12 @@ class Key:
         return self.__labels
 
     @labels.setter
-    def labels(self, labels: List[Label]) -> None:
-        self.__labels = labels
+    def labels(self, labels: Iterable[Label]) -> None:
+        for _, label in self.__labels.items():
+            label._unobserve(self)
+        self.__labels = Labels(self, labels)
+        if self.__observers:
+            self._changed()
 
     @property
     def default_text_color(self) -> str:
@@ -67,11 +332,16 @@ class Key:
 
         Only used to optimize the KLE JSON size.
         """
-        return self.__default_text_color
+        return self.__default_label_style.color
 
     @default_text_color.setter
     def default_text_color(self, default_text_color: str) -> None:
-        self.__default_text_color = default_text_color
+        self.__default_label_style = _label_style(
+            default_text_color,
+            self.__default_label_style.size,
+        )
+        if self.__observers:
+            self._changed()
 
     @property
     def default_text_size(self) -> Union[int, float]:
@@ -79,11 +349,69 @@ class Key:
 
         Only used to optimize the KLE JSON size.
         """
-        return self.__default_text_size
+        return self.__default_label_style.size
 
     @default_text_size.setter
     def default_text_size(self, default_text_size: Union[int, float]) -> None:
-        self.__default_text_size = default_text_size
+        self.__default_label_style = _label_style(
+            self.__default_label_style.color,
+            default_text_size,
+        )
+        if self.__observers:
+            self._changed()
+
+    @property
+    def _default_label_style(self) -> _LabelStyle:
+        """Shared default text color and size."""
+        return self.__default_label_style
+
+    @property
+    def _geometry(self) -> Tuple[float, ...]:
+        """Position, sizes and rotation of the Key, read in one access.
+
+        Ordered as x, y, width, height, x2, y2, width2, height2, rotation_x,
+        rotation_y, rotation_angle.
+        """
+        return (
+            self.__x,
+            self.__y,
+            self.__width,
+            self.__height,
+            self.__x2,
+            self.__y2,
+            self.__width2,
+            self.__height2,
+            self.__rotation_x,
+            self.__rotation_y,
+            self.__rotation_angle,
+        )
+
+    def _observe(self, observer: Any) -> None:
+        """Notifies an observer of changes to the Key, its Labels and Switch.
+
+        :param observer: object with a ``_key_changed(key)`` method
+        """
+        for other in self.__observers:
+            if other is observer:
+                return
+        self.__observers += (observer,)
+
+    def _unobserve(self, observer: Any) -> None:
+        """Stops notifying an observer of changes.
+
+        :param observer: object passed to ``_observe``
+        """
+        self.__observers = tuple(
+            other for other in self.__observers if other is not observer
+        )
+        # changes may no longer be notified
+        self.__fingerprint = None
+
+    def _changed(self) -> None:
+        """Notifies the observers that the Key changed."""
+        self.__fingerprint = None
+        for observer in self.__observers:
+            observer._key_changed(self)
 
     @property
     def x(self) -> float:
@@ -93,6 +421,8 @@ class Key:
     @x.setter
     def x(self, x: float) -> None:
         self.__x = x
+        if self.__observers:
+            self._changed()
 
     @property
     def y(self) -> float:
@@ -102,6 +432,8 @@ class Key:
     @y.setter
     def y(self, y: float) -> None:
         self.__y = y
+        if self.__observers:
+            self._changed()
 
     @property
     def width(self) -> float:
@@ -111,6 +443,8 @@ class Key:
     @width.setter
     def width(self, width: float) -> None:
         self.__width = width
+        if self.__observers:
+            self._changed()
 
     @property
     def height(self) -> float:
@@ -120,6 +454,8 @@ class Key:
     @height.setter
     def height(self, height: float) -> None:
         self.__height = height
+        if self.__observers:
+            self._changed()
 
     @property
     def x2(self) -> float:
@@ -129,6 +465,8 @@ class Key:
     @x2.setter
     def x2(self, x2: float) -> None:
         self.__x2 = x2
+        if self.__observers:
+            self._changed()
 
     @property
     def y2(self) -> float:
@@ -138,6 +476,8 @@ class Key:
     @y2.setter
     def y2(self, y2: float) -> None:
         self.__y2 = y2
+        if self.__observers:
+            self._changed()
 
     @property
     def width2(self) -> float:
@@ -147,6 +487,8 @@ class Key:
     @width2.setter
     def width2(self, width2: float) -> None:
         self.__width2 = width2
+        if self.__observers:
+            self._changed()
 
     @property
     def height2(self) -> float:
@@ -156,6 +498,8 @@ class Key:
     @height2.setter
     def height2(self, height2: float) -> None:
         self.__height2 = height2
+        if self.__observers:
+            self._changed()
 
     @property
     def rotation_x(self) -> float:
@@ -165,6 +509,8 @@ class Key:
     @rotation_x.setter
     def rotation_x(self, rotation_x: float) -> None:
         self.__rotation_x = rotation_x
+        if self.__observers:
+            self._changed()
 
     @property
     def rotation_y(self) -> float:
@@ -174,6 +520,8 @@ class Key:
     @rotation_y.setter
     def rotation_y(self, rotation_y: float) -> None:
         self.__rotation_y = rotation_y
+        if self.__observers:
+            self._changed()
 
     @property
     def rotation_angle(self) -> float:
@@ -183,6 +531,8 @@ class Key:
     @rotation_angle.setter
     def rotation_angle(self, rotation_angle: float) -> None:
         self.__rotation_angle = rotation_angle
+        if self.__observers:
+            self._changed()
 
     @property
     def is_ghosted(self) -> bool:
@@ -192,6 +542,8 @@ class Key:
     @is_ghosted.setter
     def is_ghosted(self, is_ghosted: bool) -> None:
         self.__is_ghosted = is_ghosted
+        if self.__observers:
+            self._changed()
 
     @property
     def is_stepped(self) -> bool:
@@ -201,6 +553,8 @@ class Key:
     @is_stepped.setter
     def is_stepped(self, is_stepped: bool) -> None:
         self.__is_stepped = is_stepped
+        if self.__observers:
+            self._changed()
 
     @property
     def is_homing(self) -> bool:
@@ -210,6 +564,8 @@ class Key:
     @is_homing.setter
     def is_homing(self, is_homing: bool) -> None:
         self.__is_homing = is_homing
+        if self.__observers:
+            self._changed()
 
     @property
     def is_decal(self) -> bool:
@@ -219,6 +575,8 @@ class Key:
     @is_decal.setter
     def is_decal(self, is_decal: bool) -> None:
         self.__is_decal = is_decal
+        if self.__observers:
+            self._changed()
 
     @property
     def profile_and_row(self) -> str:
@@ -228,6 +586,8 @@ class Key:
     @profile_and_row.setter
     def profile_and_row(self, profile_and_row: str) -> None:
         self.__profile_and_row = profile_and_row
+        if self.__observers:
+            self._changed()
 
     @property
     def switch(self) -> Switch:
@@ -236,4 +596,11 @@ class Key:
 
     @switch.setter
     def switch(self, switch: Switch) -> None:
+        self.__switch._unobserve(self)
         self.__switch = switch
+        switch._observe(self)
+        if self.__observers:
+            self._changed()
+
+
+_FrozenKey = _frozen_class(Key)
@@ -1,20 +1,55 @@
 from __future__ import annotations
 from typing import (
+    TYPE_CHECKING,
     TypeVar,
-    cast,
     Any,
     Union,
+    Optional,
     Tuple,
     List,
     Dict,
+    Iterable,
+    Iterator,
+    IO,
+    Deque,
+    Set,
+    Type,
 )
 from copy import deepcopy
-from os.path import join, dirname
+from bisect import bisect_right
+from operator import is_
+from collections import deque
 from json import load
-from jsonschema import RefResolver
-from jsonschema.validators import validator_for
+from os import PathLike
+from types import GeneratorType
 from .metadata import Metadata
+from .label import Label, _LabelStyle
 from .key import Key
+from .keylist import KeyList, _FrozenKeyList
+from .validation import _validate
+from .playback import (
+    PlaybackState,
+    _label_map,
+    _unaligned,
+    _playback_metadata_changes,
+    _playback_key_changes,
+)
+from .stream import _iter_json_rows
+from .utils import _combined_fingerprint, _frozen_class
+from .writer import (
+    _encoded_row,
+    _iter_json_text,
+    _write_json_text,
+    _write_json_text_async,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+    from .table import KeyTable
+    from .cache import ParseCache
+    from .geometry import KeyGeometry
+    from .spatial import SpatialIndex
+    from .adjacency import KeyGraph
 
 __all__ = ["Keyboard"]
 
@@ -24,52 +59,7 @@ T = TypeVar("T")
 S = TypeVar("S")
 
 
-def _load_schema(schema_path):
-    with open(schema_path) as schema_file:
-        return load(schema_file)
-
-
-_schema_paths = list(
-    map(
-        lambda filename: join(dirname(__file__), "kle-json", "v1", filename),
-        [
-            "Background.schema.json",
-            "Cluster.schema.json",
-            "Keyboard.schema.json",
-            "KeyChanges.schema.json",
-            "KeyLabels.schema.json",
-            "Metadata.schema.json",
-        ],
-    )
-)
-_schemas: List[Dict] = tuple(map(_load_schema, _schema_paths))
-_, _, _keyboard_schema, _, _, _ = _schemas
-_schema_store = dict(list(map(lambda schema: [schema["$id"], schema], _schemas)))
-_resolver: RefResolver = RefResolver.from_schema(_keyboard_schema, store=_schema_store)
-_validator_cls = validator_for(_keyboard_schema)
-_validator = _validator_cls(_keyboard_schema, resolver=_resolver)
-"""
-Preloaded validator instance for keyboard schemas.
-"""
-
 # fmt: off
-_label_map = [
-    # -1 indicates not used
-    [0, 6, 2, 8, 9, 11, 3, 5, 1, 4, 7, 10],  # 0 = no centering
-    [1, 7, -1, -1, 9, 11, 4, -1, -1, -1, -1, 10],  # 1 = center x
-    [3, -1, 5, -1, 9, 11, -1, -1, 4, -1, -1, 10],  # 2 = center y
-    [4, -1, -1, -1, 9, 11, -1, -1, -1, -1, -1, 10],  # 3 = center x & y
-    [0, 6, 2, 8, 10, -1, 3, 5, 1, 4, 7, -1],  # 4 = center front (default)
-    [1, 7, -1, -1, 10, -1, 4, -1, -1, -1, -1, -1],  # 5 = center front & x
-    [3, -1, 5, -1, 10, -1, -1, -1, 4, -1, -1, -1],  # 6 = center front & y
-    # 7 = center front & x & y
-    [4, -1, -1, -1, 10, -1, -1, -1, -1, -1, -1, -1],
-]
-"""
-Alignment to used label indexes.
--1 indicates not used.
-"""
-
 _disallowed_alignnment_for_labels = [
     [1, 2, 3, 5, 6, 7],  # 0
     [2, 3, 6, 7],  # 1
@@ -88,25 +78,51 @@ _disallowed_alignnment_for_labels = [
 Label index to disallowed alignment options.
 """
 
+_alignment_preference = [7, 5, 6, 4, 3, 1, 2, 0]
+"""
+Alignment options from the most to the least compact.
+"""
+
 # fmt: on
 
 
-def _unaligned(
-    aligned_items: List,
-    alignment: int,
-    default_val: Any,
-) -> List:
-    """Generates unaligned ordering of aligned items.
-
-    :param aligned_items: aligned items to be unaligned
-    :param alignment: alignment option (0 - 7)
-    :param default_val: default value to fill the unused indexes
-    :return: copy of the array reordered to be unaligned reoredered
+_disallowed_label_masks: List[int] = [
+    sum(
+        1 << i
+        for i, disallowed in enumerate(_disallowed_alignnment_for_labels)
+        if alignment in disallowed
+    )
+    for alignment in range(8)
+]
+"""
+Alignment option to the mask of the labels it can't align.
+"""
+
+
+def _best_alignment(mask: int) -> int:
+    """Most compact alignment allowed for every label of an occupancy mask.
+
+    :param mask: occupancy mask, bit i set if label i has text
+    :return: alignment option (0 - 7)
     """
-    unaligned_items = [default_val for i in range(12)]
-    for i, aligned_item in enumerate(aligned_items):
-        unaligned_items[_label_map[alignment][i]] = aligned_item
-    return unaligned_items
+    for alignment in _alignment_preference:
+        if not mask & _disallowed_label_masks[alignment]:
+            return alignment
+
+
+_alignment_by_mask: List[int] = [_best_alignment(mask) for mask in range(1 << 12)]
+"""
+Occupancy mask of the labels with text to the most compact alignment.
+"""
+
+_aligned_label_index: List[List[int]] = [
+    [label_map.index(i) if i in label_map else -1 for i in range(12)]
+    for label_map in _label_map
+]
+"""
+Alignment to label index to aligned index, inverse of the label map.
+-1 indicates the label can't be aligned.
+"""
 
 
 def _compare_text_sizes(
@@ -137,160 +153,6 @@ def _compare_text_sizes(
     return True
 
 
-def _playback_metadata_changes(
-    metadata: Metadata,
-    metadata_changes: Dict,
-) -> None:
-    """Plays back recorded Metadata changes into Metadata.
-
-    :param metadata: Metadata to alter
-    :param metadata_changes: Metadata changes
-    """
-    if "author" in metadata_changes:
-        metadata.author = metadata_changes["author"]
-    if "backcolor" in metadata_changes:
-        metadata.background_color = metadata_changes["backcolor"]
-    if "background" in metadata_changes:
-        if "name" in metadata_changes["background"]:
-            metadata.background.name = metadata_changes["background"]["name"]
-        if "style" in metadata_changes["background"]:
-            metadata.background.style = metadata_changes["background"]["style"]
-    if "name" in metadata_changes:
-        metadata.name = metadata_changes["name"]
-    if "notes" in metadata_changes:
-        metadata.notes = metadata_changes["notes"]
-    if "radii" in metadata_changes:
-        metadata.radii = metadata_changes["radii"]
-    if "switchMount" in metadata_changes:
-        metadata.switch.mount = metadata_changes["switchMount"]
-    if "switchBrand" in metadata_changes:
-        metadata.switch.brand = metadata_changes["switchBrand"]
-    if "switchType" in metadata_changes:
-        metadata.switch.type = metadata_changes["switchType"]
-    if "css" in metadata_changes:
-        metadata.css = metadata_changes["css"]
-    if "pcb" in metadata_changes:
-        metadata.is_switches_pcb_mounted = metadata_changes["pcb"]
-        metadata.include_switches_pcb_mounted = True
-    if "plate" in metadata_changes:
-        metadata.is_switches_plate_mounted = metadata_changes["plate"]
-        metadata.include_switches_plate_mounted = True
-
-
-def _playback_key_changes(
-    key: Key,
-    key_changes: Dict,
-    current_labels_color: List[str],
-    current_labels_size: List[Union[int, float]],
-    alignment: int,
-    cluster_rotation_x: float,
-    cluster_rotation_y: float,
-) -> Tuple[List[str], List[Union[int, float]], int, float, float]:
-    """Plays back recorded Key changes into Key.
-
-    :param key: Key to alter
-    :param key_changes: Key changes
-    :param current_labels_color: Key's labels' color, default values set to ""
-    :param current_labels_size: Key's labels' size, default values set to 0
-    :param alignment: tracked text alignment
-    :param cluster_rotation_x: tracked rotation origin x
-    :param cluster_rotation_y: tracked rotation origin y
-    :return: updated inputs
-    """
-    if "r" in key_changes:
-        key.rotation_angle = key_changes["r"]
-    if "rx" in key_changes:
-        key.rotation_x = key_changes["rx"]
-        cluster_rotation_x = key_changes["rx"]
-        key.x = cluster_rotation_x
-        key.y = cluster_rotation_y
-    if "ry" in key_changes:
-        key.rotation_y = key_changes["ry"]
-        cluster_rotation_y = key_changes["ry"]
-        key.x = cluster_rotation_x
-        key.y = cluster_rotation_y
-    if "a" in key_changes:
-        alignment = key_changes["a"]
-    if "f" in key_changes:
-        key.default_text_size = key_changes["f"]
-        for i in range(len([size for size in current_labels_size])):
-            current_labels_size[i] = 0
-    if "f2" in key_changes:
-        for i in range(1, 12):
-            current_labels_size[i] = key_changes["f2"]
-    if "fa" in key_changes:
-        for i in range(len(key_changes["fa"])):
-            current_labels_size[i] = key_changes["fa"][i]
-        for i in range(len(key_changes["fa"]), 12):
-            current_labels_size[i] = 0
-    if "p" in key_changes:
-        key.profile_and_row = key_changes["p"]
-    if "c" in key_changes:
-        key.color = key_changes["c"]
-    if "t" in key_changes:
-        labels_color = deepcopy(key_changes["t"]).split("\n")
-        if labels_color[0] != "":
-            key.default_text_color = labels_color[0]
-        for i, color in enumerate(_unaligned(labels_color, alignment, "")):
-            current_labels_color[i] = color
-    if "x" in key_changes:
-        key.x += key_changes["x"]
-    if "y" in key_changes:
-        key.y += key_changes["y"]
-    if "w" in key_changes:
-        key.width = key_changes["w"]
-        key.width2 = key_changes["w"]
-    if "h" in key_changes:
-        key.height = key_changes["h"]
-        key.height2 = key_changes["h"]
-    if "h2" in key_changes:
-        key.height2 = key_changes["h2"]
-    if "w2" in key_changes:
-        key.width2 = key_changes["w2"]
-    if "y2" in key_changes:
-        key.y2 = key_changes["y2"]
-    if "x2" in key_changes:
-        key.x2 = key_changes["x2"]
-    if "n" in key_changes:
-        key.is_homing = key_changes["n"]
-    if "l" in key_changes:
-        key.is_stepped = key_changes["l"]
-    if "d" in key_changes:
-        key.is_decal = key_changes["d"]
-    if "g" in key_changes:
-        key.is_ghosted = key_changes["g"]
-    if "sm" in key_changes:
-        key.switch.mount = key_changes["sm"]
-    if "sb" in key_changes:
-        key.switch.mount = key_changes["sb"]
-    if "st" in key_changes:
-        key.switch.mount = key_changes["st"]
-    return (
-        current_labels_color,
-        current_labels_size,
-        alignment,
-        cluster_rotation_x,
-        cluster_rotation_y,
-    )
-
-
-def _key_sort_criteria(
-    key: Key,
-) -> Tuple[float, float, float, float, float]:
-    """Helper to sort keys into KLE order before serialization.
-
-    :param key: Key to compare
-    :return: multidimensional ordering for comparison
-    """
-    return (
-        (key.rotation_angle + 360) % 360,
-        key.rotation_x,
-        key.rotation_y,
-        key.y,
-        key.x,
-    )
-
-
 def _record_change(
     changes: Dict,
     name: str,
@@ -317,16 +179,25 @@ def _record_change(
     return val
 
 
+def _reduced_length(text_sizes: List[Union[int, float]]) -> int:
+    """Length of text sizes with right zeroes stripped.
+
+    :param text_sizes: array of text sizes
+    :return: length without the trailing zeroes
+    """
+    length: int = len(text_sizes)
+    while length > 0 and text_sizes[length - 1] == 0:
+        length -= 1
+    return length
+
+
 def _reduced_text_sizes(text_sizes: List[Union[int, float]]):
     """Returns copy of text sizes with right zeroes stripped.
 
     :param text_sizes: array of text sizes
     :return: text sizes right stripped of zeroes
     """
-    text_sizes: List[Union[int, float]] = deepcopy(text_sizes)
-    while len(text_sizes) > 0 and text_sizes[-1] == 0:
-        text_sizes.pop()
-    return text_sizes
+    return text_sizes[: _reduced_length(text_sizes)]
 
 
 def _aligned_key_properties(
@@ -339,48 +210,37 @@ def _aligned_key_properties(
     :param current_labels_size: text label sizes to help compute the aligned sizes
     :return: a tuple with alignment, reordered version of labels, colors, sizes
     """
-    # size and colors if match default changed to base values
-    key_labels_size = [label.size for label in key.labels]
-    key_labels_color = [label.color for label in key.labels]
-    for i, label in enumerate(key.labels):
-        if label.text == "":
-            key_labels_color[i] = ""
-            key_labels_size[i] = 0
-        if label.color == key.default_text_color:
-            key_labels_color[i] = ""
-        if label.size == key.default_text_size:
-            key_labels_size[i] = 0
-
-    texts: List[str] = [label.text for label in key.labels]
-    colors: List[str] = [color for color in key_labels_color]
-    sizes: List[Union[int, float]] = [size for size in key_labels_size]
-    alignments: List[int] = [7, 5, 6, 4, 3, 1, 2, 0]
-
-    # remove impossible flag combinations
-    for i in range(len(texts)):
-        if texts[i] != "":
-            for alignment in deepcopy(alignments):
-                if alignment in _disallowed_alignnment_for_labels[i]:
-                    alignments.remove(alignment)
+    # only labels with text are aligned
+    populated: List[Tuple[int, Label]] = list()
+    mask: int = 0
+    for i, label in key.labels.items():
+        if label.text != "":
+            populated.append((i, label))
+            mask |= 1 << i
 
     # generate label arrays according to alignment
-    alignment = alignments[0]
-    aligned_text_labels = ["" for i in range(12)]
-    aligned_text_color = ["" for i in range(12)]
-    aligned_text_size = [0 for i in range(12)]
-    for i in range(12):
-        if i not in _label_map[alignment]:
+    # size and colors if match default changed to base values
+    alignment: int = _alignment_by_mask[mask]
+    aligned_label_index: List[int] = _aligned_label_index[alignment]
+    aligned_text_labels = [""] * 12
+    aligned_text_color = [""] * 12
+    aligned_text_size = [0] * 12
+    default_style: _LabelStyle = key._default_label_style
+    for i, label in populated:
+        ndx = aligned_label_index[i]
+        if ndx < 0:
             continue
-        ndx = _label_map[alignment].index(i)
-        if ndx >= 0:
-            if texts[i] != "":
-                aligned_text_labels[ndx] = texts[i]
-            if colors[i] != "":
-                aligned_text_color[ndx] = colors[i]
-            if sizes[i] != 0:
-                aligned_text_size[ndx] = sizes[i]
+        aligned_text_labels[ndx] = label.text
+        # labels sharing the key's default style need no comparisons
+        style: _LabelStyle = label._style
+        if style is default_style:
+            continue
+        if style.color != default_style.color:
+            aligned_text_color[ndx] = style.color
+        if style.size != default_style.size:
+            aligned_text_size[ndx] = style.size
     # clean up
-    for i in range(len(_reduced_text_sizes(aligned_text_size))):
+    for i in range(_reduced_length(aligned_text_size)):
         if aligned_text_labels[i] == "":
             aligned_text_size[i] = current_labels_size[i]
         if aligned_text_size == key.default_text_size:
@@ -394,361 +254,449 @@ def _aligned_key_properties(
     )
 
 
-class Keyboard:
-    """Keyboard information."""
-
-    def __init__(self):
-        """Initializes a Keyboard."""
-        self.__metadata: Metadata = Metadata()
-        self.__keys: List[Key] = []
+def _populated_labels_size(
+    current_labels_size: List[Union[int, float]],
+    alignment: int,
+) -> Dict[int, Union[int, float]]:
+    """Unaligns the tracked label sizes, keeping only non-default sizes.
 
-    @property
-    def metadata(self) -> Metadata:
-        """Metadata Information."""
-        return self.__metadata
+    :param current_labels_size: tracked aligned label sizes, default is 0
+    :param alignment: tracked text alignment
+    :return: label sizes by label index
+    """
+    return {
+        i: size
+        for i, size in enumerate(_unaligned(current_labels_size, alignment, 0))
+        if size != 0
+    }
 
-    @metadata.setter
-    def metadata(self, metadata: Metadata) -> None:
-        self.__metadata = metadata
 
-    @property
-    def keys(self) -> List[Key]:
-        """List of Keys."""
-        return self.__keys
+def _populated_labels_color(
+    current_labels_color: List[str],
+) -> Dict[int, str]:
+    """Keeps only the non-default tracked label colors.
 
-    @keys.setter
-    def keys(self, keys: List[Key]) -> None:
-        self.__keys = keys
+    :param current_labels_color: tracked label colors, default is ""
+    :return: label colors by label index
+    """
+    return {i: color for i, color in enumerate(current_labels_color) if color != ""}
 
-    @classmethod
-    def from_json(
-        cls,
-        keyboard_json: Keyboard_JSON,
-    ) -> Keyboard:
-        """Deserializes a KLE JSON into a Keyboard.
 
-        :param keyboard_json: KLE JSON to parse
-        :return: Keyboard instance
-        """
+def _deserialized_keys(
+    rows: Iterable[Union[Dict, Iterable[Union[str, Dict]]]],
+    metadata: Metadata,
+) -> Iterator[Key]:
+    """Plays back the rows of a KLE JSON, yielding Keys as they are resolved.
 
-        _validator.validate(instance=keyboard_json)
+    :param rows: metadata changes and rows of labels and key changes
+    :param metadata: Metadata to play the metadata changes back into
+    :return: iterator of Keys in KLE JSON order
+    """
+    # tracks the key with accumulated changes and the tmp variables to
+    # construct final labels, keys are row separated by clusters so rotation
+    # info is tracked to reset x/y positions
+    state: PlaybackState = PlaybackState()
+    current: Key = state.key
+    # non-default label sizes and colors by label index
+    labels_size: Dict[int, Union[int, float]] = dict()
+    labels_color: Dict[int, str] = dict()
 
-        keyboard: Keyboard = Keyboard()
+    for row in rows:
+        if type(row) is dict:
+            metadata_changes = row
+            _playback_metadata_changes(metadata, metadata_changes)
+            current.switch.mount = metadata.switch.mount
+            current.switch.brand = metadata.switch.brand
+            current.switch.type = metadata.switch.type
+        elif type(row) is list or type(row) is GeneratorType:
+            for item in row:
+                if type(item) is str:
+                    labels: str = item
+                    # create copy of key data
+                    # clean up data being modified into the copy
+                    new_key: Key = deepcopy(current)
+                    # later texts overwrite earlier ones sharing an index
+                    label_map: List[int] = _label_map[state.alignment]
+                    labels_text: Dict[int, str] = dict()
+                    for i, text in enumerate(labels.split("\n")):
+                        labels_text[label_map[i] % 12] = text
+                    # only populate labels that differ from the defaults
+                    for i in (
+                        {i for i, text in labels_text.items() if text != ""}
+                        | labels_size.keys()
+                        | labels_color.keys()
+                    ):
+                        label: Label = new_key.labels._populated(i)
+                        label.text = labels_text.get(i, "")
+                        if i in labels_size:
+                            label.size = labels_size[i]
+                        if i in labels_color:
+                            label.color = labels_color[i]
 
-        # tracks the key with accumulated changes
-        current: Key = Key()
-        # allows for non-KLE defaults for label initializer
-        current_labels_size = [0 for label in current.labels]
-        current_labels_color = ["" for label in current.labels]
-        # tmp variables to construct final labels
-        alignment: int = 4
-        # keys are row separated by clusters
-        # track rotation info for reset x/y positions
-        cluster_rotation_x: float = 0.0
-        cluster_rotation_y: float = 0.0
-
-        for r in range(len(keyboard_json)):
-            if type(keyboard_json[r]) is list:
-                for k in range(len(keyboard_json[r])):
-                    item: Union[str, dict] = cast(
-                        Union[str, dict],
-                        keyboard_json[r][k],
-                    )
-                    if type(item) is str:
-                        labels: str = item
-                        # create copy of key data
-                        # clean up data being modified into the copy
-                        new_key: Key = deepcopy(current)
-                        for i, text in enumerate(
-                            _unaligned(
-                                labels.split("\n"),
-                                alignment,
-                                "",
-                            )
-                        ):
-                            new_key.labels[i].text = text
-
-                        for i, size in enumerate(
-                            _unaligned(
-                                current_labels_size,
-                                alignment,
-                                0,
-                            )
-                        ):
-                            if size == 0:
-                                new_key.labels[i].size = new_key.default_text_size
-                            else:
-                                new_key.labels[i].size = size
-
-                        for i, color in enumerate(current_labels_color):
-                            if color == "":
-                                new_key.labels[i].color = new_key.default_text_color
-                            else:
-                                new_key.labels[i].color = color
-
-                        keyboard.keys.append(new_key)
-                        # adjustments for the next key
-                        current.x += current.width
-                        current.width = 1.0
-                        current.height = 1.0
-                        current.x2 = 0.0
-                        current.y2 = 0.0
-                        current.width2 = current.width
-                        current.height2 = current.height
-                        current.is_homing = False
-                        current.is_stepped = False
-                        current.is_decal = False
-                    elif type(item) is dict:
-                        key_changes = item
-                        (
-                            current_labels_color,
-                            current_labels_size,
-                            alignment,
-                            cluster_rotation_x,
-                            cluster_rotation_y,
-                        ) = _playback_key_changes(
-                            current,
-                            key_changes,
-                            current_labels_color,
-                            current_labels_size,
-                            alignment,
-                            cluster_rotation_x,
-                            cluster_rotation_y,
+                    yield new_key
+                    # adjustments for the next key
+                    current.x += current.width
+                    current.width = 1.0
+                    current.height = 1.0
+                    current.x2 = 0.0
+                    current.y2 = 0.0
+                    current.width2 = current.width
+                    current.height2 = current.height
+                    current.is_homing = False
+                    current.is_stepped = False
+                    current.is_decal = False
+                elif type(item) is dict:
+                    _playback_key_changes(state, item)
+                    if state.is_labels_size_changed:
+                        state.is_labels_size_changed = False
+                        labels_size = _populated_labels_size(
+                            state.labels_size,
+                            state.alignment,
                         )
-                current.y += 1.0
-            elif type(keyboard_json[r]) is dict:
-                metadata_changes = keyboard_json[r]
-                _playback_metadata_changes(keyboard.metadata, metadata_changes)
-                current.switch.mount = keyboard.metadata.switch.mount
-                current.switch.brand = keyboard.metadata.switch.brand
-                current.switch.type = keyboard.metadata.switch.type
-            current.x = current.rotation_x
-        return keyboard
+                    if state.is_labels_color_changed:
+                        state.is_labels_color_changed = False
+                        labels_color = _populated_labels_color(state.labels_color)
+            current.y += 1.0
+        current.x = current.rotation_x
 
-    def to_json(self) -> Keyboard_JSON:
-        """Serializes the Keyboard into a KLE JSON.
 
-        :return: the KLE JSON
-        """
-        keyboard_json: Keyboard_JSON = list()
-        row: List[Union[str, Dict]] = list()
-        current: Key = Key()
-        current.switch.mount = self.metadata.switch.mount
-        current.switch.brand = self.metadata.switch.brand
-        current.switch.type = self.metadata.switch.type
-        current_alignment: int = 4
-        current_labels_color: List[str] = current.default_text_color
-        # allows for non-KLE defaults for label initializer, can maintain value invariants
-        current_labels_size: List[Union[int, float]] = [0 for label in current.labels]
-        cluster_rotation_angle: float = 0.0
-        cluster_rotation_x: float = 0.0
-        cluster_rotation_y: float = 0.0
+def _metadata_changes(metadata: Metadata) -> Dict:
+    """Records the changes of Metadata from KLE's defaults.
 
-        metadata_changes: Dict = dict()
-        default_metadata: Metadata = Metadata()
-        _record_change(
-            metadata_changes,
-            "backcolor",
-            self.metadata.background_color,
-            default_metadata.background_color,
-        )
-        _record_change(
-            metadata_changes,
-            "name",
-            self.metadata.name,
-            default_metadata.name,
-        )
+    :param metadata: Metadata to record the changes of
+    :return: metadata changes, empty if there are none
+    """
+    metadata_changes: Dict = dict()
+    default_metadata: Metadata = Metadata()
+    _record_change(
+        metadata_changes,
+        "backcolor",
+        metadata.background_color,
+        default_metadata.background_color,
+    )
+    _record_change(
+        metadata_changes,
+        "name",
+        metadata.name,
+        default_metadata.name,
+    )
+    _record_change(
+        metadata_changes,
+        "author",
+        metadata.author,
+        default_metadata.author,
+    )
+    _record_change(
+        metadata_changes,
+        "notes",
+        metadata.notes,
+        default_metadata.notes,
+    )
+    background_changes: Dict = dict()
+    _record_change(
+        background_changes,
+        "name",
+        metadata.background.name,
+        "",
+    )
+    _record_change(
+        background_changes,
+        "style",
+        metadata.background.style,
+        "",
+    )
+    if len(background_changes) > 0:
+        _record_change(metadata_changes, "background", background_changes, None)
+    _record_change(
+        metadata_changes,
+        "radii",
+        metadata.radii,
+        default_metadata.radii,
+    )
+    _record_change(
+        metadata_changes,
+        "switchMount",
+        metadata.switch.mount,
+        default_metadata.switch.mount,
+    )
+    _record_change(
+        metadata_changes,
+        "switchBrand",
+        metadata.switch.brand,
+        default_metadata.switch.brand,
+    )
+    _record_change(
+        metadata_changes,
+        "switchType",
+        metadata.switch.type,
+        default_metadata.switch.type,
+    )
+    _record_change(
+        metadata_changes,
+        "css",
+        metadata.css,
+        default_metadata.css,
+    )
+    if metadata.include_switches_plate_mounted or (
+        metadata.is_switches_plate_mounted != default_metadata.is_switches_plate_mounted
+    ):
         _record_change(
             metadata_changes,
-            "author",
-            self.metadata.author,
-            default_metadata.author,
+            "plate",
+            metadata.is_switches_plate_mounted,
+            None,
         )
+    if metadata.include_switches_pcb_mounted or (
+        metadata.is_switches_pcb_mounted != default_metadata.is_switches_pcb_mounted
+    ):
         _record_change(
             metadata_changes,
-            "notes",
-            self.metadata.notes,
-            default_metadata.notes,
+            "pcb",
+            metadata.is_switches_pcb_mounted,
+            None,
         )
-        background_changes: Dict = dict()
-        _record_change(
-            background_changes,
-            "name",
-            self.metadata.background.name,
-            "",
+    return metadata_changes
+
+
+class _SerializerState:
+    """Running state of a serialization, carried from row to row.
+
+    :ivar current: Key tracking the recorded properties
+    :ivar alignment: tracked text alignment
+    :ivar labels_color: tracked label colors, joined
+    :ivar labels_size: tracked aligned label sizes
+    :ivar cluster_rotation_angle: rotation angle of the current cluster
+    :ivar cluster_rotation_x: rotation origin x of the current cluster
+    :ivar cluster_rotation_y: rotation origin y of the current cluster
+    """
+
+    __slots__ = (
+        "current",
+        "alignment",
+        "labels_color",
+        "labels_size",
+        "cluster_rotation_angle",
+        "cluster_rotation_x",
+        "cluster_rotation_y",
+    )
+
+    def __init__(self, metadata: Metadata):
+        """Initializes a _SerializerState with KLE's defaults.
+
+        :param metadata: Metadata providing the default switch
+        """
+        current: Key = Key()
+        current.switch.mount = metadata.switch.mount
+        current.switch.brand = metadata.switch.brand
+        current.switch.type = metadata.switch.type
+        # will be incremented on first row
+        current.y -= 1.0
+        self.current: Key = current
+        self.alignment: int = 4
+        self.labels_color: str = current.default_text_color
+        # allows for non-KLE defaults for label initializer, can maintain value invariants
+        self.labels_size: List[Union[int, float]] = [0 for label in current.labels]
+        self.cluster_rotation_angle: float = 0.0
+        self.cluster_rotation_x: float = 0.0
+        self.cluster_rotation_y: float = 0.0
+
+    def snapshot(self) -> Tuple:
+        """Captures the state, rows starting from equal states serialize equally.
+
+        :return: comparable snapshot
+        """
+        current: Key = self.current
+        # row breaks only depend on the first four
+        return (
+            self.cluster_rotation_angle,
+            self.cluster_rotation_x,
+            self.cluster_rotation_y,
+            current.y,
+            current.rotation_angle,
+            current.rotation_x,
+            current.rotation_y,
+            current.x,
+            current.color,
+            current.is_ghosted,
+            current.profile_and_row,
+            current.switch._record,
+            current.default_text_size,
+            self.alignment,
+            self.labels_color,
+            tuple(self.labels_size),
         )
-        _record_change(
-            background_changes,
-            "style",
-            self.metadata.background.style,
-            "",
+
+    def restore(self, snapshot: Tuple) -> None:
+        """Restores a captured state.
+
+        :param snapshot: snapshot to restore
+        """
+        current: Key = self.current
+        (
+            self.cluster_rotation_angle,
+            self.cluster_rotation_x,
+            self.cluster_rotation_y,
+            current.y,
+            current.rotation_angle,
+            current.rotation_x,
+            current.rotation_y,
+            current.x,
+            current.color,
+            current.is_ghosted,
+            current.profile_and_row,
+            current.switch._record,
+            current.default_text_size,
+            self.alignment,
+            self.labels_color,
+            labels_size,
+        ) = snapshot
+        self.labels_size = list(labels_size)
+
+
+def _is_row_break(
+    cluster_rotation_angle: float,
+    cluster_rotation_x: float,
+    cluster_rotation_y: float,
+    y: float,
+    key: Key,
+) -> bool:
+    """Determines whether a Key starts a new row.
+
+    :param cluster_rotation_angle: rotation angle of the current cluster
+    :param cluster_rotation_x: rotation origin x of the current cluster
+    :param cluster_rotation_y: rotation origin y of the current cluster
+    :param y: tracked y after the previous Key of the row
+    :param key: next Key
+    :return: whether the row closes before the Key
+    """
+    return (
+        (key.rotation_angle != cluster_rotation_angle)
+        or (key.rotation_x != cluster_rotation_x)
+        or (key.rotation_y != cluster_rotation_y)
+        or (key.y != y)
+    )
+
+
+def _serialized_row(
+    state: _SerializerState,
+    sorted_keys: List[Key],
+    start: int,
+) -> Tuple[int, List[Union[str, Dict]]]:
+    """Records the changes of sorted Keys into a KLE JSON row.
+
+    :param state: state before the row, advanced to the end of the row
+    :param sorted_keys: Keys in KLE order
+    :param start: index of the first Key of the row
+    :return: index after the last Key of the row and the row
+    """
+    row: List[Union[str, Dict]] = list()
+    current: Key = state.current
+    end: int = start
+    while end < len(sorted_keys):
+        key: Key = sorted_keys[end]
+        if end > start and _is_row_break(
+            state.cluster_rotation_angle,
+            state.cluster_rotation_x,
+            state.cluster_rotation_y,
+            current.y,
+            key,
+        ):
+            break
+        end += 1
+        key_changes = dict()
+        (
+            alignment,
+            aligned_text_labels,
+            aligned_text_color,
+            aligned_text_size,
+        ) = _aligned_key_properties(
+            key,
+            state.labels_size,
         )
-        if len(background_changes) > 0:
-            _record_change(metadata_changes, "background", background_changes, None)
-        _record_change(
-            metadata_changes,
-            "radii",
-            self.metadata.radii,
-            default_metadata.radii,
+
+        if end == start + 1:
+            current.y += 1.0
+            # set up for the new row
+            # y is reset if either rx or ry are changed
+            if (
+                key.rotation_y != state.cluster_rotation_y
+                or key.rotation_x != state.cluster_rotation_x
+            ):
+                current.y = key.rotation_y
+            # always reset x to rx (which defaults to zero)
+            current.x = key.rotation_x
+            # update current cluster
+            state.cluster_rotation_angle = key.rotation_angle
+            state.cluster_rotation_x = key.rotation_x
+            state.cluster_rotation_y = key.rotation_y
+        current.rotation_angle = _record_change(
+            key_changes,
+            "r",
+            key.rotation_angle,
+            current.rotation_angle,
         )
-        _record_change(
-            metadata_changes,
-            "switchMount",
-            self.metadata.switch.mount,
-            default_metadata.switch.mount,
+        current.rotation_x = _record_change(
+            key_changes,
+            "rx",
+            key.rotation_x,
+            current.rotation_x,
         )
-        _record_change(
-            metadata_changes,
-            "switchBrand",
-            self.metadata.switch.brand,
-            default_metadata.switch.brand,
+        current.rotation_y = _record_change(
+            key_changes,
+            "ry",
+            key.rotation_y,
+            current.rotation_y,
         )
-        _record_change(
-            metadata_changes,
-            "switchType",
-            self.metadata.switch.type,
-            default_metadata.switch.type,
-        )
-        _record_change(
-            metadata_changes,
-            "css",
-            self.metadata.css,
-            default_metadata.css,
+        current.y += _record_change(
+            key_changes,
+            "y",
+            key.y - current.y,
+            0.0,
         )
-        if self.metadata.include_switches_plate_mounted or (
-            self.metadata.is_switches_plate_mounted
-            != default_metadata.is_switches_plate_mounted
-        ):
-            _record_change(
-                metadata_changes,
-                "plate",
-                self.metadata.is_switches_plate_mounted,
-                None,
-            )
-        if self.metadata.include_switches_pcb_mounted or (
-            self.metadata.is_switches_pcb_mounted
-            != default_metadata.is_switches_pcb_mounted
-        ):
+        current.x += (
             _record_change(
-                metadata_changes,
-                "pcb",
-                self.metadata.is_switches_pcb_mounted,
-                None,
-            )
-        if len(metadata_changes) > 0:
-            keyboard_json.append(metadata_changes)
-
-        is_new_row: bool = True
-        # will be incremented on first row
-        current.y -= 1.0
-
-        sorted_keys: List[Key] = list(sorted(self.__keys, key=_key_sort_criteria))
-        for key in sorted_keys:
-            key_changes = dict()
-            (
-                alignment,
-                aligned_text_labels,
-                aligned_text_color,
-                aligned_text_size,
-            ) = _aligned_key_properties(
-                key,
-                current_labels_size,
-            )
-
-            # start a new row when necessary
-            is_cluster_changed: bool = (
-                (key.rotation_angle != cluster_rotation_angle)
-                or (key.rotation_x != cluster_rotation_x)
-                or (key.rotation_y != cluster_rotation_y)
-            )
-            is_row_changed: bool = key.y != current.y
-            if len(row) > 0 and (is_row_changed or is_cluster_changed):
-                # set up for the new row
-                keyboard_json.append(row)
-                row = list()
-                is_new_row = True
-            if is_new_row:
-                current.y += 1.0
-                # set up for the new row
-                # y is reset if either rx or ry are changed
-                if (
-                    key.rotation_y != cluster_rotation_y
-                    or key.rotation_x != cluster_rotation_x
-                ):
-                    current.y = key.rotation_y
-                # always reset x to rx (which defaults to zero)
-                current.x = key.rotation_x
-                # update current cluster
-                cluster_rotation_angle = key.rotation_angle
-                cluster_rotation_x = key.rotation_x
-                cluster_rotation_y = key.rotation_y
-                is_new_row = False
-            current.rotation_angle = _record_change(
-                key_changes,
-                "r",
-                key.rotation_angle,
-                current.rotation_angle,
-            )
-            current.rotation_x = _record_change(
                 key_changes,
-                "rx",
-                key.rotation_x,
-                current.rotation_x,
-            )
-            current.rotation_y = _record_change(
-                key_changes,
-                "ry",
-                key.rotation_y,
-                current.rotation_y,
-            )
-            current.y += _record_change(
-                key_changes,
-                "y",
-                key.y - current.y,
+                "x",
+                key.x - current.x,
                 0.0,
             )
-            current.x += (
-                _record_change(
-                    key_changes,
-                    "x",
-                    key.x - current.x,
-                    0.0,
-                )
-                + key.width
-            )
-            current.color = _record_change(
-                key_changes,
-                "c",
-                key.color,
-                current.color,
-            )
-            if aligned_text_color[0] == "":
-                aligned_text_color[0] = key.default_text_color
-            else:
-                for i in range(2, 12):
-                    if (
-                        aligned_text_color[i] != ""
-                        and aligned_text_color[i] != aligned_text_color[0]
-                    ):
-                        aligned_text_color[i] = key.default_text_color
-            current_labels_color = _record_change(
-                key_changes,
-                "t",
-                "\n".join(aligned_text_color).rstrip(),
-                current_labels_color,
-            )
-            current.is_ghosted = _record_change(
-                key_changes,
-                "g",
-                key.is_ghosted,
-                current.is_ghosted,
-            )
-            current.profile_and_row = _record_change(
-                key_changes,
-                "p",
-                key.profile_and_row,
-                current.profile_and_row,
-            )
+            + key.width
+        )
+        current.color = _record_change(
+            key_changes,
+            "c",
+            key.color,
+            current.color,
+        )
+        if aligned_text_color[0] == "":
+            aligned_text_color[0] = key.default_text_color
+        else:
+            for i in range(2, 12):
+                if (
+                    aligned_text_color[i] != ""
+                    and aligned_text_color[i] != aligned_text_color[0]
+                ):
+                    aligned_text_color[i] = key.default_text_color
+        state.labels_color = _record_change(
+            key_changes,
+            "t",
+            "\n".join(aligned_text_color).rstrip(),
+            state.labels_color,
+        )
+        current.is_ghosted = _record_change(
+            key_changes,
+            "g",
+            key.is_ghosted,
+            current.is_ghosted,
+        )
+        current.profile_and_row = _record_change(
+            key_changes,
+            "p",
+            key.profile_and_row,
+            current.profile_and_row,
+        )
+        # shared switch records are unchanged, no comparisons needed
+        if key.switch._record is not current.switch._record:
             current.switch.mount = _record_change(
                 key_changes,
                 "sm",
@@ -767,63 +715,835 @@ class Keyboard:
                 key.switch.type,
                 current.switch.type,
             )
-            current_alignment = _record_change(
-                key_changes,
-                "a",
-                alignment,
-                current_alignment,
-            )
-            current.default_text_size = _record_change(
-                key_changes,
-                "f",
-                key.default_text_size,
-                current.default_text_size,
-            )
-            if "f" in key_changes:
-                current_labels_size = [0 for i in range(12)]
-            # sizes arent already optimized, optimize it
-            if not _compare_text_sizes(
-                current_labels_size,
-                aligned_text_size,
-                aligned_text_labels,
-            ):
-                if len(_reduced_text_sizes(aligned_text_size)) == 0:
+        state.alignment = _record_change(
+            key_changes,
+            "a",
+            alignment,
+            state.alignment,
+        )
+        current.default_text_size = _record_change(
+            key_changes,
+            "f",
+            key.default_text_size,
+            current.default_text_size,
+        )
+        if "f" in key_changes:
+            state.labels_size = [0 for i in range(12)]
+        # sizes arent already optimized, optimize it
+        if not _compare_text_sizes(
+            state.labels_size,
+            aligned_text_size,
+            aligned_text_labels,
+        ):
+            if _reduced_length(aligned_text_size) == 0:
+                _record_change(
+                    key_changes,
+                    "f",
+                    key.default_text_size,
+                    None,
+                )
+            else:
+                optimizeF2: bool = aligned_text_size[0] == 0
+                for i in range(2, _reduced_length(aligned_text_size)):
+                    if not optimizeF2:
+                        break
+                    optimizeF2 = aligned_text_size[i] == aligned_text_size[1]
+                if optimizeF2:
+                    f2: Union[int, float] = aligned_text_size[1]
+                    _record_change(key_changes, "f2", f2, None)
+                    state.labels_size = [0] + [f2 for i in range(11)]
+                else:
+                    state.labels_size = aligned_text_size
                     _record_change(
                         key_changes,
-                        "f",
-                        key.default_text_size,
-                        None,
+                        "fa",
+                        _reduced_text_sizes(aligned_text_size),
+                        [],
                     )
-                else:
-                    optimizeF2: bool = aligned_text_size[0] == 0
-                    for i in range(2, len(_reduced_text_sizes(aligned_text_size))):
-                        if not optimizeF2:
-                            break
-                        optimizeF2 = aligned_text_size[i] == aligned_text_size[1]
-                    if optimizeF2:
-                        f2: Union[int, float] = aligned_text_size[1]
-                        _record_change(key_changes, "f2", f2, None)
-                        current_labels_size = [0] + [f2 for i in range(11)]
-                    else:
-                        current_labels_size = aligned_text_size
-                        _record_change(
-                            key_changes,
-                            "fa",
-                            _reduced_text_sizes(aligned_text_size),
-                            [],
+        _record_change(key_changes, "w", key.width, 1.0)
+        _record_change(key_changes, "h", key.height, 1.0)
+        _record_change(key_changes, "w2", key.width2, key.width)
+        _record_change(key_changes, "h2", key.height2, key.height)
+        _record_change(key_changes, "x2", key.x2, 0.0)
+        _record_change(key_changes, "y2", key.y2, 0.0)
+        _record_change(key_changes, "n", key.is_homing, False)
+        _record_change(key_changes, "l", key.is_stepped, False)
+        _record_change(key_changes, "d", key.is_decal, False)
+        if len(key_changes) > 0:
+            row.append(key_changes)
+        row.append("\n".join(aligned_text_labels).rstrip())
+    return end, row
+
+
+class _Row:
+    """Serialized row of a KeyList, reused while its Keys are unchanged.
+
+    :ivar keys: Keys of the row in KLE order
+    :ivar start: index of the first Key among the sorted Keys
+    :ivar incoming: snapshot of the state before the row
+    :ivar outgoing: snapshot of the state after the row
+    :ivar items: key changes and labels of the row, never mutated
+    :ivar texts: encoded text of the row, indented and minified
+    """
+
+    __slots__ = (
+        "keys",
+        "start",
+        "incoming",
+        "outgoing",
+        "items",
+        "texts",
+    )
+
+    def __init__(
+        self,
+        keys: List[Key],
+        start: int,
+        incoming: Tuple,
+        outgoing: Tuple,
+        items: List[Union[str, Dict]],
+        texts: Optional[List[Optional[str]]] = None,
+    ):
+        self.keys: List[Key] = keys
+        self.start: int = start
+        self.incoming: Tuple = incoming
+        self.outgoing: Tuple = outgoing
+        self.items: List[Union[str, Dict]] = items
+        self.texts: List[Optional[str]] = [None, None] if texts is None else texts
+
+    def text(self, minified: bool) -> str:
+        """Encodes the row, once per format.
+
+        :param minified: whether to drop the indentation and whitespace
+        :return: JSON text of the row
+        """
+        text: Optional[str] = self.texts[minified]
+        if text is None:
+            text = self.texts[minified] = _encoded_row(self.items, minified)
+        return text
+
+
+class _RowCache:
+    """Serialized rows of a KeyList from its last serialization.
+
+    :ivar version: version of the KLE order of the Keys
+    :ivar rows: rows in order
+    """
+
+    __slots__ = (
+        "version",
+        "rows",
+    )
+
+    def __init__(self, version: int, rows: List[_Row]):
+        self.version: int = version
+        self.rows: List[_Row] = rows
+
+
+def _reusable_rows(
+    cache: Optional[_RowCache],
+    keys: KeyList,
+    sorted_keys: List[Key],
+    version: int,
+    changed_keys: Dict[int, Key],
+) -> Dict[int, _Row]:
+    """Finds the cached rows whose Keys are unchanged, by their start.
+
+    :param cache: rows of the last serialization
+    :param keys: KeyList locating the Keys in KLE order
+    :param sorted_keys: Keys in KLE order
+    :param version: version of the KLE order
+    :param changed_keys: changed keys by id
+    :return: reusable rows by the index of their first Key
+    """
+    if cache is None:
+        return dict()
+    if cache.version == version:
+        # same order, rows are found by the position of the changed keys
+        starts: List[int] = [row.start for row in cache.rows]
+        changed_rows: Set[int] = set()
+        for key in changed_keys.values():
+            i: Optional[int] = keys._sorted_index(key)
+            if i is not None:
+                changed_rows.add(bisect_right(starts, i) - 1)
+        return {
+            row.start: row for i, row in enumerate(cache.rows) if i not in changed_rows
+        }
+    # new order, rows are found by their first key then compared key by key
+    rows: Dict[int, _Row] = dict()
+    for row in cache.rows:
+        start: Optional[int] = keys._sorted_index(row.keys[0])
+        if start is None:
+            continue
+        end: int = start + len(row.keys)
+        if (
+            end <= len(sorted_keys)
+            and all(map(is_, row.keys, sorted_keys[start:end]))
+            and changed_keys.keys().isdisjoint(map(id, row.keys))
+        ):
+            rows[start] = row
+    return rows
+
+
+def _iter_cached_rows(metadata: Metadata, keys: KeyList) -> Iterator[_Row]:
+    """Serializes a KeyList into rows, reusing the rows of unchanged Keys.
+
+    When the KeyList caches rows, rows are regenerated when one of their Keys
+    changed or when the state before them differs from the last
+    serialization, so the work done scales with the size of the edits.
+    Otherwise every row is generated and none is kept. The KLE order of the
+    Keys is maintained by the KeyList.
+
+    :param metadata: Metadata providing the default switch
+    :param keys: KeyList to serialize
+    :return: iterator of the rows
+    """
+    caches_rows: bool = keys._caches_rows
+    changed_keys: Dict[int, Key] = keys._take_changes()
+    cache: Optional[_RowCache] = keys._row_cache if caches_rows else None
+    sorted_keys, version = keys._sorted()
+    reusable_rows: Dict[int, _Row] = _reusable_rows(
+        cache,
+        keys,
+        sorted_keys,
+        version,
+        changed_keys,
+    )
+    # the order may change while rows are yielded
+    sorted_keys = list(sorted_keys)
+    rows: List[_Row] = list()
+    is_completed: bool = False
+    try:
+        state: _SerializerState = _SerializerState(metadata)
+        # the state is only restored when a row is regenerated
+        incoming: Tuple = state.snapshot()
+        is_restored: bool = True
+        start: int = 0
+        while start < len(sorted_keys):
+            row: Optional[_Row] = reusable_rows.get(start)
+            if row is not None and (
+                row.incoming is incoming or row.incoming == incoming
+            ):
+                end: int = start + len(row.keys)
+                # the row must still close where it did
+                if end == len(sorted_keys) or _is_row_break(
+                    *row.outgoing[:4], sorted_keys[end]
+                ):
+                    if row.start != start:
+                        row = _Row(
+                            row.keys,
+                            start,
+                            row.incoming,
+                            row.outgoing,
+                            row.items,
+                            row.texts,
                         )
-            _record_change(key_changes, "w", key.width, 1.0)
-            _record_change(key_changes, "h", key.height, 1.0)
-            _record_change(key_changes, "w2", key.width2, key.width)
-            _record_change(key_changes, "h2", key.height2, key.height)
-            _record_change(key_changes, "x2", key.x2, 0.0)
-            _record_change(key_changes, "y2", key.y2, 0.0)
-            _record_change(key_changes, "n", key.is_homing, False)
-            _record_change(key_changes, "l", key.is_stepped, False)
-            _record_change(key_changes, "d", key.is_decal, False)
-            if len(key_changes) > 0:
-                row.append(key_changes)
-            row.append("\n".join(aligned_text_labels).rstrip())
-        if len(row) > 0:
-            keyboard_json.append(row)
+                    if caches_rows:
+                        rows.append(row)
+                    incoming = row.outgoing
+                    is_restored = False
+                    start = end
+                    yield row
+                    continue
+            if not is_restored:
+                state.restore(incoming)
+            end, items = _serialized_row(state, sorted_keys, start)
+            row = _Row(sorted_keys[start:end], start, incoming, state.snapshot(), items)
+            if caches_rows:
+                rows.append(row)
+            incoming = row.outgoing
+            is_restored = True
+            start = end
+            yield row
+        is_completed = True
+    finally:
+        if caches_rows and is_completed:
+            keys._row_cache = _RowCache(version, rows)
+        elif caches_rows:
+            keys._restore_changes(changed_keys)
+
+
+def _copied_row(items: List[Union[str, Dict]]) -> List[Union[str, Dict]]:
+    """Copies the items of a cached row, cached rows are never mutated.
+
+    :param items: key changes and labels of a row
+    :return: copy of the items
+    """
+    return [
+        (
+            {
+                name: (list(value) if type(value) is list else value)
+                for name, value in item.items()
+            }
+            if type(item) is dict
+            else item
+        )
+        for item in items
+    ]
+
+
+def _iter_row_texts(
+    metadata: Metadata,
+    keys: KeyList,
+    minified: bool,
+) -> Iterator[str]:
+    """Encodes the metadata changes and the cached rows of a Keyboard.
+
+    :param metadata: Metadata to record the changes of
+    :param keys: KeyList to serialize
+    :param minified: whether to drop the indentation and whitespace
+    :return: iterator of the JSON text of the metadata changes and rows
+    """
+    metadata_changes: Dict = _metadata_changes(metadata)
+    if len(metadata_changes) > 0:
+        yield _encoded_row(metadata_changes, minified)
+    for row in _iter_cached_rows(metadata, keys):
+        yield row.text(minified)
+
+
+def _load(
+    path: Union[str, PathLike],
+    validate: str,
+    cache: Optional[ParseCache] = None,
+) -> Keyboard:
+    """Loads and deserializes a KLE JSON file, run by the workers of load_many.
+
+    :param path: path of the KLE JSON file
+    :param validate: validation mode
+    :param cache: cache of parsed layouts
+    :return: Keyboard instance
+    """
+    if cache is not None:
+        return cache.load(path, validate)
+    with open(path, "rb") as fp:
+        keyboard_json: Keyboard_JSON = load(fp)
+    return Keyboard.from_json(keyboard_json, validate)
+
+
+def _loaded_many(
+    paths: List[Union[str, PathLike]],
+    executor_class: Type[Executor],
+    workers: Optional[int],
+    validate: str,
+    ordered: bool,
+    cache: Optional[ParseCache],
+) -> Iterator[Tuple[Union[str, PathLike], Union[Keyboard, Exception]]]:
+    """Yields the results of loading files on a pool of workers.
+
+    :param paths: paths of the KLE JSON files
+    :param executor_class: class of the executor running the workers
+    :param workers: number of workers
+    :param validate: validation mode
+    :param ordered: whether results follow the order of ``paths``
+    :param cache: cache of parsed layouts
+    :return: iterator of paths with their Keyboard or the error raised
+    """
+    from concurrent.futures import as_completed
+
+    # futures are released once their result is handed out
+    pending: Deque[Tuple[Union[str, PathLike], Future]] = deque()
+    paths_by_future: Dict[Future, Union[str, PathLike]] = dict()
+    executor: Executor = executor_class(max_workers=workers)
+    try:
+        for path in paths:
+            pending.append((path, executor.submit(_load, path, validate, cache)))
+        if ordered:
+            while len(pending) > 0:
+                path, future = pending.popleft()
+                yield path, _result(future)
+        else:
+            while len(pending) > 0:
+                path, future = pending.popleft()
+                paths_by_future[future] = path
+            for future in as_completed(paths_by_future):
+                yield paths_by_future.pop(future), _result(future)
+    finally:
+        # stop loading when the results are abandoned
+        for _, future in pending:
+            future.cancel()
+        for future in paths_by_future:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _result(future: Future) -> Union[Keyboard, Exception]:
+    """Result of a load, or the error it raised.
+
+    :param future: future of the load
+    :return: Keyboard instance or error
+    """
+    try:
+        return future.result()
+    except Exception as error:
+        return error
+
+
+_executors = ("process", "thread")
+"""
+Executors available to load_many.
+"""
+
+
+class Keyboard:
+    """Keyboard information."""
+
+    def __init__(self):
+        """Initializes a Keyboard."""
+        self.__metadata: Metadata = Metadata()
+        self.__keys: KeyList = KeyList()
+
+    def __getstate__(self) -> Tuple[Metadata, List[Key]]:
+        """Compact pickled state."""
+        return (self.__metadata, list(self.__keys))
+
+    def __setstate__(self, state: Tuple[Metadata, List[Key]]) -> None:
+        self.__metadata, keys = state
+        self.__keys = KeyList(keys)
+
+    def equals(self, other: Any) -> bool:
+        """Compares the Metadata and the Keys in KLE order with another Keyboard.
+
+        Keyboards, like their parts, compare by identity with ``==``. Different
+        fingerprints, cached until the Keyboard changes, tell most unequal
+        Keyboards apart without comparing their Keys. Equal fingerprints are
+        confirmed Key by Key, as different Keyboards may share a fingerprint.
+
+        :param other: object to compare
+        :return: whether other is a Keyboard with the same information
+        """
+        if not isinstance(other, Keyboard):
+            return False
+        if self is other:
+            return True
+        if self.fingerprint() != other.fingerprint():
+            return False
+        keys: List[Key] = self.__keys._sorted()[0]
+        other_keys: List[Key] = other.__keys._sorted()[0]
+        return (
+            self.__metadata.equals(other.__metadata)
+            and len(keys) == len(other_keys)
+            and all(key.equals(other_key) for key, other_key in zip(keys, other_keys))
+        )
+
+    def fingerprint(self) -> int:
+        """Stable 128-bit hash of the Metadata and the Keys in KLE order.
+
+        Equal Keyboards have equal fingerprints across processes and versions,
+        for deduplication, cache keys and change detection. Fingerprints of
+        the Keys are cached, only edited Keys are hashed again.
+
+        :return: fingerprint
+        """
+        return _combined_fingerprint(
+            (self.__metadata.fingerprint(), self.__keys._fingerprint())
+        )
+
+    def freeze(self) -> Keyboard:
+        """Creates an immutable snapshot of the Keyboard.
+
+        Setters and list mutations of the snapshot, its Metadata, Keys,
+        Labels and Switches raise. Snapshots are hashable, can be shared
+        between threads without locks, and are not copied by ``copy.deepcopy``.
+        Freezing a snapshot returns it.
+
+        .. code-block:: python
+
+            snapshot = keyboard.freeze()
+            snapshot.keys[0].x = 1  # raises AttributeError
+            keyboard = snapshot.thaw()
+
+        :return: frozen Keyboard
+        """
+        return self._frozen()
+
+    def thaw(self) -> Keyboard:
+        """Creates a mutable copy of the Keyboard, usually of a snapshot.
+
+        The Metadata, Keys, Labels and Switches are copied eagerly, field by
+        field, which is faster than ``copy.deepcopy``. Label styles and switch
+        records are immutable and stay shared.
+
+        :return: Keyboard instance, independent of the original
+        """
+        return self._thawed()
+
+    @property
+    def is_frozen(self) -> bool:
+        """Whether the Keyboard is an immutable snapshot, see ``freeze``."""
+        return isinstance(self, _FrozenKeyboard)
+
+    def _frozen(self) -> Keyboard:
+        keyboard: Keyboard = _FrozenKeyboard.__new__(_FrozenKeyboard)
+        keyboard.__metadata = self.__metadata._frozen()
+        keyboard.__keys = _FrozenKeyList([key._frozen() for key in self.__keys])
+        # computed now rather than on first read from many threads
+        keyboard.__keys._sorted()
+        keyboard.__keys._fingerprint()
+        return keyboard
+
+    def _thawed(self) -> Keyboard:
+        keyboard: Keyboard = Keyboard.__new__(Keyboard)
+        keyboard.__metadata = self.__metadata._thawed()
+        keyboard.__keys = KeyList([key._thawed() for key in self.__keys])
+        return keyboard
+
+    @property
+    def metadata(self) -> Metadata:
+        """Metadata Information."""
+        return self.__metadata
+
+    @metadata.setter
+    def metadata(self, metadata: Metadata) -> None:
+        self.__metadata = metadata
+
+    @property
+    def keys(self) -> KeyList:
+        """List of Keys."""
+        return self.__keys
+
+    @keys.setter
+    def keys(self, keys: List[Key]) -> None:
+        caches_rows: bool = self.__keys._caches_rows
+        self.__keys = keys if isinstance(keys, KeyList) else KeyList(keys)
+        self.__keys._cache_rows(caches_rows)
+
+    @property
+    def caches_rows(self) -> bool:
+        """Whether serialized rows are kept to serialize again incrementally.
+
+        Off by default. When on, changes made to the Keys are tracked and the
+        rows of the last serialization are kept, serializing again only
+        regenerates the rows holding edited Keys. The rows take several times
+        the memory of the KLE JSON text, copies and unpickled Keyboards start
+        with caching off.
+        """
+        return self.__keys._caches_rows
+
+    @caches_rows.setter
+    def caches_rows(self, caches_rows: bool) -> None:
+        self.__keys._cache_rows(caches_rows)
+
+    @classmethod
+    def from_json(
+        cls,
+        keyboard_json: Keyboard_JSON,
+        validate: str = "full",
+    ) -> Keyboard:
+        """Deserializes a KLE JSON into a Keyboard.
+
+        The ``validate`` mode controls how much the input is trusted:
+
+        - ``"full"`` validates against the kle-json schemas.
+        - ``"fast"`` only checks the row and item structure.
+        - ``"off"`` skips validation, for inputs produced by this library.
+
+        :param keyboard_json: KLE JSON to parse
+        :param validate: validation mode, one of ``"full"``, ``"fast"``, ``"off"``
+        :return: Keyboard instance
+        """
+
+        _validate(keyboard_json, validate)
+
+        keyboard: Keyboard = Keyboard()
+        keyboard.keys.extend(_deserialized_keys(keyboard_json, keyboard.metadata))
+        return keyboard
+
+    @classmethod
+    def iter_keys(
+        cls,
+        fp: IO,
+        validate: str = "fast",
+        metadata: Optional[Metadata] = None,
+    ) -> Iterator[Key]:
+        """Incrementally deserializes the Keys of a KLE JSON file.
+
+        The file is tokenized as it is read and Keys are yielded as soon as
+        their labels are reached, without holding the document or the Keys in
+        memory. Only ``"fast"`` and ``"off"`` validation are available, full
+        validation requires the whole document.
+
+        .. code-block:: python
+
+            with open("keyboard.json", "rb") as fp:
+                for key in Keyboard.iter_keys(fp):
+                    pass
+
+        :param fp: text or binary file-like object containing KLE JSON
+        :param validate: validation mode, one of ``"fast"``, ``"off"``
+        :param metadata: Metadata to play the metadata changes back into
+        :return: iterator of Key instances
+        """
+        return _deserialized_keys(
+            _iter_json_rows(fp, validate),
+            Metadata() if metadata is None else metadata,
+        )
+
+    @classmethod
+    def load_many(
+        cls,
+        paths: Iterable[Union[str, PathLike]],
+        workers: Optional[int] = None,
+        executor: str = "process",
+        validate: str = "full",
+        ordered: bool = True,
+        cache: Optional[ParseCache] = None,
+    ) -> Iterator[Tuple[Union[str, PathLike], Union[Keyboard, Exception]]]:
+        """Loads and deserializes many KLE JSON files in parallel.
+
+        Files are parsed and validated by a pool of workers, errors are
+        reported per file instead of being raised.
+
+        .. code-block:: python
+
+            for path, result in Keyboard.load_many(paths, workers=8):
+                if isinstance(result, Exception):
+                    print(f"{path}: {result}")
+
+        :param paths: paths of the KLE JSON files
+        :param workers: number of workers, defaults to the executor's default
+        :param executor: pool of workers, one of ``"process"``, ``"thread"``
+        :param validate: validation mode, one of ``"full"``, ``"fast"``, ``"off"``
+        :param ordered: whether results follow the order of ``paths``,
+            otherwise they are yielded as they complete
+        :param cache: cache of parsed layouts, shared by the workers
+        :return: iterator of paths with their Keyboard or the error raised
+        """
+        if executor not in _executors:
+            raise ValueError(
+                f"Invalid executor {executor!r}, " f"expected one of {_executors}."
+            )
+        if validate not in ("full", "fast", "off"):
+            raise ValueError(
+                f"Invalid validate mode {validate!r}, "
+                "expected one of ('full', 'fast', 'off')."
+            )
+        # imported on use, most programs never load in parallel
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        return _loaded_many(
+            list(paths),
+            ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor,
+            workers,
+            validate,
+            ordered,
+            cache,
+        )
+
+    def to_table(self) -> KeyTable:
+        """Converts the Keyboard into a columnar KeyTable.
+
+        :return: KeyTable instance holding copies of the Keys and Metadata
+        """
+        from .table import KeyTable
+
+        return KeyTable.from_keys(self.__keys, self.__metadata)
+
+    @classmethod
+    def from_table(cls, table: KeyTable) -> Keyboard:
+        """Converts a columnar KeyTable into a Keyboard.
+
+        :param table: KeyTable to convert
+        :return: Keyboard instance
+        """
+        keyboard: Keyboard = Keyboard()
+        keyboard.metadata = deepcopy(table.metadata)
+        keyboard.keys = table.to_keys()
+        return keyboard
+
+    def geometry(self, vectorized: Optional[bool] = None) -> KeyGeometry:
+        """Computes the rotated outlines, centers and bounds of the Keys.
+
+        :param vectorized: True to require numpy, False to compute in pure
+            Python, None to use numpy when installed
+        :return: KeyGeometry instance, indexed like the Keys
+        """
+        from .geometry import KeyGeometry
+
+        return KeyGeometry(self.__keys, vectorized)
+
+    def spatial_index(
+        self,
+        cell_size: float = 1.0,
+        vectorized: Optional[bool] = None,
+    ) -> SpatialIndex:
+        """Indexes the rotated shapes of the Keys for point and range queries.
+
+        The index follows changes to the geometry of the Keys, Keys added to
+        or removed from the Keyboard afterwards are not followed.
+
+        :param cell_size: width and height of the grid cells in key units
+        :param vectorized: True to require numpy, False to compute in pure
+            Python, None to use numpy when installed
+        :return: SpatialIndex instance
+        """
+        from .spatial import SpatialIndex
+
+        return SpatialIndex(self.__keys, cell_size, vectorized)
+
+    def key_graph(
+        self,
+        gap: float = 0.25,
+        vectorized: Optional[bool] = None,
+    ) -> KeyGraph:
+        """Finds the neighbours of the Keys, to infer a switch matrix.
+
+        :param gap: distance in key units Keys may be apart by and still be
+            neighbours
+        :param vectorized: True to require numpy, False to compute in pure
+            Python, None to use numpy when installed
+        :return: KeyGraph instance, indexed like the Keys
+        """
+        from .adjacency import KeyGraph
+
+        return KeyGraph(self.__keys, gap, vectorized)
+
+    def find_overlaps(
+        self,
+        tolerance: float = 1e-6,
+        include_decals: bool = False,
+        vectorized: Optional[bool] = None,
+    ) -> List[Tuple[Key, Key]]:
+        """Finds the Keys whose rotated shapes overlap.
+
+        Both the primary and secondary rectangles of the Keys are compared,
+        duplicated Keys overlap each other. Keys sharing an edge don't.
+
+        :param tolerance: depth in key units shapes must overlap by
+        :param include_decals: whether decals, usually drawn over other Keys,
+            are compared
+        :param vectorized: True to require numpy, False to compute in pure
+            Python, None to use numpy when installed
+        :return: pairs of overlapping Keys, in the order of the Keys
+        """
+        from .geometry import _overlapping_pairs
+
+        keys: List[Key] = [
+            key for key in self.__keys if include_decals or not key.is_decal
+        ]
+        return [
+            (keys[i], keys[j])
+            for i, j in _overlapping_pairs(
+                [key._geometry for key in keys], tolerance, vectorized
+            )
+        ]
+
+    def to_bytes(self) -> bytes:
+        """Serializes the Keyboard into a compact binary encoding.
+
+        The encoding is versioned and close to the size of KLE JSON, keys that
+        are alike share a template of their non-default properties and strings
+        are stored once. It is meant to persist layouts that were already
+        validated, loading it skips parsing and validation.
+
+        :return: the encoded bytes
+        """
+        from .binary import _encoded_keyboard
+
+        return _encoded_keyboard(self)
+
+    @classmethod
+    def from_bytes(cls, data: Any) -> Keyboard:
+        """Deserializes the binary encoding of ``Keyboard.to_bytes``.
+
+        Use ``KeyboardBuffer`` to read the encoding in place, materializing
+        keys on access.
+
+        :param data: bytes, bytearray, memoryview or mmap of the encoding
+        :return: Keyboard instance
+        :raises ValueError: if the data is not a supported encoding
+        """
+        from .binary import KeyboardBuffer
+
+        buffer: KeyboardBuffer = KeyboardBuffer(data)
+        try:
+            return buffer.to_keyboard()
+        finally:
+            buffer.close()
+
+    def to_json(self) -> Keyboard_JSON:
+        """Serializes the Keyboard into a KLE JSON.
+
+        :return: the KLE JSON
+        """
+        keyboard_json: Keyboard_JSON = list()
+        metadata_changes: Dict = _metadata_changes(self.__metadata)
+        if len(metadata_changes) > 0:
+            keyboard_json.append(metadata_changes)
+        for row in _iter_cached_rows(self.__metadata, self.__keys):
+            keyboard_json.append(_copied_row(row.items))
         return keyboard_json
+
+    def dumps(self, minified: bool = False) -> str:
+        """Serializes the Keyboard into KLE JSON text.
+
+        The text is written directly from the Keys and is identical to
+        ``json.dumps(keyboard.to_json(), **json_dump_options)``.
+
+        :param minified: whether to drop the indentation and whitespace
+        :return: the KLE JSON text
+        """
+        return "".join(
+            _iter_json_text(
+                _iter_row_texts(self.__metadata, self.__keys, minified),
+                minified,
+            )
+        )
+
+    def dump(
+        self,
+        fp: IO,
+        minified: bool = False,
+        binary: Optional[bool] = None,
+    ) -> None:
+        """Serializes the Keyboard as KLE JSON text into a file-like object.
+
+        The text is identical to ``Keyboard.dumps``. Each row is written as
+        soon as it is closed, the whole text is never held in memory. Binary
+        targets, including files opened with ``gzip.open`` or ``lzma.open``,
+        are written UTF-8 encoded bytes.
+
+        .. code-block:: python
+
+            with gzip.open("keyboard.json.gz", "wb") as fp:
+                keyboard.dump(fp)
+
+        :param fp: text or binary file-like object to write to
+        :param minified: whether to drop the indentation and whitespace
+        :param binary: whether to write bytes, detected from ``fp`` by default
+        """
+        _write_json_text(
+            fp,
+            _iter_row_texts(self.__metadata, self.__keys, minified),
+            minified,
+            binary,
+        )
+
+    async def dump_async(
+        self,
+        writer: Any,
+        minified: bool = False,
+        binary: Optional[bool] = None,
+    ) -> None:
+        """Serializes the Keyboard as KLE JSON text into an async writer.
+
+        Each row is written as soon as it is closed. Writes returning
+        awaitables are awaited, writers with a ``drain`` coroutine, such as
+        ``asyncio.StreamWriter``, are drained after each row.
+
+        .. code-block:: python
+
+            await keyboard.dump_async(stream_writer)
+
+        :param writer: async writer to write to
+        :param minified: whether to drop the indentation and whitespace
+        :param binary: whether to write bytes, detected from ``writer`` by default
+        """
+        await _write_json_text_async(
+            writer,
+            _iter_row_texts(self.__metadata, self.__keys, minified),
+            minified,
+            binary,
+        )
+
+
+_FrozenKeyboard = _frozen_class(Keyboard)
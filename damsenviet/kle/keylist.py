@@ -0,0 +1,432 @@
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Union,
+    Optional,
+    Tuple,
+    List,
+    Dict,
+    Iterable,
+    Iterator,
+)
+from bisect import bisect_left
+from itertools import groupby
+from .utils import _combined_fingerprint, _frozen_class
+
+if TYPE_CHECKING:
+    from .key import Key
+
+__all__ = ["KeyList"]
+
+
+def _key_sort_criteria(
+    key: Key,
+) -> Tuple[float, float, float, float, float]:
+    """Helper to sort keys into KLE order before serialization.
+
+    :param key: Key to compare
+    :return: multidimensional ordering for comparison
+    """
+    return (
+        (key.rotation_angle + 360) % 360,
+        key.rotation_x,
+        key.rotation_y,
+        key.y,
+        key.x,
+    )
+
+
+class _KeyOrder:
+    """Keys of a KeyList kept in KLE order.
+
+    Keys are inserted and removed by bisection as the list changes, and moved
+    when their position or rotation changes. Bisection can't tell the list
+    order of Keys sharing a position, the Keys are sorted again whenever such
+    Keys are involved.
+
+    :ivar keys: Keys in KLE order
+    :ivar criteria: sort criteria of the Keys, in the same order
+    :ivar criteria_by_id: sort criteria of the Keys by id
+    :ivar changed_keys: changed keys by id, moved before the next read
+    :ivar is_sorted: whether the order is up to date with the list
+    :ivar version: incremented whenever the order changes
+    """
+
+    __slots__ = (
+        "keys",
+        "criteria",
+        "criteria_by_id",
+        "changed_keys",
+        "is_sorted",
+        "version",
+    )
+
+    def __init__(self):
+        self.keys: List[Key] = list()
+        self.criteria: List[Tuple] = list()
+        self.criteria_by_id: Dict[int, Tuple] = dict()
+        self.changed_keys: Dict[int, Key] = dict()
+        self.is_sorted: bool = False
+        self.version: int = 0
+
+    def invalidate(self) -> None:
+        """Sorts the Keys again on the next read."""
+        self.is_sorted = False
+        self.changed_keys.clear()
+
+    def sort(self, keys: List[Key]) -> None:
+        """Sorts the Keys of a list, stable like ``sorted``.
+
+        :param keys: Keys in list order
+        """
+        key_criteria = [_key_sort_criteria(key) for key in keys]
+        order = sorted(range(len(keys)), key=key_criteria.__getitem__)
+        self.keys = [keys[i] for i in order]
+        self.criteria = [key_criteria[i] for i in order]
+        self.criteria_by_id = {
+            id(key): criteria for key, criteria in zip(keys, key_criteria)
+        }
+        self.changed_keys.clear()
+        self.is_sorted = True
+        self.version += 1
+
+    def insert(self, key: Key) -> None:
+        """Inserts an added Key.
+
+        :param key: added Key
+        """
+        if not self.is_sorted:
+            return
+        if id(key) in self.criteria_by_id:
+            # held more than once
+            self.invalidate()
+            return
+        criteria = _key_sort_criteria(key)
+        i = bisect_left(self.criteria, criteria)
+        if i < len(self.criteria) and self.criteria[i] == criteria:
+            self.invalidate()
+            return
+        self.keys.insert(i, key)
+        self.criteria.insert(i, criteria)
+        self.criteria_by_id[id(key)] = criteria
+        self.version += 1
+
+    def remove(self, key: Key) -> None:
+        """Removes a Key no longer held.
+
+        :param key: removed Key
+        """
+        if not self.is_sorted:
+            return
+        self.changed_keys.pop(id(key), None)
+        criteria = self.criteria_by_id.pop(id(key), None)
+        i = -1 if criteria is None else bisect_left(self.criteria, criteria)
+        while 0 <= i < len(self.keys) and self.criteria[i] == criteria:
+            if self.keys[i] is key:
+                del self.keys[i]
+                del self.criteria[i]
+                self.version += 1
+                return
+            i += 1
+        # sort criteria that can't be bisected, such as nan
+        self.invalidate()
+
+    def index(self, key: Key) -> Optional[int]:
+        """Finds the position of a Key in KLE order.
+
+        :param key: Key to find
+        :return: index of the Key, None if it isn't held
+        """
+        criteria = self.criteria_by_id.get(id(key))
+        if criteria is None:
+            return None
+        i = bisect_left(self.criteria, criteria)
+        while i < len(self.keys) and self.criteria[i] == criteria:
+            if self.keys[i] is key:
+                return i
+            i += 1
+        # sort criteria that can't be bisected, such as nan
+        for i, other in enumerate(self.keys):
+            if other is key:
+                return i
+        return None
+
+    def update(self, keys: List[Key]) -> None:
+        """Brings the order up to date, moving the changed Keys.
+
+        :param keys: Keys in list order
+        """
+        changed_keys = self.changed_keys
+        self.changed_keys = dict()
+        for key in changed_keys.values():
+            if not self.is_sorted:
+                break
+            if _key_sort_criteria(key) != self.criteria_by_id.get(id(key)):
+                self.remove(key)
+                self.insert(key)
+        if not self.is_sorted:
+            self.sort(keys)
+
+
+class KeyList(list):
+    """List of Keys that tracks changes made to its Keys.
+
+    Behaves like a list. When rows are cached, see ``Keyboard.caches_rows``,
+    Keys notify the lists holding them whenever their properties, Labels or
+    Switch change, so that serialization only regenerates the rows of edited
+    Keys. The KLE order of the Keys is maintained as they
+    are added, removed or moved instead of being sorted for every
+    serialization.
+    """
+
+    __slots__ = (
+        "__changed_keys",
+        "__order",
+        "__counts",
+        "__fingerprint",
+        "_row_cache",
+        "_caches_rows",
+    )
+
+    def __init__(self, keys: Iterable[Key] = ()):
+        """Initializes a KeyList.
+
+        :param keys: Keys to hold
+        """
+        super().__init__(keys)
+        # changed keys by id, kept until the next serialization
+        self.__changed_keys: Dict[int, Key] = dict()
+        # sorted on the first read
+        self.__order: _KeyOrder = _KeyOrder()
+        # times each Key is held, by id
+        self.__counts: Dict[int, int] = dict()
+        # combined fingerprint of the Keys in KLE order
+        self.__fingerprint: Optional[int] = None
+        # serialized rows, maintained by the keyboard serializer
+        self._row_cache: Any = None
+        # changes are only tracked for cached rows
+        self._caches_rows: bool = False
+        counts: Dict[int, int] = self.__counts
+        for key in self:
+            key._observe(self)
+            counts[id(key)] = counts.get(id(key), 0) + 1
+
+    def __reduce__(self) -> Tuple:
+        """Pickles as a plain list of Keys, change tracking starts over."""
+        return (self.__class__, (list(self),))
+
+    def _key_changed(self, key: Key) -> None:
+        """Records a change made to a held Key.
+
+        :param key: changed Key
+        """
+        if self._caches_rows:
+            self.__changed_keys[id(key)] = key
+        self.__fingerprint = None
+        if self.__order.is_sorted:
+            self.__order.changed_keys[id(key)] = key
+
+    def _take_changes(self) -> Dict[int, Key]:
+        """Takes the changes recorded since the last call.
+
+        :return: changed keys by id
+        """
+        changed_keys = self.__changed_keys
+        self.__changed_keys = dict()
+        return changed_keys
+
+    def _cache_rows(self, caches_rows: bool) -> None:
+        """Starts or stops caching the serialized rows.
+
+        :param caches_rows: whether to cache the rows
+        """
+        self._caches_rows = caches_rows
+        if not caches_rows:
+            self._row_cache = None
+            self.__changed_keys = dict()
+
+    def _restore_changes(self, changed_keys: Dict[int, Key]) -> None:
+        """Puts back changes taken by an abandoned serialization.
+
+        :param changed_keys: changed keys by id
+        """
+        self.__changed_keys.update(changed_keys)
+
+    def _sorted(self) -> Tuple[List[Key], int]:
+        """Keys in KLE order, not to be mutated.
+
+        :return: sorted Keys and the version of their order
+        """
+        order = self.__order
+        if not order.is_sorted or order.changed_keys:
+            order.update(self)
+        return order.keys, order.version
+
+    def _sorted_index(self, key: Key) -> Optional[int]:
+        """Finds the position of a Key in KLE order, as of the last ``_sorted``.
+
+        :param key: Key to find
+        :return: index of the Key, None if it isn't held
+        """
+        return self.__order.index(key)
+
+    def _fingerprint(self) -> int:
+        """Combined fingerprint of the Keys in KLE order.
+
+        :return: fingerprint, cached until the list or its Keys change
+        """
+        if self.__fingerprint is None:
+            self.__fingerprint = _combined_fingerprint(
+                [key.fingerprint() for key in self._sorted()[0]]
+            )
+        return self.__fingerprint
+
+    def iter_sorted(self) -> Iterator[Key]:
+        """Iterates over the Keys in KLE order.
+
+        Keys are ordered by rotation angle, rotation origin, y then x. Keys
+        sharing all of them keep their list order.
+
+        :return: iterator of Keys
+        """
+        return iter(list(self._sorted()[0]))
+
+    def iter_clusters(self) -> Iterator[List[Key]]:
+        """Iterates over the rotation clusters of the Keys in KLE order.
+
+        :return: iterator of the Keys sharing a rotation angle and origin
+        """
+        return self.__iter_groups(3)
+
+    def iter_rows(self) -> Iterator[List[Key]]:
+        """Iterates over the rows of the Keys in KLE order.
+
+        :return: iterator of the Keys sharing a rotation cluster and y
+        """
+        return self.__iter_groups(4)
+
+    def __iter_groups(self, length: int) -> Iterator[List[Key]]:
+        self._sorted()
+        order = self.__order
+        pairs = list(zip(order.criteria, order.keys))
+        for _, group in groupby(pairs, key=lambda pair: pair[0][:length]):
+            yield [key for _, key in group]
+
+    def __added(self, keys: Iterable[Key]) -> None:
+        self.__fingerprint = None
+        counts: Dict[int, int] = self.__counts
+        for key in keys:
+            key._observe(self)
+            counts[id(key)] = counts.get(id(key), 0) + 1
+            self.__order.insert(key)
+
+    def __removed(self, keys: Iterable[Key]) -> None:
+        self.__fingerprint = None
+        counts: Dict[int, int] = self.__counts
+        for key in keys:
+            count: int = counts.pop(id(key)) - 1
+            if count > 0:
+                # held more than once
+                counts[id(key)] = count
+                self.__order.invalidate()
+                continue
+            key._unobserve(self)
+            self.__order.remove(key)
+            # changes are no longer tracked, should the key come back
+            if self._caches_rows:
+                self.__changed_keys[id(key)] = key
+
+    def append(self, key: Key) -> None:
+        super().append(key)
+        self.__added((key,))
+
+    def extend(self, keys: Iterable[Key]) -> None:
+        keys = list(keys)
+        super().extend(keys)
+        self.__added(keys)
+
+    def insert(self, index: int, key: Key) -> None:
+        super().insert(index, key)
+        self.__added((key,))
+
+    def remove(self, key: Key) -> None:
+        super().remove(key)
+        self.__removed((key,))
+
+    def pop(self, index: int = -1) -> Key:
+        key = super().pop(index)
+        self.__removed((key,))
+        return key
+
+    def clear(self) -> None:
+        keys = list(self)
+        super().clear()
+        self.__removed(keys)
+
+    def __setitem__(
+        self,
+        index: Union[int, slice],
+        value: Union[Key, Iterable[Key]],
+    ) -> None:
+        if type(index) is slice:
+            removed = super().__getitem__(index)
+            value = list(value)
+            added = value
+        else:
+            removed = [super().__getitem__(index)]
+            added = [value]
+        super().__setitem__(index, value)
+        self.__removed(removed)
+        self.__added(added)
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if type(index) is slice:
+            removed = super().__getitem__(index)
+        else:
+            removed = [super().__getitem__(index)]
+        super().__delitem__(index)
+        self.__removed(removed)
+
+    def __iadd__(self, keys: Iterable[Key]) -> KeyList:
+        self.extend(keys)
+        return self
+
+    def __imul__(self, times: int) -> KeyList:
+        keys = list(self)
+        super().__imul__(times)
+        if times < 1:
+            self.__removed(keys)
+        else:
+            self.__added(keys * (times - 1))
+        return self
+
+    def sort(self, *, key: Optional[Any] = None, reverse: bool = False) -> None:
+        super().sort(key=key, reverse=reverse)
+        # keys sharing a position may have swapped
+        self.__order.invalidate()
+        self.__fingerprint = None
+
+    def reverse(self) -> None:
+        super().reverse()
+        self.__order.invalidate()
+        self.__fingerprint = None
+
+
+_FrozenKeyList = _frozen_class(
+    KeyList,
+    (
+        "append",
+        "extend",
+        "insert",
+        "remove",
+        "pop",
+        "clear",
+        "__setitem__",
+        "__delitem__",
+        "__iadd__",
+        "__imul__",
+        "sort",
+        "reverse",
+    ),
+)
@@ -1,17 +1,172 @@
 from __future__ import annotations
-from typing import Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Union,
+    Optional,
+    Tuple,
+    List,
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+)
+from .utils import _interned, _fingerprint, _frozen_class
 
-__all__ = ["Label"]
+if TYPE_CHECKING:
+    from .key import Key
+
+__all__ = ["Label", "Labels"]
+
+
+class _LabelStyle(NamedTuple):
+    """Immutable text color and size shared between Labels."""
+
+    color: str
+    size: Union[int, float]
+
+
+_label_styles: Dict[Tuple, _LabelStyle] = dict()
+
+
+def _label_style(color: str, size: Union[int, float]) -> _LabelStyle:
+    """Returns the shared label style for a text color and size.
+
+    :param color: CSS text color
+    :param size: font size scale
+    :return: shared label style
+    """
+    return _interned(_label_styles, _LabelStyle(color, size))
 
 
 class Label:
     """Label information."""
 
+    __slots__ = (
+        "__text",
+        "__style",
+        "__observers",
+    )
+
     def __init__(self):
         """Initializes a Label."""
         self.__text: str = ""
-        self.__color: str = "#000000"
-        self.__size: Union[int, float] = 3
+        # color and size are shared, setters replace the style
+        self.__style: _LabelStyle = _label_style("#000000", 3)
+        # keys notified of changes, see _observe
+        self.__observers: Tuple[Key, ...] = ()
+
+    def __deepcopy__(self, memo: Dict) -> Label:
+        """Copies the Label field by field.
+
+        Labels only hold immutable values, bypassing the generic copy machinery.
+        """
+        label = self.__class__.__new__(self.__class__)
+        label.__text = self.__text
+        label.__style = self.__style
+        label.__observers = ()
+        return label
+
+    def __getstate__(self) -> Tuple[str, _LabelStyle]:
+        """Compact pickled state.
+
+        Styles are pickled once per pickle and stay shared when unpickled.
+        """
+        return (self.__text, self.__style)
+
+    def __setstate__(self, state: Tuple[str, _LabelStyle]) -> None:
+        self.__text, self.__style = state
+        self.__observers = ()
+
+    def equals(self, other: Any) -> bool:
+        """Compares the text, color and size with another Label.
+
+        :param other: object to compare
+        :return: whether other is a Label with the same text, color and size
+        """
+        return (
+            isinstance(other, Label)
+            and self.__text == other.__text
+            and self.__style == other.__style
+        )
+
+    def fingerprint(self) -> int:
+        """Stable 128-bit hash of the text, color and size.
+
+        Equal Labels have equal fingerprints across processes and versions.
+
+        :return: fingerprint
+        """
+        style = self.__style
+        return _fingerprint((style.size,), (self.__text, style.color))
+
+    def _frozen(self) -> Label:
+        """Immutable copy of the Label, see ``Keyboard.freeze``.
+
+        :return: frozen Label
+        """
+        label = _FrozenLabel.__new__(_FrozenLabel)
+        label.__setstate__(self.__getstate__())
+        return label
+
+    def _thawed(self) -> Label:
+        """Mutable copy of the Label, see ``Keyboard.thaw``.
+
+        :return: Label instance
+        """
+        label = Label.__new__(Label)
+        label.__setstate__(self.__getstate__())
+        return label
+
+    @classmethod
+    def _of(cls, key: Key, style: _LabelStyle, text: str = "") -> Label:
+        """Creates a Label held by a Key.
+
+        :param key: Key holding the Label
+        :param style: shared text color and size
+        :param text: text content
+        :return: Label instance
+        """
+        label = cls.__new__(cls)
+        label.__text = text
+        label.__style = style
+        label.__observers = (key,)
+        return label
+
+    def _observe(self, key: Key) -> None:
+        """Notifies a Key of changes to the Label.
+
+        :param key: Key holding the Label
+        """
+        for other in self.__observers:
+            if other is key:
+                return
+        self.__observers += (key,)
+
+    def _unobserve(self, key: Key) -> None:
+        """Stops notifying a Key of changes.
+
+        :param key: Key passed to ``_observe``
+        """
+        self.__observers = tuple(
+            other for other in self.__observers if other is not key
+        )
+
+    def _changed(self) -> None:
+        """Notifies the Keys holding the Label that it changed."""
+        for key in self.__observers:
+            key._changed()
+
+    @property
+    def _style(self) -> _LabelStyle:
+        """Shared text color and size."""
+        return self.__style
+
+    @_style.setter
+    def _style(self, style: _LabelStyle) -> None:
+        self.__style = style
+        if self.__observers:
+            self._changed()
 
     @property
     def text(self) -> str:
@@ -21,22 +176,238 @@ class Label:
     @text.setter
     def text(self, text: str) -> None:
         self.__text = text
+        if self.__observers:
+            self._changed()
 
     @property
     def color(self) -> str:
         """CSS text color."""
-        return self.__color
+        return self.__style.color
 
     # any valid css color str value
     @color.setter
     def color(self, color: str) -> None:
-        self.__color = color
+        self.__style = _label_style(color, self.__style.size)
+        if self.__observers:
+            self._changed()
 
     @property
     def size(self) -> Union[int, float]:
         """Font size scale."""
-        return self.__size
+        return self.__style.size
 
     @size.setter
     def size(self, size: Union[int, float]) -> None:
-        self.__size = size
+        self.__style = _label_style(self.__style.color, size)
+        if self.__observers:
+            self._changed()
+
+
+class _LabelSlot:
+    """Unpopulated index of Labels, populated once its detached Label changes."""
+
+    __slots__ = (
+        "labels",
+        "index",
+        "label",
+    )
+
+    def __init__(self, labels: Labels, index: int, label: Label):
+        self.labels: Labels = labels
+        self.index: int = index
+        self.label: Optional[Label] = label
+
+    def _changed(self) -> None:
+        """Inserts the detached Label, notified like a Key holding it."""
+        label: Optional[Label] = self.label
+        if label is None:
+            return
+        self.label = None
+        label._unobserve(self)
+        self.labels[self.index] = label
+
+
+class Labels:
+    """12 Labels of a Key, storing only the Labels that have been populated.
+
+    Indexable like a list of 12 Labels. Labels that were never populated are
+    read as detached Labels with empty text and the key's default text color
+    and size, inserted when they are first changed. Reading them doesn't
+    populate the Key, ``items`` lists the populated Labels only.
+    """
+
+    __slots__ = (
+        "__key",
+        "__mask",
+        "__labels",
+    )
+
+    def __init__(self, key: Key, labels: Iterable[Label] = ()):
+        """Initializes the Labels of a Key.
+
+        :param key: Key providing the default text color and size
+        :param labels: Labels to populate, in index order
+        """
+        self.__key: Key = key
+        # bit i of the mask marks index i as populated,
+        # populated labels are kept in index order
+        self.__labels: Tuple[Label, ...] = tuple(labels)
+        if len(self.__labels) > 12:
+            raise IndexError("A key holds at most 12 labels.")
+        self.__mask: int = (1 << len(self.__labels)) - 1
+        for label in self.__labels:
+            label._observe(key)
+
+    def __deepcopy__(self, memo: Dict) -> Labels:
+        """Copies the populated Labels.
+
+        The copy belongs to the copied key, if it is in ``memo``.
+        """
+        labels = self.__class__.__new__(self.__class__)
+        labels.__key = memo.get(id(self.__key), self.__key)
+        labels.__mask = self.__mask
+        labels.__labels = tuple(label.__deepcopy__(memo) for label in self.__labels)
+        for label in labels.__labels:
+            label._observe(labels.__key)
+        return labels
+
+    @classmethod
+    def _of(cls, key: Key, mask: int, labels: Tuple[Label, ...]) -> Labels:
+        """Creates the Labels of a Key from Labels already held by the Key.
+
+        :param key: Key holding the Labels
+        :param mask: populated index mask
+        :param labels: populated Labels in index order
+        :return: Labels instance
+        """
+        instance = cls.__new__(cls)
+        instance.__key = key
+        instance.__mask = mask
+        instance.__labels = labels
+        return instance
+
+    def _thawed(self, key: Key) -> Labels:
+        """Mutable copy of the Labels, see ``Keyboard.thaw``.
+
+        :param key: mutable copy of the Key holding the Labels
+        :return: Labels instance
+        """
+        labels = Labels.__new__(Labels)
+        labels.__key = key
+        labels.__mask = self.__mask
+        labels.__labels = tuple(
+            [Label._of(key, label._style, label.text) for label in self.__labels]
+        )
+        return labels
+
+    def _freeze(self) -> None:
+        """Makes the Labels and the populated Labels immutable, in place.
+
+        Only used on the Labels of a Key being frozen, see ``Key._frozen``.
+        """
+        self.__class__ = _FrozenLabels
+        for label in self.__labels:
+            label.__class__ = _FrozenLabel
+
+    def __getstate__(self) -> Tuple[Key, int, Tuple[Label, ...]]:
+        """Compact pickled state, only the populated Labels are kept."""
+        return (self.__key, self.__mask, self.__labels)
+
+    def __setstate__(self, state: Tuple[Key, int, Tuple[Label, ...]]) -> None:
+        self.__key, self.__mask, self.__labels = state
+        for label in self.__labels:
+            label._observe(self.__key)
+
+    def __len__(self) -> int:
+        return 12
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Label, List[Label]]:
+        if type(index) is slice:
+            return [self[i] for i in range(12)[index]]
+        index = _label_index(index)
+        if self.__mask & (1 << index):
+            return self.__labels[_rank(self.__mask, index)]
+        if isinstance(self, _FrozenLabels):
+            label = _FrozenLabel.__new__(_FrozenLabel)
+            label.__setstate__(("", self.__key._default_label_style))
+            return label
+        label = Label.__new__(Label)
+        label.__setstate__(("", self.__key._default_label_style))
+        label._observe(_LabelSlot(self, index, label))
+        return label
+
+    def _populated(self, index: int) -> Label:
+        """Label at an index, inserted with the key's defaults if unpopulated.
+
+        Used while building Keys, to edit Labels in place.
+
+        :param index: label index
+        :return: Label held by the Key
+        """
+        rank = _rank(self.__mask, index)
+        if self.__mask & (1 << index):
+            return self.__labels[rank]
+        label = Label._of(self.__key, self.__key._default_label_style)
+        self.__insert(index, rank, label)
+        return label
+
+    def __setitem__(self, index: int, label: Label) -> None:
+        index = _label_index(index)
+        rank = _rank(self.__mask, index)
+        if self.__mask & (1 << index):
+            labels = self.__labels
+            labels[rank]._unobserve(self.__key)
+            self.__labels = labels[:rank] + (label,) + labels[rank + 1 :]
+        else:
+            self.__insert(index, rank, label)
+        label._observe(self.__key)
+        self.__key._changed()
+
+    def __insert(self, index: int, rank: int, label: Label) -> None:
+        labels = self.__labels
+        self.__labels = labels[:rank] + (label,) + labels[rank:]
+        self.__mask |= 1 << index
+
+    def __iter__(self) -> Iterator[Label]:
+        for i in range(12):
+            yield self[i]
+
+    def items(self) -> List[Tuple[int, Label]]:
+        """Populated Labels with their indexes, without materializing others.
+
+        :return: index and Label pairs in index order
+        """
+        mask = self.__mask
+        return list(
+            zip(
+                [i for i in range(12) if mask & (1 << i)],
+                self.__labels,
+            )
+        )
+
+
+_FrozenLabel = _frozen_class(Label)
+_FrozenLabels = _frozen_class(Labels, ("__setitem__",))
+
+
+def _label_index(index: int) -> int:
+    """Normalizes a label index, allowing negative indexes.
+
+    :param index: label index
+    :return: label index from 0 to 11
+    """
+    if index < 0:
+        index += 12
+    if index < 0 or index >= 12:
+        raise IndexError("label index out of range")
+    return index
+
+
+def _rank(mask: int, index: int) -> int:
+    """Counts the populated indexes before an index.
+
+    :param mask: populated index mask
+    :param index: label index
+    :return: position of the index among populated labels
+    """
+    return bin(mask & ((1 << index) - 1)).count("1")
@@ -1,7 +1,8 @@
 from __future__ import annotations
-from typing import Union
+from typing import Any, Union, Optional, Tuple
 from .background import Background
 from .switch import Switch
+from .utils import _fingerprint, _frozen_class
 
 __all__ = ["Metadata"]
 
@@ -9,6 +10,21 @@ __all__ = ["Metadata"]
 class Metadata:
     """Metadata information."""
 
+    __slots__ = (
+        "__name",
+        "__author",
+        "__notes",
+        "__background",
+        "__background_color",
+        "__radii",
+        "__css",
+        "__switch",
+        "__is_switches_pcb_mounted",
+        "__include_switches_pcb_mounted",
+        "__is_switches_plate_mounted",
+        "__include_switches_plate_mounted",
+    )
+
     def __init__(self):
         """Initializes a Metadata."""
         self.__name: str = ""
@@ -24,6 +40,122 @@ class Metadata:
         self.__is_switches_plate_mounted: bool = False
         self.__include_switches_plate_mounted: bool = False
 
+    def __getstate__(self) -> Tuple:
+        """Compact pickled state."""
+        return (
+            self.__name,
+            self.__author,
+            self.__notes,
+            self.__background,
+            self.__background_color,
+            self.__radii,
+            self.__css,
+            self.__switch,
+            self.__is_switches_pcb_mounted,
+            self.__include_switches_pcb_mounted,
+            self.__is_switches_plate_mounted,
+            self.__include_switches_plate_mounted,
+        )
+
+    def __setstate__(self, state: Tuple) -> None:
+        (
+            self.__name,
+            self.__author,
+            self.__notes,
+            self.__background,
+            self.__background_color,
+            self.__radii,
+            self.__css,
+            self.__switch,
+            self.__is_switches_pcb_mounted,
+            self.__include_switches_pcb_mounted,
+            self.__is_switches_plate_mounted,
+            self.__include_switches_plate_mounted,
+        ) = state
+
+    def _frozen(self) -> Metadata:
+        """Immutable copy of the Metadata, see ``Keyboard.freeze``.
+
+        :return: frozen Metadata
+        """
+        metadata = _FrozenMetadata.__new__(_FrozenMetadata)
+        metadata.__setstate__(self.__copied_state("_frozen"))
+        return metadata
+
+    def _thawed(self) -> Metadata:
+        """Mutable copy of the Metadata, see ``Keyboard.thaw``.
+
+        :return: Metadata instance
+        """
+        metadata = Metadata.__new__(Metadata)
+        metadata.__setstate__(self.__copied_state("_thawed"))
+        return metadata
+
+    def __copied_state(self, copy: str) -> Tuple:
+        """State holding copies of the Background and Switch.
+
+        :param copy: name of the copying method, ``_frozen`` or ``_thawed``
+        :return: state, see ``__getstate__``
+        """
+        state = self.__getstate__()
+        return (
+            state[:3]
+            + (None if state[3] is None else getattr(state[3], copy)(),)
+            + state[4:7]
+            + (getattr(state[7], copy)(),)
+            + state[8:]
+        )
+
+    def equals(self, other: Any) -> bool:
+        """Compares all the information with other Metadata.
+
+        :param other: object to compare
+        :return: whether other is Metadata with the same information
+        """
+        if not isinstance(other, Metadata):
+            return False
+        state: Tuple = self.__getstate__()
+        other_state: Tuple = other.__getstate__()
+        background: Optional[Background] = state[3]
+        return (
+            state[:3] + state[4:7] + state[8:]
+            == other_state[:3] + other_state[4:7] + other_state[8:]
+            and (
+                background is other_state[3]
+                or background is not None
+                and background.equals(other_state[3])
+            )
+            and state[7].equals(other_state[7])
+        )
+
+    def fingerprint(self) -> int:
+        """Stable 128-bit hash of all the information.
+
+        :return: fingerprint
+        """
+        return _fingerprint(
+            (
+                self.__is_switches_pcb_mounted,
+                self.__include_switches_pcb_mounted,
+                self.__is_switches_plate_mounted,
+                self.__include_switches_plate_mounted,
+            ),
+            (
+                self.__name,
+                self.__author,
+                self.__notes,
+                (
+                    None
+                    if self.__background is None
+                    else (self.__background.name, self.__background.style)
+                ),
+                self.__background_color,
+                self.__radii,
+                self.__css,
+                tuple(self.__switch._record),
+            ),
+        )
+
     @property
     def name(self) -> str:
         """Keyboard name."""
@@ -136,3 +268,6 @@ class Metadata:
         self, include_switches_plate_mounted: bool
     ) -> None:
         self.__include_switches_plate_mounted = include_switches_plate_mounted
+
+
+_FrozenMetadata = _frozen_class(Metadata)
@@ -0,0 +1,482 @@
+from __future__ import annotations
+from typing import (
+    Any,
+    Union,
+    Optional,
+    Callable,
+    Tuple,
+    List,
+    Dict,
+)
+from .metadata import Metadata
+from .key import Key
+
+__all__ = [
+    "PlaybackState",
+    "register_key_change",
+    "unregister_key_change",
+    "register_metadata_change",
+    "unregister_metadata_change",
+]
+
+
+# fmt: off
+_label_map = [
+    # -1 indicates not used
+    [0, 6, 2, 8, 9, 11, 3, 5, 1, 4, 7, 10],  # 0 = no centering
+    [1, 7, -1, -1, 9, 11, 4, -1, -1, -1, -1, 10],  # 1 = center x
+    [3, -1, 5, -1, 9, 11, -1, -1, 4, -1, -1, 10],  # 2 = center y
+    [4, -1, -1, -1, 9, 11, -1, -1, -1, -1, -1, 10],  # 3 = center x & y
+    [0, 6, 2, 8, 10, -1, 3, 5, 1, 4, 7, -1],  # 4 = center front (default)
+    [1, 7, -1, -1, 10, -1, 4, -1, -1, -1, -1, -1],  # 5 = center front & x
+    [3, -1, 5, -1, 10, -1, -1, -1, 4, -1, -1, -1],  # 6 = center front & y
+    # 7 = center front & x & y
+    [4, -1, -1, -1, 10, -1, -1, -1, -1, -1, -1, -1],
+]
+"""
+Alignment to used label indexes.
+-1 indicates not used.
+"""
+# fmt: on
+
+
+def _unaligned(
+    aligned_items: List,
+    alignment: int,
+    default_val: Any,
+) -> List:
+    """Generates unaligned ordering of aligned items.
+
+    :param aligned_items: aligned items to be unaligned
+    :param alignment: alignment option (0 - 7)
+    :param default_val: default value to fill the unused indexes
+    :return: copy of the array reordered to be unaligned reoredered
+    """
+    unaligned_items = [default_val for i in range(12)]
+    for i, aligned_item in enumerate(aligned_items):
+        unaligned_items[_label_map[alignment][i]] = aligned_item
+    return unaligned_items
+
+
+class PlaybackState:
+    """Running state of a KLE JSON playback, handed to key change handlers.
+
+    :ivar key: Key accumulating the changes, copied for every label string
+    :ivar labels_color: aligned label colors, default values set to ""
+    :ivar labels_size: aligned label sizes, default values set to 0
+    :ivar alignment: tracked text alignment
+    :ivar cluster_rotation_x: tracked rotation origin x
+    :ivar cluster_rotation_y: tracked rotation origin y
+    :ivar is_labels_size_changed: whether label sizes need to be unaligned again
+    :ivar is_labels_color_changed: whether label colors need to be unaligned again
+    """
+
+    __slots__ = (
+        "key",
+        "labels_color",
+        "labels_size",
+        "alignment",
+        "cluster_rotation_x",
+        "cluster_rotation_y",
+        "is_labels_size_changed",
+        "is_labels_color_changed",
+    )
+
+    def __init__(self):
+        """Initializes a PlaybackState with KLE's defaults."""
+        self.key: Key = Key()
+        self.labels_color: List[str] = ["" for i in range(12)]
+        self.labels_size: List[Union[int, float]] = [0 for i in range(12)]
+        self.alignment: int = 4
+        self.cluster_rotation_x: float = 0.0
+        self.cluster_rotation_y: float = 0.0
+        self.is_labels_size_changed: bool = False
+        self.is_labels_color_changed: bool = False
+
+
+Key_Change_Handler = Callable[[PlaybackState, Any], None]
+Metadata_Change_Handler = Callable[[Metadata, Any], None]
+
+
+class _DispatchTable:
+    """Change handlers by property name, applied in priority order.
+
+    Handlers to run are planned once per distinct sequence of property names,
+    so playback only visits the properties present in each change.
+    """
+
+    def __init__(self, handlers: List[Tuple[str, Callable]]):
+        """Initializes a _DispatchTable.
+
+        :param handlers: built-in handlers by property name, in priority order
+        """
+        self.__handlers: Dict[str, Tuple[float, Callable]] = {
+            name: (float(priority), handler)
+            for priority, (name, handler) in enumerate(handlers)
+        }
+        self.__plans: Dict[Tuple[str, ...], List[Tuple[str, Callable]]] = dict()
+
+    def register(
+        self,
+        name: str,
+        handler: Callable,
+        priority: Optional[float] = None,
+    ) -> None:
+        """Registers or replaces the handler of a property.
+
+        :param name: property name in the changes
+        :param handler: handler called with the property value
+        :param priority: handlers run in ascending priority, defaults to the
+            priority of the replaced handler or after every registered handler
+        """
+        if priority is None:
+            if name in self.__handlers:
+                priority = self.__handlers[name][0]
+            else:
+                priority = max(
+                    (priority for priority, _ in self.__handlers.values()),
+                    default=-1.0,
+                )
+                priority = float(int(priority) + 1)
+        self.__handlers[name] = (float(priority), handler)
+        self.__plans.clear()
+
+    def unregister(self, name: str) -> None:
+        """Removes the handler of a property, the property is then ignored.
+
+        :param name: property name in the changes
+        """
+        del self.__handlers[name]
+        self.__plans.clear()
+
+    def plan(self, names: Tuple[str, ...]) -> List[Tuple[str, Callable]]:
+        """Handlers to run for changes holding the given property names.
+
+        :param names: property names in the order of the changes
+        :return: property names with their handlers in priority order
+        """
+        plan = self.__plans.get(names)
+        if plan is None:
+            handlers = self.__handlers
+            plan = [
+                (name, handlers[name][1])
+                for name in sorted(
+                    (name for name in names if name in handlers),
+                    key=lambda name: handlers[name][0],
+                )
+            ]
+            # distinct name sequences are few in practice, bound them anyway
+            if len(self.__plans) >= 1 << 12:
+                self.__plans.clear()
+            self.__plans[names] = plan
+        return plan
+
+
+def _playback_r(state: PlaybackState, value: float) -> None:
+    state.key.rotation_angle = value
+
+
+def _playback_rx(state: PlaybackState, value: float) -> None:
+    state.key.rotation_x = value
+    state.cluster_rotation_x = value
+    state.key.x = state.cluster_rotation_x
+    state.key.y = state.cluster_rotation_y
+
+
+def _playback_ry(state: PlaybackState, value: float) -> None:
+    state.key.rotation_y = value
+    state.cluster_rotation_y = value
+    state.key.x = state.cluster_rotation_x
+    state.key.y = state.cluster_rotation_y
+
+
+def _playback_a(state: PlaybackState, value: int) -> None:
+    state.alignment = value
+    state.is_labels_size_changed = True
+
+
+def _playback_f(state: PlaybackState, value: Union[int, float]) -> None:
+    state.key.default_text_size = value
+    labels_size = state.labels_size
+    for i in range(len(labels_size)):
+        labels_size[i] = 0
+    state.is_labels_size_changed = True
+
+
+def _playback_f2(state: PlaybackState, value: Union[int, float]) -> None:
+    labels_size = state.labels_size
+    for i in range(1, 12):
+        labels_size[i] = value
+    state.is_labels_size_changed = True
+
+
+def _playback_fa(state: PlaybackState, value: List[Union[int, float]]) -> None:
+    labels_size = state.labels_size
+    for i in range(len(value)):
+        labels_size[i] = value[i]
+    for i in range(len(value), 12):
+        labels_size[i] = 0
+    state.is_labels_size_changed = True
+
+
+def _playback_p(state: PlaybackState, value: str) -> None:
+    state.key.profile_and_row = value
+
+
+def _playback_c(state: PlaybackState, value: str) -> None:
+    state.key.color = value
+
+
+def _playback_t(state: PlaybackState, value: str) -> None:
+    labels_color = value.split("\n")
+    if labels_color[0] != "":
+        state.key.default_text_color = labels_color[0]
+    for i, color in enumerate(_unaligned(labels_color, state.alignment, "")):
+        state.labels_color[i] = color
+    state.is_labels_color_changed = True
+
+
+def _playback_x(state: PlaybackState, value: float) -> None:
+    state.key.x += value
+
+
+def _playback_y(state: PlaybackState, value: float) -> None:
+    state.key.y += value
+
+
+def _playback_w(state: PlaybackState, value: float) -> None:
+    state.key.width = value
+    state.key.width2 = value
+
+
+def _playback_h(state: PlaybackState, value: float) -> None:
+    state.key.height = value
+    state.key.height2 = value
+
+
+def _playback_h2(state: PlaybackState, value: float) -> None:
+    state.key.height2 = value
+
+
+def _playback_w2(state: PlaybackState, value: float) -> None:
+    state.key.width2 = value
+
+
+def _playback_y2(state: PlaybackState, value: float) -> None:
+    state.key.y2 = value
+
+
+def _playback_x2(state: PlaybackState, value: float) -> None:
+    state.key.x2 = value
+
+
+def _playback_n(state: PlaybackState, value: bool) -> None:
+    state.key.is_homing = value
+
+
+def _playback_l(state: PlaybackState, value: bool) -> None:
+    state.key.is_stepped = value
+
+
+def _playback_d(state: PlaybackState, value: bool) -> None:
+    state.key.is_decal = value
+
+
+def _playback_g(state: PlaybackState, value: bool) -> None:
+    state.key.is_ghosted = value
+
+
+def _playback_switch_mount(state: PlaybackState, value: str) -> None:
+    # sm, sb and st are all played back into the mount
+    state.key.switch.mount = value
+
+
+_key_changes = _DispatchTable(
+    [
+        # rotation origin resets the position before x and y apply
+        ("r", _playback_r),
+        ("rx", _playback_rx),
+        ("ry", _playback_ry),
+        # alignment unaligns the colors of t
+        ("a", _playback_a),
+        # f resets the sizes set by f2 and fa
+        ("f", _playback_f),
+        ("f2", _playback_f2),
+        ("fa", _playback_fa),
+        ("p", _playback_p),
+        ("c", _playback_c),
+        ("t", _playback_t),
+        ("x", _playback_x),
+        ("y", _playback_y),
+        # w and h set the secondary sizes before w2 and h2
+        ("w", _playback_w),
+        ("h", _playback_h),
+        ("h2", _playback_h2),
+        ("w2", _playback_w2),
+        ("y2", _playback_y2),
+        ("x2", _playback_x2),
+        ("n", _playback_n),
+        ("l", _playback_l),
+        ("d", _playback_d),
+        ("g", _playback_g),
+        ("sm", _playback_switch_mount),
+        ("sb", _playback_switch_mount),
+        ("st", _playback_switch_mount),
+    ]
+)
+"""
+Key change handlers by KLE property name.
+"""
+
+
+def _playback_author(metadata: Metadata, value: str) -> None:
+    metadata.author = value
+
+
+def _playback_backcolor(metadata: Metadata, value: str) -> None:
+    metadata.background_color = value
+
+
+def _playback_background(metadata: Metadata, value: Dict) -> None:
+    if "name" in value:
+        metadata.background.name = value["name"]
+    if "style" in value:
+        metadata.background.style = value["style"]
+
+
+def _playback_name(metadata: Metadata, value: str) -> None:
+    metadata.name = value
+
+
+def _playback_notes(metadata: Metadata, value: str) -> None:
+    metadata.notes = value
+
+
+def _playback_radii(metadata: Metadata, value: str) -> None:
+    metadata.radii = value
+
+
+def _playback_switch_mount_default(metadata: Metadata, value: str) -> None:
+    metadata.switch.mount = value
+
+
+def _playback_switch_brand_default(metadata: Metadata, value: str) -> None:
+    metadata.switch.brand = value
+
+
+def _playback_switch_type_default(metadata: Metadata, value: str) -> None:
+    metadata.switch.type = value
+
+
+def _playback_css(metadata: Metadata, value: str) -> None:
+    metadata.css = value
+
+
+def _playback_pcb(metadata: Metadata, value: bool) -> None:
+    metadata.is_switches_pcb_mounted = value
+    metadata.include_switches_pcb_mounted = True
+
+
+def _playback_plate(metadata: Metadata, value: bool) -> None:
+    metadata.is_switches_plate_mounted = value
+    metadata.include_switches_plate_mounted = True
+
+
+_metadata_changes = _DispatchTable(
+    [
+        ("author", _playback_author),
+        ("backcolor", _playback_backcolor),
+        ("background", _playback_background),
+        ("name", _playback_name),
+        ("notes", _playback_notes),
+        ("radii", _playback_radii),
+        ("switchMount", _playback_switch_mount_default),
+        ("switchBrand", _playback_switch_brand_default),
+        ("switchType", _playback_switch_type_default),
+        ("css", _playback_css),
+        ("pcb", _playback_pcb),
+        ("plate", _playback_plate),
+    ]
+)
+"""
+Metadata change handlers by KLE property name.
+"""
+
+
+def register_key_change(
+    name: str,
+    handler: Key_Change_Handler,
+    priority: Optional[float] = None,
+) -> None:
+    """Registers a handler for a key change property.
+
+    Unregistered properties are ignored during playback. Built-in properties
+    have priorities 0 to 24 in the order KLE applies them, registering one of
+    them replaces its handler.
+
+    :param name: property name in the key changes
+    :param handler: called with the PlaybackState and the property value
+    :param priority: handlers run in ascending priority, defaults to the
+        priority of the replaced handler or after every registered handler
+    """
+    _key_changes.register(name, handler, priority)
+
+
+def unregister_key_change(name: str) -> None:
+    """Removes the handler of a key change property.
+
+    :param name: property name in the key changes
+    """
+    _key_changes.unregister(name)
+
+
+def register_metadata_change(
+    name: str,
+    handler: Metadata_Change_Handler,
+    priority: Optional[float] = None,
+) -> None:
+    """Registers a handler for a metadata property.
+
+    Unregistered properties are ignored during playback, registering a
+    built-in property replaces its handler.
+
+    :param name: property name in the metadata
+    :param handler: called with the Metadata and the property value
+    :param priority: handlers run in ascending priority, defaults to the
+        priority of the replaced handler or after every registered handler
+    """
+    _metadata_changes.register(name, handler, priority)
+
+
+def unregister_metadata_change(name: str) -> None:
+    """Removes the handler of a metadata property.
+
+    :param name: property name in the metadata
+    """
+    _metadata_changes.unregister(name)
+
+
+def _playback_metadata_changes(
+    metadata: Metadata,
+    metadata_changes: Dict,
+) -> None:
+    """Plays back recorded Metadata changes into Metadata.
+
+    :param metadata: Metadata to alter
+    :param metadata_changes: Metadata changes
+    """
+    for name, handler in _metadata_changes.plan(tuple(metadata_changes)):
+        handler(metadata, metadata_changes[name])
+
+
+def _playback_key_changes(
+    state: PlaybackState,
+    key_changes: Dict,
+) -> None:
+    """Plays back recorded Key changes into the playback state.
+
+    :param state: playback state to alter
+    :param key_changes: Key changes
+    """
+    for name, handler in _key_changes.plan(tuple(key_changes)):
+        handler(state, key_changes[name])
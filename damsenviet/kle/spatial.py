@@ -0,0 +1,494 @@
+from __future__ import annotations
+from typing import (
+    Optional,
+    Tuple,
+    List,
+    Dict,
+    Set,
+    Iterable,
+    Iterator,
+)
+from array import array
+from heapq import nsmallest
+from math import floor, hypot, radians, cos, sin
+from operator import attrgetter
+from .key import Key, _FrozenKey
+from .geometry import (
+    Bounds,
+    _computed,
+    _computed_rows,
+    _rectangles_overlap,
+)
+
+__all__ = ["SpatialIndex"]
+
+
+_touching: float = -1e-9
+"""
+Overlap depth counted as intersecting, touching shapes intersect despite
+rounding of the rotated corners.
+"""
+
+
+class _Entry:
+    """Key held by a SpatialIndex.
+
+    :ivar key: indexed Key
+    :ivar order: insertion order, results are sorted by it
+    :ivar geometry: geometry of the Key when indexed, see ``Key._geometry``
+    :ivar rotation: cosine and sine of the rotation angle
+    :ivar corners: flattened corners of the primary rectangle
+    :ivar secondary_corners: flattened corners of the secondary rectangle
+    :ivar bounds: axis-aligned bounds of both rectangles
+    :ivar cells: grid cells covered by the bounds
+    """
+
+    __slots__ = (
+        "key",
+        "order",
+        "geometry",
+        "rotation",
+        "corners",
+        "secondary_corners",
+        "bounds",
+        "cells",
+    )
+
+    def __init__(self, key: Key, order: int):
+        self.key: Key = key
+        self.order: int = order
+        self.geometry: Tuple[float, ...] = ()
+        self.rotation: Tuple[float, float] = (1.0, 0.0)
+        self.corners: array = array("d")
+        self.secondary_corners: array = array("d")
+        self.bounds: array = array("d")
+        self.cells: List[Tuple[int, int]] = list()
+
+    def distance(self, x: float, y: float) -> float:
+        """Distance from a point to the rectangles of the Key.
+
+        The point is rotated into the unrotated frame of the Key.
+
+        :param x: x of the point
+        :param y: y of the point
+        :return: distance, 0 inside either rectangle or on their edges
+        """
+        (
+            left,
+            top,
+            width,
+            height,
+            x2,
+            y2,
+            width2,
+            height2,
+            rotation_x,
+            rotation_y,
+            rotation_angle,
+        ) = self.geometry
+        if rotation_angle != 0:
+            cos_, sin_ = self.rotation
+            dx: float = x - rotation_x
+            dy: float = y - rotation_y
+            x = rotation_x + dx * cos_ + dy * sin_
+            y = rotation_y - dx * sin_ + dy * cos_
+        return min(
+            hypot(
+                max(left - x, 0.0, x - left - width),
+                max(top - y, 0.0, y - top - height),
+            ),
+            hypot(
+                max(left + x2 - x, 0.0, x - left - x2 - width2),
+                max(top + y2 - y, 0.0, y - top - y2 - height2),
+            ),
+        )
+
+    def intersects(self, corners: Tuple[float, ...], bounds: Bounds) -> bool:
+        """Whether a rectangle intersects the rectangles of the Key.
+
+        :param corners: flattened corners of the axis-aligned rectangle
+        :param bounds: min x, min y, max x, max y of the rectangle
+        :return: whether they intersect, touching edges included
+        """
+        min_x, min_y, max_x, max_y = bounds
+        own_bounds: array = self.bounds
+        if (
+            own_bounds[2] < min_x
+            or max_x < own_bounds[0]
+            or own_bounds[3] < min_y
+            or max_y < own_bounds[1]
+        ):
+            return False
+        if self.geometry[10] == 0:
+            # axis-aligned, the corners hold the bounds of each rectangle
+            return any(
+                rectangle[0] <= max_x
+                and min_x <= rectangle[4]
+                and rectangle[1] <= max_y
+                and min_y <= rectangle[5]
+                for rectangle in (self.corners, self.secondary_corners)
+            )
+        return _rectangles_overlap(
+            corners, self.corners, _touching
+        ) or _rectangles_overlap(corners, self.secondary_corners, _touching)
+
+
+_entry_order = attrgetter("order")
+
+
+class SpatialIndex:
+    """Uniform grid of the rotated shapes of Keys, for hit-testing and range
+    queries.
+
+    Keys are placed in the grid cells covered by the bounds of their primary
+    and secondary rectangles, queries only test the Keys in the cells they
+    reach, then test the rotated rectangles exactly. The index follows changes
+    to the geometry of its Keys, edited Keys are placed again on the next
+    query. Keys added to or removed from a Keyboard are not followed, see
+    ``add`` and ``remove``.
+
+    .. code-block:: python
+
+        index = keyboard.spatial_index()
+        keys = index.at(3.5, 1.2)
+        keys = index.intersecting(0, 0, 4, 2)
+        keys = index.nearest(3.5, 1.2, count=4)
+    """
+
+    __slots__ = (
+        "__cell_size",
+        "__entries",
+        "__grid",
+        "__stale",
+        "__extent",
+        "__next_order",
+    )
+
+    def __init__(
+        self,
+        keys: Iterable[Key] = (),
+        cell_size: float = 1.0,
+        vectorized: Optional[bool] = None,
+    ):
+        """Indexes Keys.
+
+        :param keys: Keys to index, results follow their order
+        :param cell_size: width and height of the grid cells in key units
+        :param vectorized: True to require numpy, False to compute in pure
+            Python, None to use numpy when installed
+        :raises ValueError: if the cell size is not positive
+        """
+        if not cell_size > 0:
+            raise ValueError(f"cell_size must be positive, not {cell_size}")
+        self.__cell_size: float = float(cell_size)
+        self.__entries: Dict[int, _Entry] = dict()
+        self.__grid: Dict[Tuple[int, int], List[_Entry]] = dict()
+        # ids of the keys changed since the last query
+        self.__stale: Set[int] = set()
+        # cells that ever held keys, min i, min j, max i, max j
+        self.__extent: Optional[Tuple[int, int, int, int]] = None
+        self.__next_order: int = 0
+        keys = list(keys)
+        rows: List[Tuple[float, ...]] = [key._geometry for key in keys]
+        corners, secondary_corners, _, bounds = _computed_rows(rows, vectorized)
+        for i, key in enumerate(keys):
+            if id(key) in self.__entries:
+                continue
+            entry: _Entry = self.__added(key)
+            self.__place(
+                entry,
+                rows[i],
+                corners[i * 8 : i * 8 + 8],
+                secondary_corners[i * 8 : i * 8 + 8],
+                bounds[i * 4 : i * 4 + 4],
+            )
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: Key) -> bool:
+        return id(key) in self.__entries
+
+    @property
+    def cell_size(self) -> float:
+        """Width and height of the grid cells in key units."""
+        return self.__cell_size
+
+    def add(self, key: Key) -> None:
+        """Indexes a Key, after the indexed Keys.
+
+        Adding an indexed Key does nothing.
+
+        :param key: Key to index
+        """
+        if id(key) in self.__entries:
+            return
+        self.__replace(self.__added(key))
+
+    def remove(self, key: Key) -> None:
+        """Removes a Key from the index.
+
+        :param key: indexed Key
+        :raises ValueError: if the Key is not indexed
+        """
+        entry: Optional[_Entry] = self.__entries.pop(id(key), None)
+        if entry is None:
+            raise ValueError("key is not indexed")
+        self.__unplace(entry)
+        key._unobserve(self)
+
+    def close(self) -> None:
+        """Removes every Key, which are no longer followed."""
+        for entry in self.__entries.values():
+            entry.key._unobserve(self)
+        self.__entries.clear()
+        self.__grid.clear()
+        self.__stale.clear()
+        self.__extent = None
+
+    def at(self, x: float, y: float) -> List[Key]:
+        """Finds the Keys whose shape holds a point.
+
+        :param x: x of the point in key units
+        :param y: y of the point in key units
+        :return: Keys holding the point, edges included
+        """
+        self.__refresh()
+        cell_size: float = self.__cell_size
+        return [
+            entry.key
+            for entry in self.__grid.get(
+                (floor(x / cell_size), floor(y / cell_size)), ()
+            )
+            if entry.distance(x, y) == 0
+        ]
+
+    def intersecting(
+        self,
+        min_x: float,
+        min_y: float,
+        max_x: float,
+        max_y: float,
+    ) -> List[Key]:
+        """Finds the Keys whose shape intersects an axis-aligned rectangle.
+
+        :param min_x: left edge of the rectangle
+        :param min_y: top edge of the rectangle
+        :param max_x: right edge of the rectangle
+        :param max_y: bottom edge of the rectangle
+        :return: Keys intersecting the rectangle, touching edges included
+        """
+        self.__refresh()
+        if self.__extent is None or max_x < min_x or max_y < min_y:
+            return []
+        cell_size: float = self.__cell_size
+        extent_min_i, extent_min_j, extent_max_i, extent_max_j = self.__extent
+        bounds: Bounds = (min_x, min_y, max_x, max_y)
+        corners: Tuple[float, ...] = (
+            min_x,
+            min_y,
+            max_x,
+            min_y,
+            max_x,
+            max_y,
+            min_x,
+            max_y,
+        )
+        grid: Dict[Tuple[int, int], List[_Entry]] = self.__grid
+        seen: Set[int] = set()
+        found: List[_Entry] = list()
+        for i in range(
+            max(floor(min_x / cell_size), extent_min_i),
+            min(floor(max_x / cell_size), extent_max_i) + 1,
+        ):
+            for j in range(
+                max(floor(min_y / cell_size), extent_min_j),
+                min(floor(max_y / cell_size), extent_max_j) + 1,
+            ):
+                for entry in grid.get((i, j), ()):
+                    if entry.order in seen:
+                        continue
+                    seen.add(entry.order)
+                    if entry.intersects(corners, bounds):
+                        found.append(entry)
+        found.sort(key=_entry_order)
+        return [entry.key for entry in found]
+
+    def nearest(self, x: float, y: float, count: int = 1) -> List[Key]:
+        """Finds the Keys whose shape is nearest to a point.
+
+        Cells are visited in rings around the point until no unvisited Key
+        can be nearer.
+
+        :param x: x of the point in key units
+        :param y: y of the point in key units
+        :param count: number of Keys to find
+        :return: up to count Keys, nearest first, Keys holding the point are
+            at distance 0
+        """
+        self.__refresh()
+        if count <= 0 or self.__extent is None:
+            return []
+        cell_size: float = self.__cell_size
+        i: int = floor(x / cell_size)
+        j: int = floor(y / cell_size)
+        min_i, min_j, max_i, max_j = self.__extent
+        # rings before the extent hold no keys
+        ring: int = max(min_i - i, i - max_i, min_j - j, j - max_j, 0)
+        last_ring: int = max(i - min_i, max_i - i, j - min_j, max_j - j)
+        grid: Dict[Tuple[int, int], List[_Entry]] = self.__grid
+        seen: Set[int] = set()
+        found: List[Tuple[float, int, Key]] = list()
+        while ring <= last_ring:
+            for cell in self.__ring(i, j, ring):
+                for entry in grid.get(cell, ()):
+                    if entry.order in seen:
+                        continue
+                    seen.add(entry.order)
+                    found.append((entry.distance(x, y), entry.order, entry.key))
+            # unvisited keys are at least ring cells away
+            if (
+                len(found) >= count
+                and nsmallest(count, found)[-1][0] <= ring * cell_size
+            ):
+                break
+            ring += 1
+        return [key for _, _, key in nsmallest(count, found)]
+
+    def __ring(self, i: int, j: int, ring: int) -> Iterator[Tuple[int, int]]:
+        """Cells of a ring around a cell, within the extent.
+
+        :param i: column of the center cell
+        :param j: row of the center cell
+        :param ring: distance of the ring in cells, 0 for the center cell
+        :return: cells of the ring
+        """
+        min_i, min_j, max_i, max_j = self.__extent
+        if ring == 0:
+            yield (i, j)
+            return
+        left: int = i - ring
+        right: int = i + ring
+        top: int = j - ring
+        bottom: int = j + ring
+        for row in (top, bottom):
+            if min_j <= row <= max_j:
+                for column in range(max(left, min_i), min(right, max_i) + 1):
+                    yield (column, row)
+        for column in (left, right):
+            if min_i <= column <= max_i:
+                for row in range(max(top + 1, min_j), min(bottom - 1, max_j) + 1):
+                    yield (column, row)
+
+    def _key_changed(self, key: Key) -> None:
+        """Marks a Key to be placed again before the next query.
+
+        :param key: Key that changed
+        """
+        self.__stale.add(id(key))
+
+    def __refresh(self) -> None:
+        """Places the Keys whose geometry changed again."""
+        if not self.__stale:
+            return
+        for key_id in self.__stale:
+            entry: Optional[_Entry] = self.__entries.get(key_id)
+            # labels and other properties don't move keys
+            if entry is not None and entry.key._geometry != entry.geometry:
+                self.__unplace(entry)
+                self.__replace(entry)
+        self.__stale.clear()
+
+    def __added(self, key: Key) -> _Entry:
+        """Creates the entry of a Key and follows its changes.
+
+        :param key: Key to index
+        :return: unplaced entry
+        """
+        entry: _Entry = _Entry(key, self.__next_order)
+        self.__next_order += 1
+        self.__entries[id(key)] = entry
+        # snapshots never change
+        if not isinstance(key, _FrozenKey):
+            key._observe(self)
+        return entry
+
+    def __replace(self, entry: _Entry) -> None:
+        """Computes the geometry of a single Key and places it.
+
+        :param entry: unplaced entry
+        """
+        geometry: Tuple[float, ...] = entry.key._geometry
+        corners, secondary_corners, _, bounds = _computed([geometry])
+        self.__place(entry, geometry, corners, secondary_corners, bounds)
+
+    def __place(
+        self,
+        entry: _Entry,
+        geometry: Tuple[float, ...],
+        corners: array,
+        secondary_corners: array,
+        bounds: array,
+    ) -> None:
+        """Stores the geometry of a Key and places it in the grid.
+
+        :param entry: unplaced entry
+        :param geometry: geometry of the Key, see ``Key._geometry``
+        :param corners: flattened corners of the primary rectangle
+        :param secondary_corners: flattened corners of the secondary rectangle
+        :param bounds: bounds of both rectangles
+        """
+        entry.geometry = geometry
+        rotation_angle: float = geometry[10]
+        entry.rotation = (
+            (cos(radians(rotation_angle)), sin(radians(rotation_angle)))
+            if rotation_angle != 0
+            else (1.0, 0.0)
+        )
+        entry.corners = corners
+        entry.secondary_corners = secondary_corners
+        entry.bounds = bounds
+        cell_size: float = self.__cell_size
+        min_i: int = floor(bounds[0] / cell_size)
+        min_j: int = floor(bounds[1] / cell_size)
+        max_i: int = floor(bounds[2] / cell_size)
+        max_j: int = floor(bounds[3] / cell_size)
+        grid: Dict[Tuple[int, int], List[_Entry]] = self.__grid
+        cells: List[Tuple[int, int]] = [
+            (i, j) for i in range(min_i, max_i + 1) for j in range(min_j, max_j + 1)
+        ]
+        for cell in cells:
+            cell_entries: Optional[List[_Entry]] = grid.get(cell)
+            if cell_entries is None:
+                grid[cell] = [entry]
+            # kept in insertion order, results need no sorting
+            elif cell_entries[-1].order < entry.order:
+                cell_entries.append(entry)
+            else:
+                cell_entries.append(entry)
+                cell_entries.sort(key=_entry_order)
+        entry.cells = cells
+        extent: Optional[Tuple[int, int, int, int]] = self.__extent
+        self.__extent = (
+            (min_i, min_j, max_i, max_j)
+            if extent is None
+            else (
+                min(extent[0], min_i),
+                min(extent[1], min_j),
+                max(extent[2], max_i),
+                max(extent[3], max_j),
+            )
+        )
+
+    def __unplace(self, entry: _Entry) -> None:
+        """Removes a Key from the grid.
+
+        :param entry: placed entry
+        """
+        grid: Dict[Tuple[int, int], List[_Entry]] = self.__grid
+        for cell in entry.cells:
+            cell_entries: List[_Entry] = grid[cell]
+            cell_entries.remove(entry)
+            if not cell_entries:
+                del grid[cell]
+        entry.cells = list()
@@ -0,0 +1,195 @@
+from __future__ import annotations
+from typing import (
+    Any,
+    Union,
+    Iterator,
+    Dict,
+    IO,
+)
+from codecs import getincrementaldecoder
+from json import JSONDecoder, JSONDecodeError
+from .validation import _structure_error
+
+__all__ = []
+
+
+_whitespace = " \t\n\r"
+_decoder = JSONDecoder()
+
+
+class _JSONTokenizer:
+    """Incrementally reads the values of a KLE JSON from a file-like object.
+
+    Only the unconsumed tail of the document is buffered, values are decoded
+    one at a time as they are requested.
+    """
+
+    def __init__(self, fp: IO, chunk_size: int):
+        """Initializes a _JSONTokenizer.
+
+        :param fp: text or binary file-like object to read from
+        :param chunk_size: number of characters or bytes read at a time
+        """
+        self.__fp: IO = fp
+        self.__chunk_size: int = chunk_size
+        self.__decode = getincrementaldecoder("utf-8-sig")().decode
+        self.__buffer: str = ""
+        self.__pos: int = 0
+        self.__is_eof: bool = False
+
+    def __read(self) -> bool:
+        """Appends the next chunk to the buffer.
+
+        :return: whether any data was read
+        """
+        if self.__is_eof:
+            return False
+        chunk: Union[str, bytes] = self.__fp.read(self.__chunk_size)
+        if type(chunk) is bytes:
+            chunk = self.__decode(chunk, final=len(chunk) == 0)
+        if len(chunk) == 0:
+            self.__is_eof = True
+            return False
+        # drop consumed text to keep the buffer bounded
+        self.__buffer = self.__buffer[self.__pos :] + chunk
+        self.__pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character.
+
+        :return: next character, empty if the document ended
+        """
+        while True:
+            buffer = self.__buffer
+            pos = self.__pos
+            length = len(buffer)
+            while pos < length and buffer[pos] in _whitespace:
+                pos += 1
+            self.__pos = pos
+            if pos < length:
+                return buffer[pos]
+            if not self.__read():
+                return ""
+
+    def expect(self, character: str) -> None:
+        """Consumes the next character, which must match.
+
+        :param character: expected character
+        """
+        found = self.peek()
+        if found != character:
+            raise JSONDecodeError(
+                f"Expecting {character!r}",
+                self.__buffer,
+                self.__pos,
+            )
+        self.__pos += 1
+
+    def value(self) -> Any:
+        """Decodes the next complete JSON value.
+
+        :return: decoded value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.__buffer, self.__pos)
+            except JSONDecodeError:
+                # value may continue in the next chunk
+                if self.__read():
+                    continue
+                raise
+            # numbers and literals may continue in the next chunk
+            if end == len(self.__buffer) and self.__read():
+                continue
+            self.__pos = end
+            return value
+
+    def end(self) -> None:
+        """Ensures nothing but whitespace follows the document."""
+        if self.peek() != "":
+            raise JSONDecodeError("Extra data", self.__buffer, self.__pos)
+
+    def separator(self, closing: str) -> bool:
+        """Consumes the separator after an array item.
+
+        :param closing: closing character of the array
+        :return: whether the array continues
+        """
+        if self.peek() == ",":
+            self.__pos += 1
+            return True
+        self.expect(closing)
+        return False
+
+
+def _iter_row_items(
+    tokenizer: _JSONTokenizer,
+    validate: str,
+) -> Iterator[Union[str, Dict]]:
+    """Incrementally decodes the labels and key changes of a row.
+
+    :param tokenizer: tokenizer positioned after the opening bracket of the row
+    :param validate: validation mode
+    :return: row items
+    """
+    if tokenizer.peek() == "]":
+        tokenizer.expect("]")
+        return
+    while True:
+        item: Any = tokenizer.value()
+        if validate != "off" and type(item) is not str and type(item) is not dict:
+            raise _structure_error(f"{item!r} is not of type 'string', 'object'", [])
+        yield item
+        if not tokenizer.separator("]"):
+            return
+
+
+def _iter_json_rows(
+    fp: IO,
+    validate: str,
+    chunk_size: int = 1 << 16,
+) -> Iterator[Union[Dict, Iterator[Union[str, Dict]]]]:
+    """Incrementally decodes a KLE JSON from a file-like object.
+
+    Rows are yielded as iterators over their items and must be consumed before
+    the next row is requested. Metadata is yielded as a dict.
+
+    :param fp: text or binary file-like object to read from
+    :param validate: validation mode, ``"fast"`` or ``"off"``
+    :param chunk_size: number of characters or bytes read at a time
+    :return: metadata and rows
+    """
+    if validate not in ("fast", "off"):
+        raise ValueError(
+            f"Invalid validate mode {validate!r} for streaming, "
+            "expected one of ('fast', 'off')."
+        )
+    tokenizer = _JSONTokenizer(fp, chunk_size)
+    tokenizer.expect("[")
+    if tokenizer.peek() == "]":
+        tokenizer.expect("]")
+        tokenizer.end()
+        return
+    is_first = True
+    while True:
+        character = tokenizer.peek()
+        if character == "[":
+            tokenizer.expect("[")
+            row = _iter_row_items(tokenizer, validate)
+            yield row
+            # skip whatever the consumer left unread
+            for _ in row:
+                pass
+        elif character == "{" and (is_first or validate == "off"):
+            yield tokenizer.value()
+        elif validate != "off":
+            value = tokenizer.value()
+            raise _structure_error(f"{value!r} is not of type 'array'", [])
+        else:
+            tokenizer.value()
+        is_first = False
+        if not tokenizer.separator("]"):
+            break
+    tokenizer.end()
@@ -0,0 +1,310 @@
+from __future__ import annotations
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Union,
+    Optional,
+    Callable,
+    Tuple,
+    List,
+    IO,
+)
+from functools import lru_cache
+from html import escape, unescape
+from re import compile as compile_pattern
+from .key import Key
+from .geometry import _computed_rows
+from .writer import _is_binary
+
+if TYPE_CHECKING:
+    from .keyboard import Keyboard
+
+__all__ = ["render_svg"]
+
+
+# keycap proportions of keyboard-layout-editor, in key units
+_spacing = 1 / 108
+"""
+Gap left on each side of a keycap, so that adjacent keycaps don't merge.
+"""
+_bevel = 6 / 54
+"""
+Distance between the sides of a keycap and its top.
+"""
+_bevel_top = 3 / 54
+"""
+Distance between the back of a keycap and its top.
+"""
+_bevel_bottom = 9 / 54
+"""
+Distance between the front of a keycap and its top, holding the front labels.
+"""
+_padding = 3 / 54
+"""
+Distance between the edges of the keycap top and its labels.
+"""
+_outer_radius = 5 / 54
+_inner_radius = 3 / 54
+_line_height = 1.1
+"""
+Distance between the lines of a label, relative to its font size.
+"""
+_anchors = ("start", "middle", "end")
+"""
+Text anchors of the label columns, left to right.
+"""
+
+_tag_pattern = compile_pattern(r"<[^>]*>")
+_break_pattern = compile_pattern(r"(?i)<br\s*/?>")
+_hex_pattern = compile_pattern(r"#([0-9a-fA-F]{3}|[0-9a-fA-F]{6})")
+_invalid_pattern = compile_pattern(
+    "[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]"
+)
+"""
+Characters XML can't hold, control characters and lone surrogates.
+"""
+
+_style = (
+    "<style>"
+    ".border,.top{stroke:#000;stroke-opacity:0.2}"
+    ".homing{fill:#000;fill-opacity:0.3}"
+    "</style>\n"
+)
+"""
+Styles shared by the elements of every Key.
+"""
+
+
+def _escaped(text: str) -> str:
+    """Escapes text for SVG, dropping the characters XML can't hold.
+
+    :param text: text of an attribute or element
+    :return: escaped text
+    """
+    return escape(_invalid_pattern.sub("", text))
+
+
+def _number(value: float) -> str:
+    """Formats a coordinate, without the rounding noise of float arithmetic.
+
+    :param value: coordinate in pixels
+    :return: shortest text of the value to 7 significant digits
+    """
+    return f"{value:.7g}"
+
+
+@lru_cache(maxsize=256)
+def _border_color(color: str) -> str:
+    """Darkens a keycap color for the sides of the keycap.
+
+    Only hexadecimal colors are darkened, other CSS colors are kept.
+
+    :param color: CSS keycap color
+    :return: escaped CSS color of the sides
+    """
+    match = _hex_pattern.fullmatch(color)
+    if match is None:
+        return _escaped(color)
+    digits: str = match.group(1)
+    if len(digits) == 3:
+        digits = "".join(digit * 2 for digit in digits)
+    return "#" + "".join(
+        f"{int(int(digits[i : i + 2], 16) * 0.8):02x}" for i in range(0, 6, 2)
+    )
+
+
+def _label_lines(text: str) -> List[str]:
+    """Lines of a label, as plain text escaped for SVG.
+
+    Labels may hold HTML, line breaks split the lines and other tags are
+    dropped, as are characters XML can't hold.
+
+    :param text: text content of the label
+    :return: escaped text of each non empty line
+    """
+    lines: List[str] = list()
+    for line in _break_pattern.split(text):
+        if "<" in line:
+            line = _tag_pattern.sub("", line)
+        if "&" in line:
+            line = unescape(line)
+        line = _escaped(line)
+        if line:
+            lines.append(line)
+    return lines
+
+
+def _key_svg(key: Key, row: Tuple[float, ...], unit: float) -> str:
+    """Renders a Key as an SVG group.
+
+    The shapes are drawn unrotated in key units scaled by ``unit``, the group
+    is rotated about the rotation origin of the Key.
+
+    :param key: Key to render
+    :param row: geometry of the Key, see ``Key._geometry``
+    :param unit: size of a key unit in pixels
+    :return: SVG text of the group
+    """
+    x, y, width, height, x2, y2, width2, height2 = row[:8]
+    rotation_x, rotation_y, rotation_angle = row[8:11]
+    rectangles: List[Tuple[float, float, float, float]] = [(x, y, width, height)]
+    if not (x2 == 0 and y2 == 0 and width2 == width and height2 == height):
+        rectangles.append((x + x2, y + y2, width2, height2))
+    parts: List[str] = ['<g class="key']
+    if key.is_ghosted:
+        parts.append(' ghosted" opacity="0.3')
+    parts.append('"')
+    if rotation_angle != 0:
+        parts.append(
+            f' transform="rotate({_number(rotation_angle)} '
+            f'{_number(rotation_x * unit)} {_number(rotation_y * unit)})"'
+        )
+    parts.append(">")
+    if not key.is_decal:
+        color: str = _escaped(key.color)
+        border: str = _border_color(key.color)
+        borders: List[str] = [
+            f'x="{_number((left + _spacing) * unit)}" '
+            f'y="{_number((top + _spacing) * unit)}" '
+            f'width="{_number((shape_width - 2 * _spacing) * unit)}" '
+            f'height="{_number((shape_height - 2 * _spacing) * unit)}" '
+            f'rx="{_number(_outer_radius * unit)}" fill="{border}"/>'
+            for left, top, shape_width, shape_height in rectangles
+        ]
+        tops: List[str] = [
+            f'x="{_number((left + _bevel) * unit)}" '
+            f'y="{_number((top + _bevel_top) * unit)}" '
+            f'width="{_number((shape_width - 2 * _bevel) * unit)}" '
+            f'height="{_number((shape_height - _bevel_top - _bevel_bottom) * unit)}" '
+            f'rx="{_number(_inner_radius * unit)}" fill="{color}"/>'
+            for left, top, shape_width, shape_height in rectangles
+        ]
+        # outlines of both shapes first, then their fills again without
+        # outlines, so that the shapes merge
+        for rectangle in borders:
+            parts.append(f'<rect class="border" {rectangle}')
+        if len(rectangles) > 1:
+            for rectangle in borders:
+                parts.append(f'<rect class="fill" {rectangle}')
+        for rectangle in tops:
+            parts.append(f'<rect class="top" {rectangle}')
+        if len(rectangles) > 1:
+            for rectangle in tops:
+                parts.append(f'<rect class="fill" {rectangle}')
+        if key.is_homing:
+            parts.append(
+                f'<rect class="homing" x="{_number((x + width / 2 - 0.1) * unit)}" '
+                f'y="{_number((y + height - _bevel_bottom - 0.15) * unit)}" '
+                f'width="{_number(0.2 * unit)}" height="{_number(0.04 * unit)}" '
+                f'rx="{_number(0.02 * unit)}"/>'
+            )
+    # labels are laid out on the top of the primary shape, decals have none
+    if key.is_decal:
+        top_left: float = x
+        top_top: float = y
+        top_right: float = x + width
+        top_bottom: float = y + height
+    else:
+        top_left = x + _bevel
+        top_top = y + _bevel_top
+        top_right = x + width - _bevel
+        top_bottom = y + height - _bevel_bottom
+    for i, label in key.labels.items():
+        lines: List[str] = _label_lines(label.text)
+        if not lines:
+            continue
+        column: int = i % 3
+        font_size: float = (6 + 2 * label.size) / 54 * unit
+        if i >= 9:
+            # front labels fit between the keycap top and its front
+            font_size = min(font_size, _bevel_bottom * unit)
+        line_height: float = font_size * _line_height
+        if column == 0:
+            text_x: float = (top_left + _padding) * unit
+        elif column == 1:
+            text_x = (top_left + top_right) / 2 * unit
+        else:
+            text_x = (top_right - _padding) * unit
+        # baselines of the first line, with ascents and descents estimated
+        # from the font size
+        if i < 3:
+            text_y: float = (top_top + _padding) * unit + font_size * 0.8
+        elif i < 6:
+            text_y = (top_top + top_bottom) / 2 * unit + font_size * 0.35
+            text_y -= (len(lines) - 1) * line_height / 2
+        elif i < 9:
+            text_y = (top_bottom - _padding) * unit - font_size * 0.2
+            text_y -= (len(lines) - 1) * line_height
+        else:
+            text_y = (y + height - _spacing) * unit - font_size * 0.2
+            text_y -= (len(lines) - 1) * line_height
+        parts.append(
+            f'<text class="label label-{i}" x="{_number(text_x)}" '
+            f'y="{_number(text_y)}" font-size="{_number(font_size)}" '
+            f'fill="{_escaped(label.color)}" text-anchor="{_anchors[column]}">'
+        )
+        parts.append(lines[0])
+        for line in lines[1:]:
+            parts.append(
+                f'<tspan x="{_number(text_x)}" dy="{_number(line_height)}">'
+                f"{line}</tspan>"
+            )
+        parts.append("</text>")
+    parts.append("</g>\n")
+    return "".join(parts)
+
+
+def render_svg(
+    keyboard: Keyboard,
+    fp: IO,
+    unit: float = 54.0,
+    binary: Optional[bool] = None,
+) -> None:
+    """Renders a Keyboard as SVG into a file-like object.
+
+    Keycaps are drawn with their secondary shapes, rotations and colors,
+    ghosted Keys are translucent, homing Keys have a nub and decals only
+    their labels. The 12 labels of each Key are drawn in their positions,
+    sizes and colors, as plain text. The document is sized to the rotated
+    bounds of the Keys and each Key is written as soon as it is rendered.
+
+    .. code-block:: python
+
+        with open("keyboard.svg", "w") as fp:
+            render_svg(keyboard, fp)
+
+    :param keyboard: Keyboard to render
+    :param fp: text or binary file-like object to write to
+    :param unit: size of a key unit in pixels
+    :param binary: whether to write bytes, detected from ``fp`` by default
+    """
+    write: Callable[[Union[str, bytes]], Any] = fp.write
+    if binary is None:
+        binary = _is_binary(fp)
+    keys: List[Key] = keyboard.keys
+    rows: List[Tuple[float, ...]] = [key._geometry for key in keys]
+    _, _, _, bounds = _computed_rows(rows, False)
+    if bounds:
+        min_x: float = min(bounds[0::4])
+        min_y: float = min(bounds[1::4])
+        width: float = max(bounds[2::4]) - min_x
+        height: float = max(bounds[3::4]) - min_y
+    else:
+        min_x = min_y = width = height = 0.0
+    header: str = (
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        f'width="{_number(width * unit)}" height="{_number(height * unit)}" '
+        f'viewBox="{_number(min_x * unit)} {_number(min_y * unit)} '
+        f'{_number(width * unit)} {_number(height * unit)}">\n'
+        f'<rect class="background" x="{_number(min_x * unit)}" '
+        f'y="{_number(min_y * unit)}" width="100%" height="100%" '
+        f'fill="{_escaped(keyboard.metadata.background_color)}"/>\n'
+        f"{_style}"
+        '<g font-family="Helvetica, Arial, sans-serif">\n'
+    )
+    write(header.encode("utf-8") if binary else header)
+    for key, row in zip(keys, rows):
+        text: str = _key_svg(key, row, unit)
+        write(text.encode("utf-8") if binary else text)
+    footer: str = "</g>\n</svg>\n"
+    write(footer.encode("utf-8") if binary else footer)
@@ -1,38 +1,187 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Tuple, Dict, NamedTuple
+from .utils import _interned, _fingerprint, _frozen_class
+
+if TYPE_CHECKING:
+    from .key import Key
+
 __all__ = ["Switch"]
 
 
+class _SwitchRecord(NamedTuple):
+    """Immutable switch information shared between Switches."""
+
+    mount: str
+    brand: str
+    type: str
+
+
+_switch_records: Dict[Tuple, _SwitchRecord] = dict()
+
+
+def _switch_record(mount: str, brand: str, type: str) -> _SwitchRecord:
+    """Returns the shared switch record for switch information.
+
+    :param mount: switch mount
+    :param brand: switch brand
+    :param type: switch type part id
+    :return: shared switch record
+    """
+    return _interned(_switch_records, _SwitchRecord(mount, brand, type))
+
+
 class Switch:
     """Switch information."""
 
+    __slots__ = (
+        "__record",
+        "__observers",
+    )
+
     def __init__(self) -> None:
         """Initializes a Switch."""
-        self.__mount: str = ""
-        self.__brand: str = ""
-        self.__type: str = ""
+        # values are shared, setters replace the record
+        self.__record: _SwitchRecord = _switch_record("", "", "")
+        # keys notified of changes, see _observe
+        self.__observers: Tuple[Key, ...] = ()
+
+    def __deepcopy__(self, memo: Dict) -> Switch:
+        """Copies the Switch field by field.
+
+        Switches only hold immutable values, bypassing the generic copy machinery.
+        """
+        switch = self.__class__.__new__(self.__class__)
+        switch.__record = self.__record
+        switch.__observers = ()
+        return switch
+
+    def _frozen(self) -> Switch:
+        """Immutable copy of the Switch, see ``Keyboard.freeze``.
+
+        :return: frozen Switch
+        """
+        switch = _FrozenSwitch.__new__(_FrozenSwitch)
+        switch.__setstate__(self.__getstate__())
+        return switch
+
+    def _thawed(self) -> Switch:
+        """Mutable copy of the Switch, see ``Keyboard.thaw``.
+
+        :return: Switch instance
+        """
+        switch = Switch.__new__(Switch)
+        switch.__setstate__(self.__getstate__())
+        return switch
+
+    @classmethod
+    def _of(cls, key: Key, record: _SwitchRecord) -> Switch:
+        """Creates a Switch held by a Key.
+
+        :param key: Key holding the Switch
+        :param record: shared switch information
+        :return: Switch instance
+        """
+        switch = cls.__new__(cls)
+        switch.__record = record
+        switch.__observers = (key,)
+        return switch
+
+    def __getstate__(self) -> Tuple[_SwitchRecord]:
+        """Compact pickled state.
+
+        Records are pickled once per pickle and stay shared when unpickled.
+        """
+        return (self.__record,)
+
+    def __setstate__(self, state: Tuple[_SwitchRecord]) -> None:
+        (self.__record,) = state
+        self.__observers = ()
+
+    def equals(self, other: Any) -> bool:
+        """Compares the mount, brand and type with another Switch.
+
+        :param other: object to compare
+        :return: whether other is a Switch with the same mount, brand and type
+        """
+        return isinstance(other, Switch) and self.__record == other.__record
+
+    def fingerprint(self) -> int:
+        """Stable 128-bit hash of the mount, brand and type.
+
+        :return: fingerprint
+        """
+        return _fingerprint((), tuple(self.__record))
+
+    def _observe(self, key: Key) -> None:
+        """Notifies a Key of changes to the Switch.
+
+        :param key: Key holding the Switch
+        """
+        for other in self.__observers:
+            if other is key:
+                return
+        self.__observers += (key,)
+
+    def _unobserve(self, key: Key) -> None:
+        """Stops notifying a Key of changes.
+
+        :param key: Key passed to ``_observe``
+        """
+        self.__observers = tuple(
+            other for other in self.__observers if other is not key
+        )
+
+    def _changed(self) -> None:
+        """Notifies the Keys holding the Switch that it changed."""
+        for key in self.__observers:
+            key._changed()
+
+    @property
+    def _record(self) -> _SwitchRecord:
+        """Shared switch information."""
+        return self.__record
+
+    @_record.setter
+    def _record(self, record: _SwitchRecord) -> None:
+        self.__record = record
+        if self.__observers:
+            self._changed()
 
     @property
     def mount(self) -> str:
         """Switch mount."""
-        return self.__mount
+        return self.__record.mount
 
     @mount.setter
     def mount(self, mount: str) -> None:
-        self.__mount = mount
+        record = self.__record
+        self.__record = _switch_record(mount, record.brand, record.type)
+        if self.__observers:
+            self._changed()
 
     @property
     def brand(self) -> str:
         """Switch brand."""
-        return self.__brand
+        return self.__record.brand
 
     @brand.setter
     def brand(self, brand: str) -> None:
-        self.__brand = brand
+        record = self.__record
+        self.__record = _switch_record(record.mount, brand, record.type)
+        if self.__observers:
+            self._changed()
 
     @property
     def type(self) -> str:
         """Switch type part id."""
-        return self.__type
+        return self.__record.type
 
     @type.setter
     def type(self, type: str) -> None:
-        self.__type = type
+        record = self.__record
+        self.__record = _switch_record(record.mount, record.brand, type)
+        if self.__observers:
+            self._changed()
+
+
+_FrozenSwitch = _frozen_class(Switch)
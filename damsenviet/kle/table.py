@@ -0,0 +1,265 @@
+from __future__ import annotations
+from typing import (
+    Any,
+    Union,
+    Optional,
+    List,
+    Dict,
+    Iterable,
+)
+from array import array
+from copy import deepcopy
+from .label import Label
+from .key import Key
+from .metadata import Metadata
+from .keyboard import _deserialized_keys
+from .validation import _validate
+
+__all__ = ["KeyTable"]
+
+
+_number_columns = [
+    "x",
+    "y",
+    "width",
+    "height",
+    "x2",
+    "y2",
+    "width2",
+    "height2",
+    "rotation_x",
+    "rotation_y",
+    "rotation_angle",
+    "default_text_size",
+]
+"""
+Key properties stored as double precision columns.
+"""
+
+_flag_columns = [
+    "is_ghosted",
+    "is_stepped",
+    "is_homing",
+    "is_decal",
+]
+"""
+Key properties stored as unsigned char columns.
+"""
+
+_string_columns = [
+    "color",
+    "default_text_color",
+    "profile_and_row",
+    "switch_mount",
+    "switch_brand",
+    "switch_type",
+]
+"""
+Key properties stored as lists of strings.
+"""
+
+
+def _restored_number(value: float) -> Union[int, float]:
+    """Restores integral text sizes to ints, as found in KLE JSON.
+
+    :param value: value read from a double column
+    :return: int if the value is integral, the value otherwise
+    """
+    return int(value) if value.is_integer() else value
+
+
+class KeyTable:
+    """Columnar struct-of-arrays representation of Keys.
+
+    Numeric properties and flags are held in contiguous ``array.array``
+    columns, one item per key, that can be viewed as NumPy arrays without
+    copying. Labels that differ from their key's defaults are held in a side
+    table of label columns referencing keys by index.
+    """
+
+    def __init__(self):
+        """Initializes an empty KeyTable."""
+        self.__metadata: Metadata = Metadata()
+        self.__columns: Dict[str, Union[array, List[str]]] = dict()
+        for name in _number_columns:
+            self.__columns[name] = array("d")
+        for name in _flag_columns:
+            self.__columns[name] = array("B")
+        for name in _string_columns:
+            self.__columns[name] = list()
+        self.__label_columns: Dict[str, Union[array, List[str]]] = {
+            "key_index": array("L"),
+            "position": array("B"),
+            "size": array("d"),
+            "text": list(),
+            "color": list(),
+        }
+
+    def __len__(self) -> int:
+        """Number of keys in the table."""
+        return len(self.__columns["x"])
+
+    @property
+    def metadata(self) -> Metadata:
+        """Metadata Information."""
+        return self.__metadata
+
+    @metadata.setter
+    def metadata(self, metadata: Metadata) -> None:
+        self.__metadata = metadata
+
+    @property
+    def columns(self) -> Dict[str, Union[array, List[str]]]:
+        """Key columns by property name.
+
+        Switch properties are flattened into ``switch_mount``,
+        ``switch_brand`` and ``switch_type``.
+        """
+        return self.__columns
+
+    @property
+    def label_columns(self) -> Dict[str, Union[array, List[str]]]:
+        """Label side table columns by name.
+
+        ``key_index`` and ``position`` locate the label in its key, labels
+        absent from the side table have empty text and the key's default text
+        color and size.
+        """
+        return self.__label_columns
+
+    def append(self, key: Key) -> None:
+        """Appends a Key as a new row of the table.
+
+        :param key: Key to append
+        """
+        columns = self.__columns
+        for name in _number_columns:
+            columns[name].append(getattr(key, name))
+        for name in _flag_columns:
+            columns[name].append(getattr(key, name))
+        columns["color"].append(key.color)
+        columns["default_text_color"].append(key.default_text_color)
+        columns["profile_and_row"].append(key.profile_and_row)
+        columns["switch_mount"].append(key.switch.mount)
+        columns["switch_brand"].append(key.switch.brand)
+        columns["switch_type"].append(key.switch.type)
+
+        key_index = len(columns["x"]) - 1
+        label_columns = self.__label_columns
+        for position, label in key.labels.items():
+            if (
+                label.text == ""
+                and label.color == key.default_text_color
+                and label.size == key.default_text_size
+            ):
+                continue
+            label_columns["key_index"].append(key_index)
+            label_columns["position"].append(position)
+            label_columns["size"].append(label.size)
+            label_columns["text"].append(label.text)
+            label_columns["color"].append(label.color)
+
+    def extend(self, keys: Iterable[Key]) -> None:
+        """Appends Keys as new rows of the table.
+
+        :param keys: Keys to append
+        """
+        for key in keys:
+            self.append(key)
+
+    def to_keys(self) -> List[Key]:
+        """Materializes the rows of the table into Keys.
+
+        :return: list of Keys
+        """
+        columns = self.__columns
+        keys: List[Key] = list()
+        for i in range(len(self)):
+            key = Key()
+            for name in _number_columns:
+                setattr(key, name, columns[name][i])
+            key.default_text_size = _restored_number(key.default_text_size)
+            for name in _flag_columns:
+                setattr(key, name, bool(columns[name][i]))
+            key.color = columns["color"][i]
+            key.default_text_color = columns["default_text_color"][i]
+            key.profile_and_row = columns["profile_and_row"][i]
+            key.switch.mount = columns["switch_mount"][i]
+            key.switch.brand = columns["switch_brand"][i]
+            key.switch.type = columns["switch_type"][i]
+            keys.append(key)
+
+        label_columns = self.__label_columns
+        # labels absent from the side table keep the key's defaults
+        for j in range(len(label_columns["key_index"])):
+            label: Label = keys[label_columns["key_index"][j]].labels._populated(
+                label_columns["position"][j]
+            )
+            label.text = label_columns["text"][j]
+            label.color = label_columns["color"][j]
+            label.size = _restored_number(label_columns["size"][j])
+        return keys
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """Views the numeric and flag columns as NumPy arrays without copying.
+
+        The arrays share memory with the table, writing to them edits the
+        rows. Rows can't be appended while any of the arrays is alive, the
+        table raises ``BufferError`` instead of moving their memory, copy the
+        arrays to keep them across appends.
+
+        :return: NumPy arrays by column name
+        """
+        try:
+            import numpy
+        except ImportError as error:
+            raise ImportError(
+                "KeyTable.to_numpy requires numpy, "
+                "install it with: pip3 install damsenviet.kle[numpy]"
+            ) from error
+
+        arrays: Dict[str, Any] = dict()
+        for name in _number_columns:
+            arrays[name] = numpy.frombuffer(self.__columns[name], dtype=numpy.float64)
+        for name in _flag_columns:
+            arrays[name] = numpy.frombuffer(
+                self.__columns[name], dtype=numpy.uint8
+            ).view(numpy.bool_)
+        return arrays
+
+    @classmethod
+    def from_keys(
+        cls,
+        keys: Iterable[Key],
+        metadata: Optional[Metadata] = None,
+    ) -> KeyTable:
+        """Builds a KeyTable from Keys.
+
+        :param keys: Keys to store, may be a streaming iterator
+        :param metadata: Metadata to copy into the table
+        :return: KeyTable instance
+        """
+        table: KeyTable = cls()
+        if metadata is not None:
+            table.metadata = deepcopy(metadata)
+        table.extend(keys)
+        return table
+
+    @classmethod
+    def from_json(
+        cls,
+        keyboard_json: List[Union[Dict, List[Union[str, Dict]]]],
+        validate: str = "full",
+    ) -> KeyTable:
+        """Deserializes a KLE JSON directly into a KeyTable.
+
+        Keys are stored as they are played back, no Keyboard is built.
+
+        :param keyboard_json: KLE JSON to parse
+        :param validate: validation mode, one of ``"full"``, ``"fast"``, ``"off"``
+        :return: KeyTable instance
+        """
+        _validate(keyboard_json, validate)
+        table: KeyTable = cls()
+        table.extend(_deserialized_keys(keyboard_json, table.metadata))
+        return table
@@ -1,7 +1,15 @@
-from typing import TypeVar
+from typing import TypeVar, Any, Union, Tuple, Dict, Iterable, Type
+from struct import pack
 
 __all__ = ["json_dump_options"]
 
+T = TypeVar("T", bound=Tuple)
+
+_intern_limit = 1 << 16
+"""
+Maximum number of records held by an intern table before it is reset.
+"""
+
 
 json_dump_options = {
     "skipkeys": False,
@@ -21,3 +29,117 @@ Kwargs to be spread into ``json.dump`` or ``json.dumps`` to match KLE JSON forma
 
     json.dumps(keyboard.to_json(), **json_dump_options)
 """
+
+
+def _interned(table: Dict[Tuple, T], record: T) -> T:
+    """Returns the shared instance of an immutable record.
+
+    Values are matched by type as well, so ``3`` and ``3.0`` are not shared.
+    Tables are reset when full, records handed out before remain valid.
+
+    :param table: intern table of the record type
+    :param record: record to share
+    :return: shared record equal to ``record``
+    """
+    key = (record, tuple(map(type, record)))
+    shared = table.get(key)
+    if shared is None:
+        if len(table) >= _intern_limit:
+            table.clear()
+        table[key] = shared = record
+    return shared
+
+
+_negative_zero = pack("<d", -0.0)
+
+
+def _fingerprint(numbers: Tuple[Union[int, float], ...], values: Tuple) -> int:
+    """Stable 128-bit hash of numbers and of other immutable values.
+
+    Numbers are hashed as doubles, so that ints and floats comparing equal
+    hash alike. Values are hashed by their representation, they are expected
+    to be nested tuples of str, int, bool or None.
+
+    :param numbers: numbers to hash
+    :param values: other values to hash
+    :return: fingerprint
+    """
+    from hashlib import blake2b
+
+    data: bytes = pack(f"<{len(numbers)}d", *numbers)
+    if _negative_zero in data:
+        # -0.0 compares equal to 0.0
+        data = pack(f"<{len(numbers)}d", *[number + 0.0 for number in numbers])
+    h = blake2b(data, digest_size=16)
+    h.update(repr(values).encode("utf-8", "surrogatepass"))
+    return int.from_bytes(h.digest(), "big")
+
+
+def _combined_fingerprint(fingerprints: Iterable[int]) -> int:
+    """Stable 128-bit hash of a sequence of fingerprints.
+
+    :param fingerprints: fingerprints in order
+    :return: fingerprint
+    """
+    from hashlib import blake2b
+
+    h = blake2b(digest_size=16)
+    for fingerprint in fingerprints:
+        h.update(fingerprint.to_bytes(16, "big"))
+    return int.from_bytes(h.digest(), "big")
+
+
+def _frozen_class(cls: Type, methods: Iterable[str] = ()) -> Type:
+    """Creates the read-only subclass of a model class.
+
+    Property setters and the listed mutating methods raise. Instances are
+    frozen by creating them as the subclass, which holds the same slots.
+
+    Mutable instances compare and hash by identity, hashing them by content
+    would lose them in sets and dicts once edited. Frozen instances of classes
+    with a fingerprint compare with ``equals`` to other frozen instances and
+    hash by fingerprint instead.
+
+    :param cls: model class, with ``_frozen`` and ``_thawed`` methods
+    :param methods: mutating methods
+    :return: frozen subclass
+    """
+    message: str = f"{cls.__name__} is frozen, thaw the Keyboard for a mutable copy."
+
+    def frozen_setter(self: Any, value: Any) -> None:
+        raise AttributeError(message)
+
+    def frozen_method(self: Any, *args: Any, **kwargs: Any) -> None:
+        raise TypeError(message)
+
+    namespace: Dict[str, Any] = {
+        "__slots__": (),
+        "__module__": cls.__module__,
+        "__doc__": f"Frozen {cls.__name__}, see ``Keyboard.freeze``.",
+        # immutable, shared instead of copied
+        "__copy__": lambda self: self,
+        "__deepcopy__": lambda self, memo: self,
+        "_frozen": lambda self: self,
+    }
+    if hasattr(cls, "fingerprint"):
+        namespace["__eq__"] = lambda self, other: (
+            self.equals(other) if isinstance(other, type(self)) else NotImplemented
+        )
+        namespace["__hash__"] = lambda self: hash(self.fingerprint())
+    if hasattr(cls, "_thawed"):
+        namespace["__reduce__"] = lambda self: (_refrozen, (self._thawed(),))
+    for name, value in vars(cls).items():
+        if isinstance(value, property) and value.fset is not None:
+            namespace[name] = property(value.fget, frozen_setter, doc=value.__doc__)
+    for name in methods:
+        namespace[name] = frozen_method
+    return type(f"_Frozen{cls.__name__}", (cls,), namespace)
+
+
+def _refrozen(value: Any) -> Any:
+    """Freezes a thawed copy again, unpickling frozen instances.
+
+    :param value: mutable instance
+    :return: frozen instance
+    """
+    return value._frozen()
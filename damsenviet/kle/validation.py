@@ -0,0 +1,514 @@
+from __future__ import annotations
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    List,
+    Dict,
+)
+from functools import lru_cache
+from os.path import join, dirname
+from json import load
+from numbers import Number
+from re import compile as compile_regex
+from urllib.parse import urljoin, urldefrag, unquote
+from .playback import _label_map
+
+__all__ = []
+
+
+_validation_modes = ("full", "fast", "off")
+"""
+Accepted ``validate`` modes of ``Keyboard.from_json``.
+"""
+
+_schema_filenames = [
+    "Background.schema.json",
+    "Cluster.schema.json",
+    "Keyboard.schema.json",
+    "KeyChanges.schema.json",
+    "KeyLabels.schema.json",
+    "Metadata.schema.json",
+]
+
+
+def _load_schema(schema_path):
+    with open(schema_path) as schema_file:
+        return load(schema_file)
+
+
+@lru_cache(maxsize=None)
+def _get_schemas() -> Dict[str, Dict]:
+    """Loads the kle-json schemas on first use.
+
+    :return: schemas keyed by file name
+    """
+    return {
+        filename: _load_schema(join(dirname(__file__), "kle-json", "v1", filename))
+        for filename in _schema_filenames
+    }
+
+
+@lru_cache(maxsize=None)
+def _get_validator() -> Any:
+    """Builds the validator instance for keyboard schemas on first use.
+
+    Importing jsonschema and resolving the schemas is deferred until a full
+    validation is requested.
+
+    :return: validator instance for keyboard schemas
+    """
+    from jsonschema import RefResolver
+    from jsonschema.validators import validator_for
+
+    schemas: Dict[str, Dict] = _get_schemas()
+    keyboard_schema: Dict = schemas["Keyboard.schema.json"]
+    schema_store = {schema["$id"]: schema for schema in schemas.values()}
+    resolver = RefResolver.from_schema(keyboard_schema, store=schema_store)
+    validator_cls = validator_for(keyboard_schema)
+    return validator_cls(keyboard_schema, resolver=resolver)
+
+
+_Check = Callable[[Any], bool]
+"""
+Compiled schema check, returns whether an instance is valid.
+"""
+
+
+class _UnsupportedSchema(Exception):
+    """Raised when a schema uses a keyword the compiler does not specialize."""
+
+
+# keywords without any effect on validation results
+_annotation_keywords = {
+    "$schema",
+    "$id",
+    "$comment",
+    "title",
+    "description",
+    "default",
+    "examples",
+    "definitions",
+    "format",
+}
+
+
+def _accept(instance: Any) -> bool:
+    return True
+
+
+def _reject(instance: Any) -> bool:
+    return False
+
+
+def _unbool(instance: Any) -> Any:
+    """Keeps booleans from comparing equal to 0 and 1, as jsonschema does."""
+    if instance is True or instance is False:
+        return (bool, instance)
+    return instance
+
+
+def _is_integer(instance: Any) -> bool:
+    return isinstance(instance, int) and not isinstance(instance, bool)
+
+
+def _is_integer_or_integral_float(instance: Any) -> bool:
+    return _is_integer(instance) or (
+        isinstance(instance, float) and instance.is_integer()
+    )
+
+
+def _is_number(instance: Any) -> bool:
+    return isinstance(instance, Number) and not isinstance(instance, bool)
+
+
+_type_checks: Dict[str, _Check] = {
+    "array": lambda instance: isinstance(instance, list),
+    "boolean": lambda instance: isinstance(instance, bool),
+    "integer": _is_integer,
+    "null": lambda instance: instance is None,
+    "number": _is_number,
+    "object": lambda instance: isinstance(instance, dict),
+    "string": lambda instance: isinstance(instance, str),
+}
+"""
+JSON schema type name to instance check, bools are never numbers.
+"""
+
+
+class _SchemaCompiler:
+    """Specializes JSON schemas into plain Python check functions.
+
+    Only answers whether an instance is valid, error reporting is left to the
+    reference validator. Mirrors jsonschema's semantics for every keyword it
+    supports and raises ``_UnsupportedSchema`` for any other keyword.
+    """
+
+    def __init__(self, store: Dict[str, Dict], integer_allows_float: bool):
+        """Initializes a _SchemaCompiler.
+
+        :param store: schemas keyed by their ``$id`` without fragment
+        :param integer_allows_float: whether floats like 1.0 are integers
+        """
+        self.__store: Dict[str, Dict] = store
+        self.__compiled_refs: Dict[str, _Check] = dict()
+        self.__type_checks: Dict[str, _Check] = dict(_type_checks)
+        if integer_allows_float:
+            self.__type_checks["integer"] = _is_integer_or_integral_float
+
+    def compile(self, schema: Any, base_uri: str) -> _Check:
+        """Compiles a schema into a check function.
+
+        :param schema: schema to compile
+        :param base_uri: URI that ``$ref`` values are resolved against
+        :return: check function
+        """
+        if schema is True:
+            return _accept
+        if schema is False:
+            return _reject
+        if not isinstance(schema, dict):
+            raise _UnsupportedSchema(f"{schema!r} is not a schema")
+        if "$id" in schema:
+            base_uri = urljoin(base_uri, schema["$id"])
+        # sibling keywords of $ref are ignored
+        if "$ref" in schema:
+            return self.__compile_ref(schema["$ref"], base_uri)
+
+        checks: List[_Check] = list()
+        keywords = set(schema) - _annotation_keywords
+        if "type" in schema:
+            checks.append(self.__compile_type(schema["type"]))
+        if "enum" in schema:
+            checks.append(self.__compile_enum(schema["enum"]))
+        if "const" in schema:
+            const = _unbool(schema["const"])
+            checks.append(lambda instance: _unbool(instance) == const)
+        checks.extend(self.__compile_number(schema))
+        checks.extend(self.__compile_string(schema))
+        array_check = self.__compile_array(schema, base_uri)
+        if array_check is not None:
+            checks.append(array_check)
+        object_check = self.__compile_object(schema, base_uri)
+        if object_check is not None:
+            checks.append(object_check)
+        checks.extend(self.__compile_combinators(schema, base_uri))
+        keywords -= {
+            "type",
+            "enum",
+            "const",
+            "minimum",
+            "maximum",
+            "exclusiveMinimum",
+            "exclusiveMaximum",
+            "minLength",
+            "maxLength",
+            "pattern",
+            "items",
+            "additionalItems",
+            "minItems",
+            "maxItems",
+            "properties",
+            "patternProperties",
+            "additionalProperties",
+            "required",
+            "minProperties",
+            "maxProperties",
+            "allOf",
+            "anyOf",
+            "oneOf",
+            "not",
+        }
+        if len(keywords) > 0:
+            raise _UnsupportedSchema(f"Unsupported keywords {sorted(keywords)}")
+
+        if len(checks) == 0:
+            return _accept
+        if len(checks) == 1:
+            return checks[0]
+        checks_tuple = tuple(checks)
+        return lambda instance: all(check(instance) for check in checks_tuple)
+
+    def __compile_ref(self, ref: str, base_uri: str) -> _Check:
+        uri = urljoin(base_uri, ref)
+        if uri in self.__compiled_refs:
+            return self.__compiled_refs[uri]
+        # placeholder allows recursive references
+        resolved: List[_Check] = list()
+        self.__compiled_refs[uri] = lambda instance: resolved[0](instance)
+        document_uri, fragment = urldefrag(uri)
+        try:
+            schema = self.__store[document_uri]
+            for token in unquote(fragment).split("/")[1:]:
+                token = token.replace("~1", "/").replace("~0", "~")
+                schema = schema[int(token) if isinstance(schema, list) else token]
+        except (KeyError, IndexError, ValueError):
+            raise _UnsupportedSchema(f"Unresolvable reference {uri!r}")
+        resolved.append(self.compile(schema, document_uri))
+        self.__compiled_refs[uri] = resolved[0]
+        return resolved[0]
+
+    def __compile_type(self, types: Any) -> _Check:
+        if isinstance(types, str):
+            types = [types]
+        for name in types:
+            if name not in self.__type_checks:
+                raise _UnsupportedSchema(f"Unsupported type {name!r}")
+        type_checks = tuple(self.__type_checks[name] for name in types)
+        if len(type_checks) == 1:
+            return type_checks[0]
+        return lambda instance: any(check(instance) for check in type_checks)
+
+    def __compile_enum(self, enum: List) -> _Check:
+        unbooled_enum = [_unbool(value) for value in enum]
+        return lambda instance: _unbool(instance) in unbooled_enum
+
+    def __compile_number(self, schema: Dict) -> List[_Check]:
+        checks: List[_Check] = list()
+        for keyword, compare in [
+            ("minimum", lambda instance, limit: instance >= limit),
+            ("maximum", lambda instance, limit: instance <= limit),
+            ("exclusiveMinimum", lambda instance, limit: instance > limit),
+            ("exclusiveMaximum", lambda instance, limit: instance < limit),
+        ]:
+            if keyword not in schema:
+                continue
+            limit = schema[keyword]
+            if isinstance(limit, bool):
+                # draft 4 style boolean modifiers
+                raise _UnsupportedSchema(f"Unsupported boolean {keyword}")
+            checks.append(
+                lambda instance, limit=limit, compare=compare: not _is_number(instance)
+                or compare(instance, limit)
+            )
+        return checks
+
+    def __compile_string(self, schema: Dict) -> List[_Check]:
+        checks: List[_Check] = list()
+        if "minLength" in schema:
+            min_length = schema["minLength"]
+            checks.append(
+                lambda instance: not isinstance(instance, str)
+                or len(instance) >= min_length
+            )
+        if "maxLength" in schema:
+            max_length = schema["maxLength"]
+            checks.append(
+                lambda instance: not isinstance(instance, str)
+                or len(instance) <= max_length
+            )
+        if "pattern" in schema:
+            search = compile_regex(schema["pattern"]).search
+            checks.append(
+                lambda instance: not isinstance(instance, str)
+                or search(instance) is not None
+            )
+        return checks
+
+    def __compile_array(self, schema: Dict, base_uri: str) -> Optional[_Check]:
+        if not any(
+            keyword in schema
+            for keyword in ["items", "additionalItems", "minItems", "maxItems"]
+        ):
+            return None
+        min_items: int = schema.get("minItems", 0)
+        max_items: Optional[int] = schema.get("maxItems", None)
+        items: Any = schema.get("items", None)
+        item_check: Optional[_Check] = None
+        prefix_checks: List[_Check] = list()
+        additional_check: Optional[_Check] = None
+        if isinstance(items, list):
+            prefix_checks = [self.compile(item, base_uri) for item in items]
+            if "additionalItems" in schema:
+                additional_check = self.compile(schema["additionalItems"], base_uri)
+        elif items is not None:
+            item_check = self.compile(items, base_uri)
+        prefix_length = len(prefix_checks)
+
+        def check_array(instance: Any) -> bool:
+            if not isinstance(instance, list):
+                return True
+            length = len(instance)
+            if length < min_items or (max_items is not None and length > max_items):
+                return False
+            if item_check is not None:
+                for item in instance:
+                    if not item_check(item):
+                        return False
+                return True
+            for item, prefix_check in zip(instance, prefix_checks):
+                if not prefix_check(item):
+                    return False
+            if additional_check is not None:
+                for i in range(prefix_length, length):
+                    if not additional_check(instance[i]):
+                        return False
+            return True
+
+        return check_array
+
+    def __compile_object(self, schema: Dict, base_uri: str) -> Optional[_Check]:
+        if not any(
+            keyword in schema
+            for keyword in [
+                "properties",
+                "patternProperties",
+                "additionalProperties",
+                "required",
+                "minProperties",
+                "maxProperties",
+            ]
+        ):
+            return None
+        property_checks: Dict[str, _Check] = {
+            name: self.compile(subschema, base_uri)
+            for name, subschema in schema.get("properties", dict()).items()
+        }
+        pattern_checks = [
+            (compile_regex(pattern).search, self.compile(subschema, base_uri))
+            for pattern, subschema in schema.get("patternProperties", dict()).items()
+        ]
+        additional_check: Optional[_Check] = None
+        if "additionalProperties" in schema:
+            additional_check = self.compile(schema["additionalProperties"], base_uri)
+        required = tuple(schema.get("required", []))
+        min_properties: int = schema.get("minProperties", 0)
+        max_properties: Optional[int] = schema.get("maxProperties", None)
+
+        def check_object(instance: Any) -> bool:
+            if not isinstance(instance, dict):
+                return True
+            length = len(instance)
+            if length < min_properties or (
+                max_properties is not None and length > max_properties
+            ):
+                return False
+            for name in required:
+                if name not in instance:
+                    return False
+            for name, value in instance.items():
+                property_check = property_checks.get(name)
+                is_additional = property_check is None
+                if not is_additional and not property_check(value):
+                    return False
+                for search, pattern_check in pattern_checks:
+                    if search(name) is not None:
+                        is_additional = False
+                        if not pattern_check(value):
+                            return False
+                if (
+                    is_additional
+                    and additional_check is not None
+                    and not additional_check(value)
+                ):
+                    return False
+            return True
+
+        return check_object
+
+    def __compile_combinators(self, schema: Dict, base_uri: str) -> List[_Check]:
+        checks: List[_Check] = list()
+        if "allOf" in schema:
+            all_checks = tuple(self.compile(sub, base_uri) for sub in schema["allOf"])
+            checks.append(lambda instance: all(check(instance) for check in all_checks))
+        if "anyOf" in schema:
+            any_checks = tuple(self.compile(sub, base_uri) for sub in schema["anyOf"])
+            checks.append(lambda instance: any(check(instance) for check in any_checks))
+        if "oneOf" in schema:
+            one_checks = tuple(self.compile(sub, base_uri) for sub in schema["oneOf"])
+            checks.append(
+                lambda instance: sum(1 for check in one_checks if check(instance)) == 1
+            )
+        if "not" in schema:
+            not_check = self.compile(schema["not"], base_uri)
+            checks.append(lambda instance: not not_check(instance))
+        return checks
+
+
+@lru_cache(maxsize=None)
+def _get_compiled_check() -> Optional[_Check]:
+    """Compiles the keyboard schema into a check function on first use.
+
+    :return: check function, None if the schemas use unsupported keywords
+    """
+    schemas: Dict[str, Dict] = _get_schemas()
+    keyboard_schema: Dict = schemas["Keyboard.schema.json"]
+    store = {urldefrag(schema["$id"])[0]: schema for schema in schemas.values()}
+    # draft 3 and 4 don't consider floats like 1.0 integers
+    draft: str = keyboard_schema.get("$schema", "")
+    integer_allows_float = "draft-03" not in draft and "draft-04" not in draft
+    compiler = _SchemaCompiler(store, integer_allows_float)
+    try:
+        return compiler.compile(
+            keyboard_schema,
+            urldefrag(keyboard_schema.get("$id", ""))[0],
+        )
+    except _UnsupportedSchema:
+        return None
+
+
+def _structure_error(message: str, path: List[int]) -> Exception:
+    """Creates a validation error matching the type raised by full validation.
+
+    :param message: error description
+    :param path: path to the offending item
+    :return: error to be raised
+    """
+    from jsonschema.exceptions import ValidationError
+
+    return ValidationError(message, path=path)
+
+
+def _validate_structure(keyboard_json: Any) -> None:
+    """Checks the row and item structure of a KLE JSON without its schemas.
+
+    Also checks the label alignments, which index the label maps.
+
+    :param keyboard_json: KLE JSON to check
+    """
+    if type(keyboard_json) is not list:
+        raise _structure_error(f"{keyboard_json!r} is not of type 'array'", [])
+    for r, row in enumerate(keyboard_json):
+        if type(row) is dict:
+            if r != 0:
+                raise _structure_error(
+                    f"{row!r} is not of type 'array', only the first item may "
+                    "be metadata",
+                    [r],
+                )
+            continue
+        if type(row) is not list:
+            raise _structure_error(f"{row!r} is not of type 'array'", [r])
+        for k, item in enumerate(row):
+            if type(item) is dict:
+                alignment: Any = item.get("a", 0)
+                if type(alignment) is not int or not 0 <= alignment < len(_label_map):
+                    # reported on the row, like the schemas of the key changes
+                    raise _structure_error(
+                        f"{row!r} is not valid under any of the given schemas",
+                        [r],
+                    )
+            elif type(item) is not str:
+                raise _structure_error(
+                    f"{item!r} is not of type 'string', 'object'",
+                    [r, k],
+                )
+
+
+def _validate(keyboard_json: Any, validate: str) -> None:
+    """Validates a KLE JSON according to the validation mode.
+
+    :param keyboard_json: KLE JSON to validate
+    :param validate: one of ``_validation_modes``
+    """
+    if validate == "full":
+        check: Optional[_Check] = _get_compiled_check()
+        # reference validator reports errors, also the fallback for unsupported schemas
+        if check is None or not check(keyboard_json):
+            _get_validator().validate(instance=keyboard_json)
+    elif validate == "fast":
+        _validate_structure(keyboard_json)
+    elif validate != "off":
+        raise ValueError(
+            f"Invalid validate mode {validate!r}, expected one of {_validation_modes}."
+        )
@@ -0,0 +1,238 @@
+from __future__ import annotations
+from typing import (
+    Any,
+    Union,
+    Optional,
+    Callable,
+    Awaitable,
+    List,
+    Dict,
+    Iterable,
+    Iterator,
+    IO,
+)
+from io import TextIOBase, RawIOBase, BufferedIOBase
+from inspect import isawaitable
+from json.encoder import JSONEncoder, encode_basestring_ascii
+from math import inf
+from sys import modules
+
+__all__ = []
+
+
+_minified_encoder = JSONEncoder(separators=(",", ":"))
+"""
+Encoder of minified KLE JSON rows.
+"""
+
+
+def _encoded_float(value: float) -> str:
+    """Encodes a float as ``json.dumps`` does with ``allow_nan``.
+
+    :param value: float to encode
+    :return: JSON text
+    """
+    if value != value:
+        return "NaN"
+    if value == inf:
+        return "Infinity"
+    if value == -inf:
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def _encoded_scalar(value: Any) -> str:
+    """Encodes a JSON scalar as ``json.dumps`` does with ``json_dump_options``.
+
+    :param value: str, number, bool or None to encode
+    :return: JSON text
+    """
+    if type(value) is str:
+        return encode_basestring_ascii(value)
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if value is None:
+        return "null"
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float):
+        return _encoded_float(value)
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    raise TypeError(
+        f"Object of type {value.__class__.__name__} is not JSON serializable"
+    )
+
+
+def _encoded(
+    value: Any,
+    newline: str,
+    indent: str,
+    item_separator: str,
+    key_separator: str,
+) -> str:
+    """Encodes a JSON value nested in an indented KLE JSON.
+
+    :param value: value to encode
+    :param newline: line break and indentation of the value's level
+    :param indent: indentation added per level
+    :param item_separator: separator between items
+    :param key_separator: separator between keys and values
+    :return: JSON text
+    """
+    if type(value) is list or type(value) is tuple:
+        if len(value) == 0:
+            return "[]"
+        inner = newline + indent
+        # labels are the most common items
+        return (
+            "["
+            + inner
+            + (item_separator + inner).join(
+                [
+                    (
+                        encode_basestring_ascii(item)
+                        if type(item) is str
+                        else _encoded(
+                            item, inner, indent, item_separator, key_separator
+                        )
+                    )
+                    for item in value
+                ]
+            )
+            + newline
+            + "]"
+        )
+    if type(value) is dict:
+        if len(value) == 0:
+            return "{}"
+        inner = newline + indent
+        # key changes are mostly flat
+        return (
+            "{"
+            + inner
+            + (item_separator + inner).join(
+                [
+                    encode_basestring_ascii(name)
+                    + key_separator
+                    + (
+                        _encoded_scalar(item)
+                        if type(item) is not list and type(item) is not dict
+                        else _encoded(
+                            item, inner, indent, item_separator, key_separator
+                        )
+                    )
+                    for name, item in value.items()
+                ]
+            )
+            + newline
+            + "}"
+        )
+    return _encoded_scalar(value)
+
+
+def _encoded_row(
+    row: Union[Dict, List[Union[str, Dict]]],
+    minified: bool = False,
+) -> str:
+    """Encodes a KLE JSON row, or the metadata changes, as nested in a KLE JSON.
+
+    :param row: metadata changes or row of labels and key changes
+    :param minified: whether to drop the indentation and whitespace
+    :return: JSON text of the row
+    """
+    if minified:
+        # without indentation the C encoder applies
+        return _minified_encoder.encode(row)
+    return _encoded(row, "\n  ", "  ", ",", ": ")
+
+
+def _iter_json_text(
+    texts: Iterable[str],
+    minified: bool = False,
+) -> Iterator[str]:
+    """Joins encoded KLE JSON rows into text, yielding one chunk per row.
+
+    The text is identical to ``json.dumps`` with ``json_dump_options``, or with
+    compact separators when minified.
+
+    :param texts: JSON text of the metadata changes and rows, see _encoded_row
+    :param minified: whether to drop the indentation and whitespace
+    :return: iterator of text chunks
+    """
+    inner = "" if minified else "\n  "
+    opening = "[" + inner
+    is_empty = True
+    for text in texts:
+        yield opening + text
+        opening = "," + inner
+        is_empty = False
+    if is_empty:
+        yield "[]"
+    else:
+        yield "]" if minified else "\n]"
+
+
+def _is_binary(fp: Any) -> bool:
+    """Determines whether a file-like object or writer takes bytes.
+
+    :param fp: file-like object or writer
+    :return: whether chunks are written as bytes
+    """
+    if isinstance(fp, TextIOBase):
+        return False
+    if isinstance(fp, (RawIOBase, BufferedIOBase)):
+        return True
+    # writers can only come from asyncio once it is imported
+    asyncio: Any = modules.get("asyncio")
+    return asyncio is not None and isinstance(fp, asyncio.StreamWriter)
+
+
+def _write_json_text(
+    fp: IO,
+    texts: Iterable[str],
+    minified: bool = False,
+    binary: Optional[bool] = None,
+) -> None:
+    """Writes encoded KLE JSON rows as text, one write per row.
+
+    :param fp: file-like object to write to
+    :param texts: JSON text of the metadata changes and rows, see _encoded_row
+    :param minified: whether to drop the indentation and whitespace
+    :param binary: whether to write bytes, detected from ``fp`` by default
+    """
+    write: Callable[[Union[str, bytes]], Any] = fp.write
+    if binary is None:
+        binary = _is_binary(fp)
+    for chunk in _iter_json_text(texts, minified):
+        write(chunk.encode("utf-8") if binary else chunk)
+
+
+async def _write_json_text_async(
+    writer: Any,
+    texts: Iterable[str],
+    minified: bool = False,
+    binary: Optional[bool] = None,
+) -> None:
+    """Writes encoded KLE JSON rows as text to an async writer, one write per row.
+
+    Writes are awaited when they return awaitables, writers with a ``drain``
+    coroutine, such as ``asyncio.StreamWriter``, are drained after each row.
+
+    :param writer: async writer to write to
+    :param texts: JSON text of the metadata changes and rows, see _encoded_row
+    :param minified: whether to drop the indentation and whitespace
+    :param binary: whether to write bytes, detected from ``writer`` by default
+    """
+    write: Callable[[Union[str, bytes]], Any] = writer.write
+    drain: Optional[Callable[[], Awaitable]] = getattr(writer, "drain", None)
+    if binary is None:
+        binary = _is_binary(writer)
+    for chunk in _iter_json_text(texts, minified):
+        written = write(chunk.encode("utf-8") if binary else chunk)
+        if isawaitable(written):
+            await written
+        if drain is not None:
+            await drain()
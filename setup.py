@@ -26,6 +26,9 @@ st.setup(
         "jsonschema>=3.2.0,<4",
     ],
     extras_require={
+        "numpy": [
+            "numpy>=1.17,<2",
+        ],
         "dev": [
             # test dependencies
             "matplotlib>=3.1.2,<4",
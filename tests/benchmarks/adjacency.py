@@ -0,0 +1,61 @@
+# benchmarks finding neighbouring keys and inferring a switch matrix against
+# comparing every pair of keys, on a large generated layout
+# python3 adjacency.py [<path_to_input_file>] [<copies>]
+
+import os
+import sys
+import json
+import timeit
+from copy import deepcopy
+from damsenviet.kle import Keyboard
+
+input_file_path = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs", "ergodox.json")
+)
+copies = int(sys.argv[2]) if len(sys.argv) >= 3 else 50
+with open(input_file_path) as input_file:
+    layout = Keyboard.from_json(json.load(input_file))
+
+# stack copies of the layout vertically
+keyboard = Keyboard()
+height = max(key.y + key.height for key in layout.keys)
+for i in range(copies):
+    for key in layout.keys:
+        key = deepcopy(key)
+        key.y += i * height
+        key.rotation_y += i * height
+        keyboard.keys.append(key)
+
+
+def pairwise():
+    # only compares the bounds of every pair, ignoring rotations
+    geometry = keyboard.geometry()
+    bounds = [geometry.bounds(i) for i in range(len(geometry))]
+    neighbours = [list() for _ in bounds]
+    for i, (min_x, min_y, max_x, max_y) in enumerate(bounds):
+        for j in range(i + 1, len(bounds)):
+            other_min_x, other_min_y, other_max_x, other_max_y = bounds[j]
+            if (
+                min_x - 0.25 <= other_max_x
+                and other_min_x - 0.25 <= max_x
+                and min_y - 0.25 <= other_max_y
+                and other_min_y - 0.25 <= max_y
+            ):
+                neighbours[i].append(j)
+                neighbours[j].append(i)
+
+
+def best(function, number):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+
+graph = keyboard.key_graph()
+pairwise_time = best(pairwise, 1)
+graph_time = best(lambda: keyboard.key_graph(), 1)
+matrix_time = best(lambda: graph.matrix(), 1)
+print(f"Keys: {len(keyboard.keys)}, neighbour pairs: {len(graph.edges())}")
+print(f"pairwise bounds: {pairwise_time * 1e3:.1f} ms")
+print(f"key_graph: {graph_time * 1e3:.1f} ms ({pairwise_time / graph_time:.1f}x)")
+print(f"matrix: {matrix_time * 1e3:.1f} ms")
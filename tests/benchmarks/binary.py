@@ -0,0 +1,69 @@
+# benchmarks loading layouts from the binary encoding against json.load and
+# Keyboard.from_json
+# python3 binary.py [<path_to_inputs_dir>]
+
+import os
+import sys
+import json
+import pickle
+import timeit
+import tempfile
+from damsenviet.kle import Keyboard, KeyboardBuffer
+
+inputs_dir = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs")
+)
+texts = list()
+for file_name in sorted(os.listdir(inputs_dir)):
+    if not file_name.endswith(".json"):
+        continue
+    with open(os.path.join(inputs_dir, file_name), "rb") as input_file:
+        texts.append(input_file.read())
+keyboards = [Keyboard.from_json(json.loads(text)) for text in texts]
+encodings = [keyboard.to_bytes() for keyboard in keyboards]
+pickles = [pickle.dumps(keyboard, pickle.HIGHEST_PROTOCOL) for keyboard in keyboards]
+key_count = sum(len(keyboard.keys) for keyboard in keyboards)
+
+temporary_dir = tempfile.TemporaryDirectory()
+paths = list()
+for i, encoding in enumerate(encodings):
+    paths.append(os.path.join(temporary_dir.name, f"{i}.kleb"))
+    with open(paths[-1], "wb") as output_file:
+        output_file.write(encoding)
+
+
+def best(function, number=5):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def open_one_key():
+    for path in paths:
+        with KeyboardBuffer.open(path) as buffer:
+            if len(buffer) > 0:
+                buffer[len(buffer) // 2]
+
+
+timings = {
+    "json.loads + from_json": lambda: [
+        Keyboard.from_json(json.loads(text)) for text in texts
+    ],
+    'json.loads + from_json(validate="off")': lambda: [
+        Keyboard.from_json(json.loads(text), validate="off") for text in texts
+    ],
+    "pickle.loads": lambda: [pickle.loads(data) for data in pickles],
+    "from_bytes": lambda: [Keyboard.from_bytes(data) for data in encodings],
+    "KeyboardBuffer.open, one key": open_one_key,
+}
+print(f"Layouts: {len(texts)}, keys: {key_count}")
+print(
+    f"Sizes: JSON {sum(map(len, texts))} B, pickle {sum(map(len, pickles))} B, "
+    f"binary {sum(map(len, encodings))} B"
+)
+baseline = None
+for name, function in timings.items():
+    elapsed = best(function)
+    baseline = baseline or elapsed
+    print(f"{name}: {elapsed * 1e3:.2f} ms ({baseline / elapsed:.1f}x)")
+temporary_dir.cleanup()
@@ -0,0 +1,80 @@
+# benchmarks loading a corpus of layouts through ParseCache and KeyboardCache
+# against parsing and validating them on every load
+# python3 cache.py [<path_to_inputs_dir>]
+
+import os
+import sys
+import json
+import timeit
+import tempfile
+from damsenviet.kle import Keyboard, ParseCache, KeyboardCache
+
+inputs_dir = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs")
+)
+paths = [
+    os.path.join(inputs_dir, file_name)
+    for file_name in sorted(os.listdir(inputs_dir))
+    if file_name.endswith(".json")
+]
+texts = list()
+for path in paths:
+    with open(path, "rb") as input_file:
+        texts.append(input_file.read())
+temporary_dir = tempfile.TemporaryDirectory()
+cache = ParseCache(temporary_dir.name)
+keyboard_cache = KeyboardCache()
+
+
+def best(function, number=5):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def uncached():
+    for path in paths:
+        with open(path, "rb") as input_file:
+            Keyboard.from_json(json.load(input_file))
+
+
+def cold():
+    cache.clear()
+    for path in paths:
+        cache.load(path)
+
+
+def warm():
+    for path in paths:
+        cache.load(path)
+
+
+def warm_by_content():
+    # content is hashed, as for files copied into a fresh checkout
+    for text in texts:
+        cache.loads(text)
+
+
+def in_process():
+    for text in texts:
+        keyboard_cache.get(text)
+
+
+timings = {
+    "json.load + from_json": uncached,
+    "ParseCache.load, cold": cold,
+    "ParseCache.load, warm": warm,
+    "ParseCache.loads, warm": warm_by_content,
+    "KeyboardCache.get, warm": in_process,
+}
+print(f"Layouts: {len(paths)}")
+baseline = None
+for name, function in timings.items():
+    elapsed = best(function)
+    baseline = baseline or elapsed
+    print(f"{name}: {elapsed * 1e3:.2f} ms ({baseline / elapsed:.1f}x)")
+print(
+    f"KeyboardCache: {keyboard_cache.hits} hits, {keyboard_cache.misses} misses, "
+    f"{keyboard_cache.size} B"
+)
+temporary_dir.cleanup()
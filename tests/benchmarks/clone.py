@@ -0,0 +1,56 @@
+# benchmarks the field-level Key clone against the generic deepcopy path
+# python3 clone.py [<path_to_inputs_dir>]
+
+import os
+import sys
+import json
+import timeit
+import copyreg
+from copy import deepcopy
+import damsenviet.kle as kle
+
+
+def generic_deepcopy(obj):
+    """Replicates the generic deepcopy path, walking every instance slot."""
+    if isinstance(obj, (kle.Key, kle.Label, kle.Switch)):
+        clone = obj.__class__.__new__(obj.__class__)
+        for name in copyreg._slotnames(obj.__class__):
+            setattr(clone, name, generic_deepcopy(getattr(obj, name)))
+        return clone
+    if isinstance(obj, list):
+        return [generic_deepcopy(item) for item in obj]
+    return deepcopy(obj)
+
+
+inputs_dir = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs")
+)
+keyboard_jsons = list()
+for file_name in sorted(os.listdir(inputs_dir)):
+    if not file_name.endswith(".json"):
+        continue
+    with open(os.path.join(inputs_dir, file_name)) as input_file:
+        keyboard_jsons.append(json.load(input_file))
+
+key = kle.Keyboard.from_json(keyboard_jsons[0]).keys[0]
+number = 20000
+generic_time = timeit.timeit(lambda: generic_deepcopy(key), number=number)
+clone_time = timeit.timeit(lambda: deepcopy(key), number=number)
+print(f"Key generic deepcopy: {generic_time / number * 1e6:.2f} us/key")
+print(f"Key field clone:      {clone_time / number * 1e6:.2f} us/key")
+print(f"Speedup:              {generic_time / clone_time:.1f}x")
+
+number = 5
+parse_time = timeit.timeit(
+    lambda: [kle.Keyboard.from_json(keyboard_json) for keyboard_json in keyboard_jsons],
+    number=number,
+)
+key_count = sum(
+    len(kle.Keyboard.from_json(keyboard_json).keys) for keyboard_json in keyboard_jsons
+)
+print(
+    f"from_json: {parse_time / number * 1e3:.2f} ms for "
+    f"{len(keyboard_jsons)} layouts ({key_count} keys)"
+)
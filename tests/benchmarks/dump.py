@@ -0,0 +1,67 @@
+# benchmarks peak memory and time to first byte of Keyboard.dump against
+# writing json.dumps(keyboard.to_json()) on a large generated layout
+# python3 dump.py [<path_to_input_file>] [<copies>]
+
+import os
+import sys
+import json
+import time
+import tracemalloc
+from copy import deepcopy
+from damsenviet.kle import Keyboard, json_dump_options
+
+input_file_path = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs", "ansi-104.json")
+)
+copies = int(sys.argv[2]) if len(sys.argv) >= 3 else 200
+with open(input_file_path) as input_file:
+    layout = Keyboard.from_json(json.load(input_file))
+
+# stack copies of the layout vertically
+keyboard = Keyboard()
+height = max(key.y + key.height for key in layout.keys)
+for i in range(copies):
+    for key in layout.keys:
+        key = deepcopy(key)
+        key.y += i * height
+        keyboard.keys.append(key)
+
+
+class Sink:
+    """Discards writes, recording when the first one happened."""
+
+    def __init__(self):
+        self.first_write = None
+        self.size = 0
+
+    def write(self, chunk):
+        if self.first_write is None:
+            self.first_write = time.perf_counter()
+        self.size += len(chunk)
+
+
+def two_pass(sink):
+    sink.write(json.dumps(keyboard.to_json(), **json_dump_options))
+
+
+def streamed(sink):
+    keyboard.dump(sink)
+
+
+print(f"Keys: {len(keyboard.keys)}")
+for name, serialize in (("to_json + json.dumps", two_pass), ("dump", streamed)):
+    sink = Sink()
+    tracemalloc.start()
+    start = time.perf_counter()
+    serialize(sink)
+    end = time.perf_counter()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        f"{name}: {sink.size / 2 ** 20:.1f} MiB written, "
+        f"peak {peak / 2 ** 20:.2f} MiB, "
+        f"first byte {(sink.first_write - start) * 1e3:.1f} ms, "
+        f"total {(end - start) * 1e3:.1f} ms"
+    )
@@ -0,0 +1,68 @@
+# benchmarks edit-to-save latency of a single key edit against serializing
+# the whole layout again, on a large generated layout
+# python3 edits.py [<path_to_input_file>] [<copies>]
+
+import os
+import sys
+import json
+import timeit
+from copy import deepcopy
+from damsenviet.kle import Keyboard
+
+input_file_path = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs", "ansi-104.json")
+)
+copies = int(sys.argv[2]) if len(sys.argv) >= 3 else 50
+with open(input_file_path) as input_file:
+    layout = Keyboard.from_json(json.load(input_file))
+
+# stack copies of the layout vertically
+keyboard = Keyboard()
+height = max(key.y + key.height for key in layout.keys)
+for i in range(copies):
+    for key in layout.keys:
+        key = deepcopy(key)
+        key.y += i * height
+        keyboard.keys.append(key)
+keyboard.dumps()
+key = keyboard.keys[len(keyboard.keys) // 2]
+texts = ["A", "B"]
+
+
+def full():
+    # copies hold no serialized rows
+    deepcopy(keyboard).dumps()
+
+
+def copy_only():
+    deepcopy(keyboard)
+
+
+def edit_label():
+    texts.reverse()
+    key.labels[0].text = texts[0]
+    keyboard.dumps()
+
+
+def edit_position():
+    texts.reverse()
+    key.x += 0.25 if texts[0] == "A" else -0.25
+    keyboard.dumps()
+
+
+def best(function, number):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+full_time = best(full, 3) - best(copy_only, 3)
+label_time = best(edit_label, 20)
+position_time = best(edit_position, 20)
+print(f"Keys: {len(keyboard.keys)}")
+print(f"Full serialization: {full_time * 1e3:.2f} ms")
+print(f"Label edit + dumps: {label_time * 1e3:.2f} ms ({full_time / label_time:.1f}x)")
+print(
+    f"Move edit + dumps:  {position_time * 1e3:.2f} ms "
+    f"({full_time / position_time:.1f}x)"
+)
@@ -0,0 +1,84 @@
+# benchmarks comparing keyboards by fingerprint and equals against comparing
+# their KLE JSON, on a large generated layout
+# python3 fingerprint.py [<path_to_input_file>] [<copies>]
+
+import os
+import sys
+import json
+import timeit
+from copy import deepcopy
+from damsenviet.kle import Keyboard, json_dump_options
+
+input_file_path = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs", "ansi-104.json")
+)
+copies = int(sys.argv[2]) if len(sys.argv) >= 3 else 50
+with open(input_file_path) as input_file:
+    layout = Keyboard.from_json(json.load(input_file))
+
+# stack copies of the layout vertically
+keyboard = Keyboard()
+height = max(key.y + key.height for key in layout.keys)
+for i in range(copies):
+    for key in layout.keys:
+        key = deepcopy(key)
+        key.y += i * height
+        keyboard.keys.append(key)
+other = deepcopy(keyboard)
+key = keyboard.keys[len(keyboard.keys) // 2]
+texts = ["A", "B"]
+
+
+def best(function, number):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def json_text():
+    # copies hold no serialized rows
+    json.dumps(deepcopy(keyboard).to_json(), **json_dump_options) == json.dumps(
+        deepcopy(other).to_json(), **json_dump_options
+    )
+
+
+def cold():
+    deepcopy(keyboard).equals(deepcopy(other))
+
+
+def copy_only():
+    deepcopy(keyboard), deepcopy(other)
+
+
+def warm():
+    keyboard.fingerprint() == other.fingerprint()
+
+
+def confirmed():
+    keyboard.equals(other)
+
+
+def edit():
+    texts.reverse()
+    key.labels[0].text = texts[0]
+    keyboard.fingerprint() == other.fingerprint()
+
+
+copy_time = best(copy_only, 3)
+json_time = best(json_text, 3) - copy_time
+cold_time = best(cold, 3) - copy_time
+warm_time = best(warm, 20)
+confirmed_time = best(confirmed, 3)
+edit_time = best(edit, 20)
+print(f"Keys: {len(keyboard.keys)}")
+print(f"to_json text comparison: {json_time * 1e3:.2f} ms")
+print(f"equals cold: {cold_time * 1e3:.2f} ms ({json_time / cold_time:.1f}x)")
+print(
+    f"equals cached: {confirmed_time * 1e3:.2f} ms "
+    f"({json_time / confirmed_time:.1f}x)"
+)
+print(f"fingerprint cached: {warm_time * 1e3:.3f} ms ({json_time / warm_time:.1f}x)")
+print(
+    f"label edit + fingerprint: {edit_time * 1e3:.3f} ms "
+    f"({json_time / edit_time:.1f}x)"
+)
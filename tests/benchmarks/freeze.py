@@ -0,0 +1,44 @@
+# benchmarks sharing frozen keyboards against copying mutable ones, on a large
+# generated layout
+# python3 freeze.py [<path_to_input_file>] [<copies>]
+
+import os
+import sys
+import json
+import timeit
+from copy import deepcopy
+from damsenviet.kle import Keyboard
+
+input_file_path = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs", "ansi-104.json")
+)
+copies = int(sys.argv[2]) if len(sys.argv) >= 3 else 50
+with open(input_file_path) as input_file:
+    layout = Keyboard.from_json(json.load(input_file))
+
+# stack copies of the layout vertically
+keyboard = Keyboard()
+height = max(key.y + key.height for key in layout.keys)
+for i in range(copies):
+    for key in layout.keys:
+        key = deepcopy(key)
+        key.y += i * height
+        keyboard.keys.append(key)
+snapshot = keyboard.freeze()
+
+
+def best(function, number):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+deepcopy_time = best(lambda: deepcopy(keyboard), 3)
+freeze_time = best(lambda: keyboard.freeze(), 3)
+thaw_time = best(lambda: snapshot.thaw(), 3)
+share_time = best(lambda: deepcopy(snapshot), 1000)
+print(f"Keys: {len(keyboard.keys)}")
+print(f"deepcopy: {deepcopy_time * 1e3:.2f} ms")
+print(f"freeze: {freeze_time * 1e3:.2f} ms")
+print(f"thaw: {thaw_time * 1e3:.2f} ms ({deepcopy_time / thaw_time:.1f}x)")
+print(f"deepcopy of a snapshot: {share_time * 1e6:.2f} us")
@@ -0,0 +1,84 @@
+# benchmarks computing the rotated outlines and bounds of all keys, vectorized
+# and in pure Python, on a large generated layout
+# python3 geometry.py [<path_to_input_file>] [<copies>]
+
+import os
+import sys
+import json
+import math
+import timeit
+from copy import deepcopy
+from damsenviet.kle import Keyboard, KeyGeometry
+
+input_file_path = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs", "ergodox.json")
+)
+copies = int(sys.argv[2]) if len(sys.argv) >= 3 else 50
+with open(input_file_path) as input_file:
+    layout = Keyboard.from_json(json.load(input_file))
+
+# stack copies of the layout vertically
+keyboard = Keyboard()
+height = max(key.y + key.height for key in layout.keys)
+for i in range(copies):
+    for key in layout.keys:
+        key = deepcopy(key)
+        key.y += i * height
+        key.rotation_y += i * height
+        keyboard.keys.append(key)
+table = keyboard.to_table()
+
+
+def rotate(x, y, origin_x, origin_y, angle):
+    # rotation as done by hand in tests/manual/orientation.py
+    rel_x = x - origin_x
+    rel_y = y - origin_y
+    new_x = (
+        origin_x
+        + (rel_x * math.cos(math.radians(angle)))
+        - (rel_y * math.sin(math.radians(angle)))
+    )
+    new_y = (
+        origin_y
+        + (rel_y * math.cos(math.radians(angle)))
+        + (rel_x * math.sin(math.radians(angle)))
+    )
+    return (new_x, new_y)
+
+
+def by_hand():
+    for key in keyboard.keys:
+        for x, y, width, height in (
+            (key.x, key.y, key.width, key.height),
+            (key.x + key.x2, key.y + key.y2, key.width2, key.height2),
+        ):
+            for corner_x, corner_y in (
+                (x, y),
+                (x + width, y),
+                (x + width, y + height),
+                (x, y + height),
+            ):
+                rotate(
+                    corner_x,
+                    corner_y,
+                    key.rotation_x,
+                    key.rotation_y,
+                    key.rotation_angle,
+                )
+
+
+def best(function, number):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+hand_time = best(by_hand, 3)
+python_time = best(lambda: keyboard.geometry(vectorized=False), 3)
+numpy_time = best(lambda: keyboard.geometry(vectorized=True), 3)
+table_time = best(lambda: KeyGeometry.from_table(table, vectorized=True), 10)
+print(f"Keys: {len(keyboard.keys)}")
+print(f"rotated by hand: {hand_time * 1e3:.2f} ms")
+print(f"pure Python: {python_time * 1e3:.2f} ms ({hand_time / python_time:.1f}x)")
+print(f"vectorized: {numpy_time * 1e3:.2f} ms ({hand_time / numpy_time:.1f}x)")
+print(f"vectorized from a KeyTable: {table_time * 1e3:.2f} ms")
@@ -0,0 +1,64 @@
+# benchmarks loading many layouts with Keyboard.load_many against a loop
+# python3 load_many.py [<path_to_inputs_dir>] [<copies>]
+
+import os
+import sys
+import json
+import time
+import pickle
+import timeit
+from damsenviet.kle import Keyboard
+
+inputs_dir = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs")
+)
+copies = int(sys.argv[2]) if len(sys.argv) >= 3 else 10
+paths = list()
+for file_name in sorted(os.listdir(inputs_dir)):
+    if not file_name.endswith(".json"):
+        continue
+    paths.append(os.path.join(inputs_dir, file_name))
+paths = paths * copies
+
+# pickled size of the results sent back by process workers
+keyboards = [
+    Keyboard.from_json(json.load(open(path))) for path in paths[: len(paths) // copies]
+]
+pickled_size = len(pickle.dumps(keyboards, pickle.HIGHEST_PROTOCOL))
+json_size = sum(os.path.getsize(path) for path in paths[: len(paths) // copies])
+dumps_time = timeit.timeit(
+    lambda: pickle.loads(pickle.dumps(keyboards, pickle.HIGHEST_PROTOCOL)),
+    number=5,
+)
+print(f"Pickled results: {pickled_size / json_size:.2f}x the KLE JSON size")
+print(f"Pickle round trip: {dumps_time / 5 / len(keyboards) * 1e3:.2f} ms/layout")
+
+
+def loop():
+    for path in paths:
+        with open(path, "rb") as fp:
+            Keyboard.from_json(json.load(fp))
+
+
+def load_many(workers, executor):
+    for _, result in Keyboard.load_many(paths, workers=workers, executor=executor):
+        if isinstance(result, Exception):
+            raise result
+
+
+start = time.perf_counter()
+loop()
+loop_time = time.perf_counter() - start
+print(f"Files: {len(paths)}, CPUs: {os.cpu_count()}")
+print(f"Loop: {loop_time:.2f} s")
+for executor in ("thread", "process"):
+    for workers in sorted({1, 2, 4, os.cpu_count()}):
+        start = time.perf_counter()
+        load_many(workers, executor)
+        load_time = time.perf_counter() - start
+        print(
+            f"{executor} x{workers}: {load_time:.2f} s "
+            f"({loop_time / load_time:.2f}x)"
+        )
@@ -0,0 +1,45 @@
+# measures memory per key and property access time of parsed keyboards
+# python3 memory.py [<path_to_inputs_dir>]
+
+import os
+import sys
+import json
+import timeit
+import tracemalloc
+import damsenviet.kle as kle
+
+inputs_dir = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs")
+)
+keyboard_jsons = list()
+for file_name in sorted(os.listdir(inputs_dir)):
+    if not file_name.endswith(".json"):
+        continue
+    with open(os.path.join(inputs_dir, file_name)) as input_file:
+        keyboard_jsons.append(json.load(input_file))
+
+tracemalloc.start()
+keyboards = [
+    kle.Keyboard.from_json(keyboard_json, validate="off")
+    for keyboard_json in keyboard_jsons
+]
+size, _ = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+key_count = sum(len(keyboard.keys) for keyboard in keyboards)
+print(f"Keyboards: {len(keyboards)}, keys: {key_count}")
+print(f"Memory per key: {size / key_count:.0f} bytes")
+
+keys = [key for keyboard in keyboards for key in keyboard.keys]
+number = 20
+read_time = timeit.timeit(
+    lambda: [(key.x, key.y, key.width, key.labels[0].text) for key in keys],
+    number=number,
+)
+write_time = timeit.timeit(
+    lambda: [setattr(key, "x", key.x) for key in keys],
+    number=number,
+)
+print(f"Property reads:  {read_time / number / key_count / 4 * 1e9:.1f} ns/read")
+print(f"Property writes: {write_time / number / key_count * 1e9:.1f} ns/write")
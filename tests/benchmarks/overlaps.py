@@ -0,0 +1,62 @@
+# benchmarks finding overlapping keys against comparing every pair of keys, on
+# a large generated layout with duplicated keys
+# python3 overlaps.py [<path_to_input_file>] [<copies>]
+
+import os
+import sys
+import json
+import timeit
+from copy import deepcopy
+from damsenviet.kle import Keyboard
+
+input_file_path = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs", "ergodox.json")
+)
+copies = int(sys.argv[2]) if len(sys.argv) >= 3 else 50
+with open(input_file_path) as input_file:
+    layout = Keyboard.from_json(json.load(input_file))
+
+# stack copies of the layout vertically, duplicating a key of each copy
+keyboard = Keyboard()
+height = layout.geometry().extent[3]
+for i in range(copies):
+    for key in layout.keys:
+        key = deepcopy(key)
+        key.y += i * height
+        key.rotation_y += i * height
+        keyboard.keys.append(key)
+    keyboard.keys.append(deepcopy(keyboard.keys[-1]))
+
+
+def pairwise():
+    # only compares the bounds of every pair, ignoring rotations
+    geometry = keyboard.geometry()
+    bounds = [geometry.bounds(i) for i in range(len(geometry))]
+    pairs = list()
+    for i, (min_x, min_y, max_x, max_y) in enumerate(bounds):
+        for j in range(i + 1, len(bounds)):
+            other_min_x, other_min_y, other_max_x, other_max_y = bounds[j]
+            if (
+                min_x < other_max_x
+                and other_min_x < max_x
+                and min_y < other_max_y
+                and other_min_y < max_y
+            ):
+                pairs.append((i, j))
+
+
+def best(function, number):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+
+overlaps = keyboard.find_overlaps()
+pairwise_time = best(pairwise, 1)
+overlaps_time = best(lambda: keyboard.find_overlaps(), 1)
+print(f"Keys: {len(keyboard.keys)}, overlapping pairs: {len(overlaps)}")
+print(f"pairwise bounds: {pairwise_time * 1e3:.1f} ms")
+print(
+    f"find_overlaps: {overlaps_time * 1e3:.1f} ms "
+    f"({pairwise_time / overlaps_time:.1f}x)"
+)
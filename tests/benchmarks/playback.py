@@ -0,0 +1,69 @@
+# benchmarks key change playback by dispatch against probing every property
+# python3 playback.py [<path_to_inputs_dir>]
+
+import os
+import sys
+import json
+import timeit
+from damsenviet.kle import Keyboard
+from damsenviet.kle.playback import (
+    PlaybackState,
+    _key_changes,
+    _playback_key_changes,
+)
+
+inputs_dir = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs")
+)
+keyboard_jsons = list()
+for file_name in sorted(os.listdir(inputs_dir)):
+    if not file_name.endswith(".json"):
+        continue
+    with open(os.path.join(inputs_dir, file_name)) as input_file:
+        keyboard_jsons.append(json.load(input_file))
+
+key_changes = [
+    item
+    for keyboard_json in keyboard_jsons
+    for row in keyboard_json
+    if type(row) is list
+    for item in row
+    if type(item) is dict
+]
+
+# the same handlers, tested one property name at a time
+names = "r rx ry a f f2 fa p c t x y w h h2 w2 y2 x2 n l d g sm sb st".split()
+probes = _key_changes.plan(tuple(names))
+
+
+def probing(state, changes):
+    for name, handler in probes:
+        if name in changes:
+            handler(state, changes[name])
+
+
+state = PlaybackState()
+number = 200
+probing_time = timeit.timeit(
+    lambda: [probing(state, changes) for changes in key_changes],
+    number=number,
+)
+state = PlaybackState()
+dispatch_time = timeit.timeit(
+    lambda: [_playback_key_changes(state, changes) for changes in key_changes],
+    number=number,
+)
+count = len(key_changes) * number
+print(f"Key changes: {len(key_changes)}")
+print(f"Probing:  {probing_time / count * 1e9:.1f} ns/change")
+print(f"Dispatch: {dispatch_time / count * 1e9:.1f} ns/change")
+print(f"Speedup:  {probing_time / dispatch_time:.1f}x")
+
+number = 5
+from_json_time = timeit.timeit(
+    lambda: [Keyboard.from_json(doc, validate="off") for doc in keyboard_jsons],
+    number=number,
+)
+print(f"from_json: {from_json_time / number * 1e3:.2f} ms")
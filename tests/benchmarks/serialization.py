@@ -0,0 +1,59 @@
+# benchmarks Keyboard.dumps against to_json followed by json.dumps
+# python3 serialization.py [<path_to_inputs_dir>]
+
+import os
+import sys
+import json
+import timeit
+from damsenviet.kle import Keyboard, json_dump_options
+
+inputs_dir = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs")
+)
+keyboards = list()
+for file_name in sorted(os.listdir(inputs_dir)):
+    if not file_name.endswith(".json"):
+        continue
+    with open(os.path.join(inputs_dir, file_name)) as input_file:
+        keyboards.append(Keyboard.from_json(json.load(input_file)))
+
+number = 3
+repeat = 7
+two_pass_time = min(
+    timeit.repeat(
+        lambda: [
+            json.dumps(keyboard.to_json(), **json_dump_options)
+            for keyboard in keyboards
+        ],
+        number=number,
+        repeat=repeat,
+    )
+)
+to_json_time = min(
+    timeit.repeat(
+        lambda: [keyboard.to_json() for keyboard in keyboards],
+        number=number,
+        repeat=repeat,
+    )
+)
+dumps_time = min(
+    timeit.repeat(
+        lambda: [keyboard.dumps() for keyboard in keyboards],
+        number=number,
+        repeat=repeat,
+    )
+)
+minified_time = min(
+    timeit.repeat(
+        lambda: [keyboard.dumps(minified=True) for keyboard in keyboards],
+        number=number,
+        repeat=repeat,
+    )
+)
+print(f"to_json + json.dumps: {two_pass_time / number * 1e3:.2f} ms")
+print(f"  of which to_json:   {to_json_time / number * 1e3:.2f} ms")
+print(f"dumps:                {dumps_time / number * 1e3:.2f} ms")
+print(f"dumps minified:       {minified_time / number * 1e3:.2f} ms")
+print(f"Speedup:              {two_pass_time / dumps_time:.2f}x")
@@ -0,0 +1,89 @@
+# benchmarks point, rectangle and nearest queries of a SpatialIndex against
+# scanning every key, on a large generated layout
+# python3 spatial.py [<path_to_input_file>] [<copies>]
+
+import os
+import sys
+import json
+import math
+import random
+import timeit
+from copy import deepcopy
+from damsenviet.kle import Keyboard
+
+input_file_path = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs", "ergodox.json")
+)
+copies = int(sys.argv[2]) if len(sys.argv) >= 3 else 50
+with open(input_file_path) as input_file:
+    layout = Keyboard.from_json(json.load(input_file))
+
+# stack copies of the layout vertically
+keyboard = Keyboard()
+height = max(key.y + key.height for key in layout.keys)
+for i in range(copies):
+    for key in layout.keys:
+        key = deepcopy(key)
+        key.y += i * height
+        key.rotation_y += i * height
+        keyboard.keys.append(key)
+geometry = keyboard.geometry()
+min_x, min_y, max_x, max_y = geometry.extent
+generator = random.Random(0)
+points = [
+    (generator.uniform(min_x, max_x), generator.uniform(min_y, max_y))
+    for _ in range(1000)
+]
+
+
+def scan(x, y):
+    # unrotates the point into each key's frame, by hand
+    found = list()
+    for key in keyboard.keys:
+        angle = math.radians(-key.rotation_angle)
+        rel_x = x - key.rotation_x
+        rel_y = y - key.rotation_y
+        key_x = key.rotation_x + rel_x * math.cos(angle) - rel_y * math.sin(angle)
+        key_y = key.rotation_y + rel_y * math.cos(angle) + rel_x * math.sin(angle)
+        if (
+            key.x <= key_x <= key.x + key.width and key.y <= key_y <= key.y + key.height
+        ) or (
+            key.x + key.x2 <= key_x <= key.x + key.x2 + key.width2
+            and key.y + key.y2 <= key_y <= key.y + key.y2 + key.height2
+        ):
+            found.append(key)
+    return found
+
+
+def best(function, number):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+index = keyboard.spatial_index()
+build_time = best(lambda: keyboard.spatial_index(), 3)
+scan_time = best(lambda: [scan(x, y) for x, y in points[:20]], 1) / 20
+at_time = best(lambda: [index.at(x, y) for x, y in points], 3) / len(points)
+rectangle_time = best(
+    lambda: [index.intersecting(x, y, x + 2, y + 2) for x, y in points], 3
+) / len(points)
+nearest_time = best(lambda: [index.nearest(x, y, count=4) for x, y in points], 3) / len(
+    points
+)
+key = keyboard.keys[len(keyboard.keys) // 2]
+
+
+def move():
+    key.x += 0.25
+    index.at(key.x, key.y)
+
+
+move_time = best(move, 1000)
+print(f"Keys: {len(keyboard.keys)}")
+print(f"build: {build_time * 1e3:.2f} ms")
+print(f"scan for a point: {scan_time * 1e6:.1f} us")
+print(f"at: {at_time * 1e6:.1f} us ({scan_time / at_time:.0f}x)")
+print(f"intersecting 2x2: {rectangle_time * 1e6:.1f} us")
+print(f"nearest 4: {nearest_time * 1e6:.1f} us")
+print(f"move a key + at: {move_time * 1e6:.1f} us")
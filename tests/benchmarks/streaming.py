@@ -0,0 +1,36 @@
+# compares peak memory of json.load + from_json against the streaming iter_keys
+# python3 streaming.py [<rows>]
+
+import os
+import sys
+import json
+import tempfile
+import tracemalloc
+import damsenviet.kle as kle
+
+rows = int(sys.argv[1]) if len(sys.argv) >= 2 else 5000
+row = ["Esc", {"x": 1}, "F1", "F2", {"c": "#777777", "t": "#ffffff"}, "F3", "F4"]
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    path = os.path.join(tmp_dir, "keyboard.json")
+    with open(path, "w") as fp:
+        json.dump([{"name": "generated"}] + [row] * rows, fp)
+
+    def load_all():
+        with open(path, "rb") as fp:
+            keyboard = kle.Keyboard.from_json(json.load(fp), validate="fast")
+        return len(keyboard.keys)
+
+    def stream():
+        count = 0
+        with open(path, "rb") as fp:
+            for key in kle.Keyboard.iter_keys(fp):
+                count += 1
+        return count
+
+    for name, function in [("from_json", load_all), ("iter_keys", stream)]:
+        tracemalloc.start()
+        count = function()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name}: {count} keys, peak {peak / 1024 / 1024:.2f} MiB")
@@ -0,0 +1,46 @@
+# benchmarks rendering every input layout as SVG, as done for thumbnails
+# python3 svg.py [<repeats>]
+
+import io
+import os
+import sys
+import json
+import timeit
+from damsenviet.kle import Keyboard, render_svg
+
+repeats = int(sys.argv[1]) if len(sys.argv) >= 2 else 20
+inputs_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "inputs"))
+keyboards = list()
+for file_name in sorted(os.listdir(inputs_dir)):
+    if not file_name.endswith(".json"):
+        continue
+    with open(os.path.join(inputs_dir, file_name)) as input_file:
+        keyboards.append(Keyboard.from_json(json.load(input_file)))
+
+
+def render():
+    for keyboard in keyboards:
+        render_svg(keyboard, io.StringIO())
+
+
+def render_binary():
+    for keyboard in keyboards:
+        render_svg(keyboard, io.BytesIO())
+
+
+def best(function, number):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+
+key_count = sum(len(keyboard.keys) for keyboard in keyboards)
+text_time = best(render, repeats)
+binary_time = best(render_binary, repeats)
+print(f"Layouts: {len(keyboards)}, keys: {key_count}")
+print(
+    f"render_svg text: {text_time / len(keyboards) * 1e3:.2f} ms per layout, "
+    f"{text_time / key_count * 1e6:.1f} us per key"
+)
+print(
+    f"render_svg binary: {binary_time / len(keyboards) * 1e3:.2f} ms per layout, "
+    f"{binary_time / key_count * 1e6:.1f} us per key"
+)
@@ -0,0 +1,42 @@
+# benchmarks the compiled schema check against the reference jsonschema validator
+# python3 validation.py [<path_to_inputs_dir>]
+
+import os
+import sys
+import json
+import timeit
+from damsenviet.kle.validation import (
+    _get_compiled_check,
+    _get_validator,
+)
+
+inputs_dir = os.path.abspath(
+    sys.argv[1]
+    if len(sys.argv) >= 2
+    else os.path.join(os.path.dirname(__file__), "..", "inputs")
+)
+keyboard_jsons = list()
+for file_name in sorted(os.listdir(inputs_dir)):
+    if not file_name.endswith(".json"):
+        continue
+    with open(os.path.join(inputs_dir, file_name)) as input_file:
+        keyboard_jsons.append(json.load(input_file))
+
+validator = _get_validator()
+check = _get_compiled_check()
+if check is None:
+    print("Schemas use keywords the compiler does not support.")
+    exit(1)
+
+number = 5
+reference_time = timeit.timeit(
+    lambda: [validator.validate(instance=doc) for doc in keyboard_jsons],
+    number=number,
+)
+compiled_time = timeit.timeit(
+    lambda: [check(doc) for doc in keyboard_jsons],
+    number=number,
+)
+print(f"Reference validator: {reference_time / number * 1e3:.2f} ms")
+print(f"Compiled check:      {compiled_time / number * 1e3:.2f} ms")
+print(f"Speedup:             {reference_time / compiled_time:.1f}x")
@@ -0,0 +1,60 @@
+import os
+import json
+import pytest
+from damsenviet.kle import Keyboard
+
+inputs_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "inputs"))
+file_names = sorted(
+    file_name for file_name in os.listdir(inputs_dir) if file_name.endswith(".json")
+)
+
+
+def load_input_json(file_name: str):
+    with open(os.path.join(inputs_dir, file_name), "r") as input_file:
+        return json.load(input_file)
+
+
+def load_input(file_name: str) -> Keyboard:
+    return Keyboard.from_json(load_input_json(file_name), validate="off")
+
+
+@pytest.fixture(params=file_names)
+def file_name(request) -> str:
+    """Name of each input layout, parametrizing the test."""
+    return request.param
+
+
+@pytest.fixture
+def input_path(file_name: str) -> str:
+    """Path of each input layout."""
+    return os.path.join(inputs_dir, file_name)
+
+
+@pytest.fixture
+def keyboard_json(file_name: str):
+    """KLE JSON of each input layout."""
+    return load_input_json(file_name)
+
+
+@pytest.fixture
+def keyboard(file_name: str) -> Keyboard:
+    """Keyboard of each input layout, loaded without validation."""
+    return load_input(file_name)
+
+
+@pytest.fixture
+def load():
+    """Loads an input layout by name, without validation."""
+    return load_input
+
+
+@pytest.fixture
+def load_json():
+    """Loads the KLE JSON of an input layout by name."""
+    return load_input_json
+
+
+@pytest.fixture(scope="session")
+def input_paths():
+    """Paths of every input layout, sorted by name."""
+    return [os.path.join(inputs_dir, file_name) for file_name in file_names]
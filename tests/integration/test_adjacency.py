@@ -0,0 +1,136 @@
+from damsenviet.kle import (
+    Keyboard,
+    KeyGraph,
+)
+from damsenviet.kle.geometry import _rectangles_distance
+
+
+def find(keyboard: Keyboard, text: str) -> int:
+    for i, key in enumerate(keyboard.keys):
+        if key.labels[0].text == text:
+            return i
+    raise ValueError(text)
+
+
+def flattened(corners):
+    return [value for corner in corners for value in corner]
+
+
+def scanned_neighbours(keyboard, gap):
+    geometry = keyboard.geometry(vectorized=False)
+    shapes = [
+        (
+            geometry.bounds(i),
+            [
+                flattened(geometry.corners(i)),
+                flattened(geometry.secondary_corners(i)),
+            ],
+        )
+        for i in range(len(geometry))
+    ]
+    pairs = set()
+    for i, (bounds, rectangles) in enumerate(shapes):
+        for j in range(i + 1, len(shapes)):
+            other_bounds, other_rectangles = shapes[j]
+            if (
+                bounds[0] - gap > other_bounds[2]
+                or other_bounds[0] - gap > bounds[2]
+                or bounds[1] - gap > other_bounds[3]
+                or other_bounds[1] - gap > bounds[3]
+            ):
+                continue
+            if (
+                min(
+                    _rectangles_distance(rectangle, other_rectangle)
+                    for rectangle in rectangles
+                    for other_rectangle in other_rectangles
+                )
+                <= gap + 1e-9
+            ):
+                pairs.add((i, j))
+    return pairs
+
+
+def test_graph(keyboard: Keyboard):
+    graph = keyboard.key_graph()
+    edges = graph.edges()
+    assert edges == sorted(scanned_neighbours(keyboard, 0.25))
+    for i, j in edges:
+        assert j in graph.neighbours(i) and i in graph.neighbours(j)
+    assert sorted(i for cluster in graph.clusters() for i in cluster) == list(
+        range(len(keyboard.keys))
+    )
+    positions = graph.matrix()
+    assert len(positions) == len(keyboard.keys)
+    assigned = [position for position in positions if position is not None]
+    assert len(set(assigned)) == len(assigned)
+    for key, position in zip(keyboard.keys, positions):
+        assert (position is None) == key.is_decal
+    # rows are numbered from the top, columns from the left
+    rows = sorted({row for row, _ in assigned})
+    assert rows == list(range(len(rows)))
+    for row in rows:
+        columns = sorted(column for other_row, column in assigned if other_row == row)
+        assert columns == list(range(len(columns)))
+
+
+def test_rows(load):
+    keyboard = load("ansi-104.json")
+    graph = keyboard.key_graph()
+    positions = graph.matrix()
+    counts = [0] * 6
+    for row, _ in filter(None, positions):
+        counts[row] += 1
+    assert counts == [16, 21, 21, 16, 17, 13]
+    assert positions[find(keyboard, "Esc")] == (0, 0)
+    assert positions[find(keyboard, "Q")] == (2, 1)
+    assert positions[find(keyboard, "W")] == (2, 2)
+    # the numpad is in the rows of the main block
+    assert positions[find(keyboard, "Num Lock")][0] == 1
+    names = [
+        keyboard.keys[j].labels[0].text for j in graph.neighbours(find(keyboard, "Q"))
+    ]
+    assert sorted(names) == sorted(["!", "@", "Tab", "W", "Caps Lock", "A", "S"])
+    # diagonal keys a quarter unit apart are no longer neighbours
+    graph = keyboard.key_graph(gap=0)
+    names = [
+        keyboard.keys[j].labels[0].text for j in graph.neighbours(find(keyboard, "Q"))
+    ]
+    assert "S" not in names and "A" in names
+
+
+def test_staggered_columns(load):
+    keyboard = load("atreus.json")
+    graph = keyboard.key_graph()
+    assert len(graph.clusters()) == 2
+    positions = graph.matrix()
+    # halves rotated apart share rows despite the column stagger
+    assert positions[find(keyboard, "Q")][0] == positions[find(keyboard, "P")][0]
+    assert positions[find(keyboard, "Q")][0] == positions[find(keyboard, "T")][0]
+    assert positions[find(keyboard, "A")][0] == positions[find(keyboard, "D")][0]
+    assert positions[find(keyboard, "Q")][0] + 1 == positions[find(keyboard, "A")][0]
+    assert positions[find(keyboard, "Q")][1] < positions[find(keyboard, "W")][1]
+    assert positions[find(keyboard, "W")][1] < positions[find(keyboard, "P")][1]
+
+
+def test_rotated_clusters(load):
+    keyboard = load("ergodox.json")
+    graph = KeyGraph(keyboard.keys)
+    clusters = graph.clusters()
+    assert len(clusters) == 3
+    assert all(keyboard.keys[i].rotation_angle == 30 for i in clusters[1])
+    positions = graph.matrix()
+    # split halves share rows, rows don't branch through the tall inner keys
+    assert positions[find(keyboard, "Q")][0] == positions[find(keyboard, "P")][0]
+    assert positions[find(keyboard, "A")][0] == positions[find(keyboard, "G")][0]
+    assert positions[find(keyboard, "Z")][0] == positions[find(keyboard, "B")][0]
+    assert positions[find(keyboard, "G")][0] != positions[find(keyboard, "B")][0]
+
+
+def test_decals():
+    keyboard = Keyboard.from_json([["A", {"d": True}, "B", "C"]], validate="off")
+    graph = keyboard.key_graph()
+    assert graph.matrix() == [(0, 0), None, (0, 1)]
+    assert graph.edges() == [(0, 1), (1, 2)]
+    assert len(Keyboard().key_graph()) == 0
+    assert Keyboard().key_graph().matrix() == []
@@ -0,0 +1,79 @@
+from copy import deepcopy
+from damsenviet.kle import Keyboard
+from damsenviet.kle.playback import _label_map
+from damsenviet.kle.keyboard import (
+    _disallowed_alignnment_for_labels,
+    _alignment_by_mask,
+    _aligned_label_index,
+    _aligned_key_properties,
+)
+
+
+def reference_alignment(indexes):
+    alignments = [7, 5, 6, 4, 3, 1, 2, 0]
+    for i in indexes:
+        for alignment in deepcopy(alignments):
+            if alignment in _disallowed_alignnment_for_labels[i]:
+                alignments.remove(alignment)
+    return alignments[0]
+
+
+def reference_reduced_text_sizes(text_sizes):
+    text_sizes = deepcopy(text_sizes)
+    while len(text_sizes) > 0 and text_sizes[-1] == 0:
+        text_sizes.pop()
+    return text_sizes
+
+
+def reference_aligned_key_properties(key, current_labels_size):
+    indexes = [i for i, label in enumerate(key.labels) if label.text != ""]
+    alignment = reference_alignment(indexes)
+    aligned_text_labels = ["" for i in range(12)]
+    aligned_text_color = ["" for i in range(12)]
+    aligned_text_size = [0 for i in range(12)]
+    for i, label in enumerate(key.labels):
+        if label.text == "" or i not in _label_map[alignment]:
+            continue
+        ndx = _label_map[alignment].index(i)
+        aligned_text_labels[ndx] = label.text
+        if label.color != key.default_text_color:
+            aligned_text_color[ndx] = label.color
+        if label.size != key.default_text_size:
+            aligned_text_size[ndx] = label.size
+    for i in range(len(reference_reduced_text_sizes(aligned_text_size))):
+        if aligned_text_labels[i] == "":
+            aligned_text_size[i] = current_labels_size[i]
+        if aligned_text_size == key.default_text_size:
+            aligned_text_size[i] = 0
+    return (
+        alignment,
+        aligned_text_labels,
+        aligned_text_color,
+        aligned_text_size,
+    )
+
+
+def test_alignment_by_mask():
+    # every occupancy mask
+    for mask in range(1 << 12):
+        indexes = [i for i in range(12) if mask & (1 << i)]
+        assert _alignment_by_mask[mask] == reference_alignment(indexes)
+
+
+def test_aligned_label_index():
+    for alignment, label_map in enumerate(_label_map):
+        for i in range(12):
+            if i in label_map:
+                assert _aligned_label_index[alignment][i] == label_map.index(i)
+            else:
+                assert _aligned_label_index[alignment][i] == -1
+
+
+def test_aligned_key_properties(keyboard_json):
+    keyboard = Keyboard.from_json(keyboard_json)
+    for current_labels_size in ([0] * 12, [0] + [5] * 11, list(range(12))):
+        for key in keyboard.keys:
+            assert _aligned_key_properties(
+                key,
+                current_labels_size,
+            ) == reference_aligned_key_properties(deepcopy(key), current_labels_size)
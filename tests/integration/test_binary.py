@@ -0,0 +1,160 @@
+import copy
+import pytest
+from damsenviet.kle import (
+    Keyboard,
+    Key,
+    KeyboardBuffer,
+)
+
+
+def typed(value):
+    # distinguishes ints from floats, which compare equal
+    if type(value) in (tuple, list):
+        return tuple(typed(item) for item in value)
+    return (type(value), value)
+
+
+def assert_same_keys(keys, other_keys):
+    assert len(keys) == len(other_keys)
+    for key, other_key in zip(keys, other_keys):
+        state = key.__getstate__()
+        other_state = other_key.__getstate__()
+        assert typed(state[2:18]) == typed(other_state[2:18])
+        assert state[0] == other_state[0]
+        assert state[1] == other_state[1]
+        assert state[18] == other_state[18]
+        assert typed(state[19]) == typed(other_state[19])
+
+
+def test_round_trip(keyboard: Keyboard):
+    restored = Keyboard.from_bytes(keyboard.to_bytes())
+    assert_same_keys(keyboard.keys, restored.keys)
+    assert restored.to_json() == keyboard.to_json()
+    assert restored.dumps() == keyboard.dumps()
+
+
+def test_buffer(keyboard: Keyboard):
+    with KeyboardBuffer(keyboard.to_bytes()) as buffer:
+        assert len(buffer) == len(keyboard.keys)
+        if len(buffer) > 0:
+            key = buffer[-1]
+            # materialized once
+            assert buffer[-1] is key
+            assert_same_keys([key], keyboard.keys[-1:])
+        assert_same_keys(list(buffer), keyboard.keys)
+        restored = buffer.to_keyboard()
+    # materialized keys are copied
+    assert all(
+        restored_key is not key for restored_key, key in zip(restored.keys, buffer)
+    )
+    assert restored.dumps() == keyboard.dumps()
+
+
+def test_buffer_open(tmp_path):
+    keyboard = Keyboard.from_json(
+        [{"name": "mapped"}, ["A", {"a": 7, "f": 4}, "B\n\n\nC"]],
+        validate="off",
+    )
+    path = tmp_path / "keyboard.kleb"
+    path.write_bytes(keyboard.to_bytes())
+    with KeyboardBuffer.open(path) as buffer:
+        key = buffer[1]
+        assert buffer.metadata.name == "mapped"
+        restored = buffer.to_keyboard()
+    # materialized keys outlive the buffer
+    assert_same_keys([key], keyboard.keys[1:2])
+    assert restored.to_json() == keyboard.to_json()
+
+
+def test_edits_after_decoding():
+    keyboard = Keyboard.from_bytes(
+        Keyboard.from_json([["A", "B"], ["C"]], validate="off").to_bytes()
+    )
+    keyboard.dumps()
+    keyboard.keys[1].labels[0].text = "D"
+    keyboard.keys[2].switch.brand = "cherry"
+    keyboard.keys.append(Key())
+    # copies start without cached rows
+    assert keyboard.dumps() == copy.deepcopy(keyboard).dumps()
+
+
+def test_empty():
+    keyboard = Keyboard()
+    restored = Keyboard.from_bytes(keyboard.to_bytes())
+    assert restored.to_json() == []
+    assert len(KeyboardBuffer(keyboard.to_bytes())) == 0
+
+
+def test_invalid():
+    data = Keyboard.from_json([["A"]], validate="off").to_bytes()
+    with pytest.raises(ValueError):
+        Keyboard.from_bytes(data[:8])
+    with pytest.raises(ValueError):
+        Keyboard.from_bytes(b"JSON" + data[4:])
+    with pytest.raises(ValueError):
+        Keyboard.from_bytes(data[:4] + b"\xff\xff" + data[6:])
+    with pytest.raises(ValueError):
+        Keyboard.from_bytes(data[:-1])
+    with pytest.raises(IndexError):
+        KeyboardBuffer(data)[1]
+
+
+def test_corrupt_body():
+    keyboard = Keyboard.from_json(
+        [{"name": "corrupt"}, [{"a": 0, "sm": "cherry"}, "A\nB", {"x": 0.125}, "C"]],
+        validate="off",
+    )
+    data = keyboard.to_bytes()
+    # header of the encoding
+    for i in range(40, len(data)):
+        for value in (0x00, 0x7F, 0xFF):
+            corrupt = data[:i] + bytes((value,)) + data[i + 1 :]
+            try:
+                buffer = KeyboardBuffer(corrupt)
+                buffer.metadata
+                list(buffer)
+                KeyboardBuffer(corrupt).to_keyboard()
+            except ValueError:
+                pass
+
+
+def test_exact_numbers():
+    keys = list()
+    for value in (0.25, -0.0, 1 / 3, 400.0, -1e6, 7, 40000, float("inf")):
+        key = Key()
+        key.x = value
+        key.y = -value
+        key.width = value
+        key.rotation_angle = value
+        key.labels[4].size = value
+        keys.append(key)
+    keyboard = Keyboard()
+    keyboard.keys.extend(keys)
+    data = keyboard.to_bytes()
+    assert_same_keys(Keyboard.from_bytes(data).keys, keys)
+    assert_same_keys(list(KeyboardBuffer(data)), keys)
+
+
+def test_wide():
+    # more strings than 16-bit indexes can reference
+    keyboard = Keyboard()
+    for i in range(70000):
+        key = Key()
+        key.x = i % 100
+        key.y = i // 100
+        key.labels[0].text = str(i)
+        keyboard.keys.append(key)
+    data = keyboard.to_bytes()
+    assert_same_keys(Keyboard.from_bytes(data).keys, keyboard.keys)
+    buffer = KeyboardBuffer(data)
+    assert buffer[-1].labels[0].text == "69999"
+
+
+def test_buffer_open_invalid(tmp_path):
+    path = tmp_path / "junk.kleb"
+    path.write_bytes(b"KLEB" + bytes(range(36)))
+    with pytest.raises(ValueError):
+        KeyboardBuffer.open(path)
+    path.write_bytes(b"\x01" * 40)
+    with pytest.raises(ValueError):
+        KeyboardBuffer.open(path)
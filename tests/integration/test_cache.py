@@ -0,0 +1,207 @@
+import os
+import json
+import pickle
+import pytest
+from damsenviet.kle import (
+    Keyboard,
+    ParseCache,
+    KeyboardCache,
+)
+
+
+def entries(cache: ParseCache, suffix: str = ".kleb"):
+    return sorted(name for name in os.listdir(cache.directory) if name.endswith(suffix))
+
+
+def test_load(input_path: str, keyboard_json, tmp_path):
+    expected = Keyboard.from_json(keyboard_json)
+    cache = ParseCache(tmp_path / "cache")
+    # miss, then hit by path
+    assert cache.load(input_path).dumps() == expected.dumps()
+    assert cache.load(input_path).dumps() == expected.dumps()
+    assert len(entries(cache)) == 1
+    assert len(entries(cache, ".ref")) == 1
+
+
+def test_loads(tmp_path):
+    cache = ParseCache(tmp_path)
+    text = json.dumps([{"name": "cached"}, ["A", {"w": 2}, "B"]])
+    keyboard = cache.loads(text)
+    assert cache.loads(text.encode("utf-8")).to_json() == keyboard.to_json()
+    assert len(entries(cache)) == 1
+    # returned keyboards are independent
+    keyboard.keys[0].labels[0].text = "edited"
+    assert cache.loads(text).keys[0].labels[0].text == "A"
+    cache.loads(text.replace("A", "C"))
+    assert len(entries(cache)) == 2
+    cache.clear()
+    assert entries(cache) == []
+
+
+def test_validation_modes(tmp_path):
+    cache = ParseCache(tmp_path)
+    text = json.dumps([["A"]])
+    cache.loads(text, validate="off")
+    # parsed without validation, not reused for validated requests
+    cache.loads(text, validate="full")
+    assert len(entries(cache)) == 2
+    # validated entries are reused for less strict requests
+    cache.clear()
+    cache.loads(text, validate="full")
+    cache.loads(text, validate="fast")
+    cache.loads(text, validate="off")
+    assert len(entries(cache)) == 1
+    with pytest.raises(ValueError):
+        cache.loads(text, validate="some")
+    # invalid inputs are not cached
+    with pytest.raises(Exception):
+        cache.loads(json.dumps([[{"a": "invalid"}]]))
+    assert len(entries(cache)) == 1
+
+
+def test_modified_file(tmp_path):
+    cache = ParseCache(tmp_path / "cache")
+    path = tmp_path / "keyboard.json"
+    path.write_text(json.dumps([["A"]]))
+    assert cache.load(path).to_json() == [["A"]]
+    path.write_text(json.dumps([["B", "C"]]))
+    assert cache.load(path).to_json() == [["B", "C"]]
+    # same content under another path shares the entry
+    other_path = tmp_path / "other.json"
+    other_path.write_text(json.dumps([["B", "C"]]))
+    assert cache.load(other_path).to_json() == [["B", "C"]]
+    assert len(entries(cache)) == 2
+
+
+def test_eviction(tmp_path):
+    texts = [json.dumps([[str(i)] * 8]) for i in range(4)]
+    cache = ParseCache(tmp_path)
+    cache.loads(texts[0])
+    entry_size = os.path.getsize(os.path.join(tmp_path, entries(cache)[0]))
+    cache.clear()
+    cache = ParseCache(tmp_path, max_bytes=entry_size * 2)
+    cache.loads(texts[0])
+    (first,) = entries(cache)
+    cache.loads(texts[1])
+    (second,) = set(entries(cache)) - {first}
+    for name in (first, second):
+        os.utime(os.path.join(tmp_path, name), ns=(0, 0))
+    # used again, most recent
+    cache.loads(texts[0])
+    cache.loads(texts[2])
+    assert len(entries(cache)) == 2
+    assert first in entries(cache)
+    assert second not in entries(cache)
+
+
+def test_eviction_scans(tmp_path, monkeypatch):
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or scandir(path))
+    cache = ParseCache(tmp_path)
+    for i in range(20):
+        cache.loads(json.dumps([[str(i)]]))
+    # only scanned on the first write while under the limit
+    assert len(scans) == 1
+    cache = ParseCache(tmp_path, max_bytes=0)
+    cache.loads(json.dumps([["A"]]))
+    cache.loads(json.dumps([["B"]]))
+    assert len(scans) == 3
+    assert entries(cache) == []
+
+
+def test_damaged_entries(tmp_path):
+    cache = ParseCache(tmp_path)
+    text = json.dumps([["A"]])
+    cache.loads(text)
+    entry_path = os.path.join(tmp_path, entries(cache)[0])
+    with open(entry_path, "wb") as fp:
+        fp.write(b"damaged")
+    assert cache.loads(text).to_json() == [["A"]]
+    with open(entry_path, "rb") as fp:
+        assert fp.read().startswith(b"KLEB")
+
+
+def test_load_many(input_paths, tmp_path):
+    cache = ParseCache(tmp_path)
+    paths = input_paths[:3]
+    first = list(Keyboard.load_many(paths, executor="thread", cache=cache))
+    second = list(Keyboard.load_many(paths, executor="thread", cache=cache))
+    for (_, keyboard), (_, cached) in zip(first, second):
+        assert cached.dumps() == keyboard.dumps()
+    assert len(entries(cache, ".ref")) == 3
+    restored = pickle.loads(pickle.dumps(cache))
+    assert restored.directory == cache.directory
+    assert restored.max_bytes == cache.max_bytes
+
+
+def test_keyboard_cache(input_path: str):
+    with open(input_path, "rb") as input_file:
+        text = input_file.read()
+    keyboard_json = json.loads(text)
+    expected = Keyboard.from_json(keyboard_json).dumps()
+    cache = KeyboardCache()
+    assert cache.get(text).dumps() == expected
+    # parsed documents and reformatted text share the canonical entry
+    assert cache.get(keyboard_json).dumps() == expected
+    assert cache.get(json.dumps(keyboard_json, indent=4)).dumps() == expected
+    assert cache.get(text).dumps() == expected
+    assert (cache.hits, cache.misses, len(cache)) == (3, 1, 1)
+
+
+def test_keyboard_cache_copies():
+    cache = KeyboardCache()
+    keyboard = cache.get('[["A", "B"]]')
+    keyboard.keys[0].labels[0].text = "edited"
+    keyboard.keys.pop()
+    assert cache.get('[["A", "B"]]').to_json() == [["A", "B"]]
+    other = cache.get([["A", "B"]])
+    assert other is not cache.get([["A", "B"]])
+
+
+def test_keyboard_cache_keys():
+    cache = KeyboardCache()
+    cache.get([[{"a": 4, "w": 1}, "A"]])
+    cache.get([[{"w": 1, "a": 4}, "A"]])
+    assert (cache.hits, cache.misses) == (1, 1)
+    # ints and floats are kept apart, they serialize differently
+    cache.get([[{"a": 4, "w": 1.0}, "A"]])
+    assert (cache.hits, cache.misses) == (1, 2)
+    # validated entries are reused for less strict requests
+    cache.get([["A"]], validate="off")
+    cache.get([["A"]], validate="full")
+    cache.get([["A"]], validate="fast")
+    assert (cache.hits, cache.misses) == (2, 4)
+    with pytest.raises(ValueError):
+        cache.get([["A"]], validate="some")
+    # invalid inputs are not cached
+    with pytest.raises(Exception):
+        cache.get([[{"a": "invalid"}]])
+    assert len(cache) == 4
+
+
+def test_keyboard_cache_eviction():
+    cache = KeyboardCache(max_items=2)
+    for text in ('[["A"]]', '[["B"]]', '[["A"]]', '[["C"]]'):
+        cache.get(text)
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 3, 1)
+    # least recently used was B
+    cache.get('[["A"]]')
+    cache.get('[["B"]]')
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 4, 2)
+    size = cache.size
+    cache.clear()
+    assert len(cache) == 0 and cache.size == 0
+    cache = KeyboardCache(max_bytes=size)
+    cache.get('[["C"]]')
+    cache.get('[["B"]]')
+    cache.get('[["D"]]')
+    assert cache.size <= size
+    assert (len(cache), cache.evictions) == (2, 1)
+    # too large to be kept
+    cache.get('[["A", "B", "C", "D"]]')
+    assert (len(cache), cache.evictions) == (2, 1)
+    assert len(KeyboardCache(max_bytes=0)) == 0
+    cache = KeyboardCache(max_items=0)
+    cache.get('[["A"]]')
+    assert len(cache) == 0
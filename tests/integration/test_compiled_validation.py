@@ -0,0 +1,68 @@
+import pytest
+from copy import deepcopy
+from jsonschema.exceptions import ValidationError
+from damsenviet.kle.validation import (
+    _get_compiled_check,
+    _get_validator,
+    _validate,
+)
+
+replacements = ["", 1, 1.5, -1, 13, True, None, [1], {}]
+
+
+def mutations(keyboard_json):
+    """Generates invalid and borderline variants of the first rows of a KLE JSON.
+
+    Variants are produced by mutating a single copy in place, each variant is
+    only valid until the next one is requested.
+    """
+    # bounded to keep the suite fast on large layouts
+    mutation = deepcopy(
+        [row[:4] if type(row) is list else row for row in keyboard_json[:3]]
+    )
+    yield dict()
+    yield [mutation]
+    for r, row in enumerate(mutation):
+        for replacement in replacements:
+            mutation[r] = replacement
+            yield mutation
+        mutation[r] = row
+        if type(row) is dict:
+            items = [row]
+        else:
+            items = list(row)
+            for k, item in enumerate(items):
+                for replacement in replacements:
+                    row[k] = replacement
+                    yield mutation
+                row[k] = item
+        for item in items:
+            if type(item) is not dict:
+                continue
+            for name in list(item.keys())[:4] + ["unknown"]:
+                original = item.get(name, None)
+                for replacement in replacements:
+                    item[name] = replacement
+                    yield mutation
+                if name in item and original is None:
+                    del item[name]
+                else:
+                    item[name] = original
+
+
+def test_compiled_validation(keyboard_json):
+    check = _get_compiled_check()
+    validator = _get_validator()
+    assert check is not None
+    assert check(keyboard_json) and validator.is_valid(keyboard_json)
+    for mutation in mutations(keyboard_json):
+        is_valid = validator.is_valid(mutation)
+        assert check(mutation) == is_valid
+        if is_valid:
+            continue
+        # errors are reported exactly as the reference validator does
+        with pytest.raises(ValidationError) as error:
+            _validate(mutation, "full")
+        expected = next(validator.iter_errors(mutation))
+        assert error.value.message == expected.message
+        assert list(error.value.path) == list(expected.path)
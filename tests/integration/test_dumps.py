@@ -0,0 +1,98 @@
+import io
+import gzip
+import lzma
+import json
+import asyncio
+import pytest
+from damsenviet.kle import (
+    Keyboard,
+    json_dump_options,
+)
+
+
+def test_dumps(keyboard_json):
+    keyboard = Keyboard.from_json(keyboard_json)
+    assert json.dumps(keyboard_json, **json_dump_options) == keyboard.dumps()
+    assert json.dumps(keyboard_json, separators=(",", ":")) == keyboard.dumps(
+        minified=True
+    )
+
+
+@pytest.mark.parametrize("minified", [False, True])
+def test_dump(keyboard_json, minified: bool):
+    keyboard = Keyboard.from_json(keyboard_json)
+    output_file = io.StringIO()
+    keyboard.dump(output_file, minified=minified)
+    assert output_file.getvalue() == keyboard.dumps(minified=minified)
+
+
+def test_dumps_values():
+    keyboard = Keyboard.from_json(
+        [
+            {"name": 'é"\\\n', "background": {"name": "b"}, "pcb": True},
+            [{"fa": [1, 2.5], "x": 0.25}, "←😀"],
+            [],
+        ]
+    )
+    assert keyboard.dumps() == json.dumps(keyboard.to_json(), **json_dump_options)
+    assert keyboard.dumps(minified=True) == json.dumps(
+        keyboard.to_json(), separators=(",", ":")
+    )
+
+
+def test_dumps_empty():
+    assert Keyboard().dumps() == json.dumps([], **json_dump_options)
+    assert Keyboard().dumps(minified=True) == "[]"
+
+
+@pytest.mark.parametrize("open_file", [open, gzip.open, lzma.open])
+@pytest.mark.parametrize("mode", ["w", "b"])
+def test_dump_files(load, tmp_path, open_file, mode: str):
+    keyboard = load("ansi-104.json")
+    output_path = str(tmp_path / "keyboard.json")
+    with open_file(output_path, "wt" if mode == "w" else "wb") as output_file:
+        keyboard.dump(output_file)
+    with open_file(output_path, "rt") as input_file:
+        assert input_file.read() == keyboard.dumps()
+
+
+def test_dump_bytes():
+    keyboard = Keyboard.from_json([["A"]])
+    output_file = io.BytesIO()
+    keyboard.dump(output_file)
+    assert output_file.getvalue() == keyboard.dumps().encode("utf-8")
+
+
+class AsyncWriter:
+    def __init__(self):
+        self.chunks = list()
+
+    async def write(self, chunk: str):
+        self.chunks.append(chunk)
+
+
+class DrainedWriter:
+    def __init__(self):
+        self.chunks = list()
+        self.drains = 0
+
+    def write(self, chunk: bytes):
+        self.chunks.append(chunk)
+
+    async def drain(self):
+        self.drains += 1
+
+
+def test_dump_async(keyboard_json):
+    keyboard = Keyboard.from_json(keyboard_json)
+
+    writer = AsyncWriter()
+    asyncio.run(keyboard.dump_async(writer))
+    assert "".join(writer.chunks) == keyboard.dumps()
+
+    writer = DrainedWriter()
+    asyncio.run(keyboard.dump_async(writer, binary=True))
+    assert b"".join(writer.chunks) == keyboard.dumps().encode("utf-8")
+    # one write and drain per row, then the closing bracket
+    assert len(writer.chunks) == len(keyboard_json) + 1
+    assert writer.drains == len(writer.chunks)
@@ -0,0 +1,159 @@
+import copy
+import pickle
+import pytest
+from damsenviet.kle import (
+    Keyboard,
+    Metadata,
+    Key,
+    Switch,
+    Label,
+)
+
+
+def test_copies(keyboard: Keyboard, file_name: str, load):
+    fingerprint = keyboard.fingerprint()
+    for other in (
+        load(file_name),
+        copy.deepcopy(keyboard),
+        pickle.loads(pickle.dumps(keyboard)),
+        Keyboard.from_bytes(keyboard.to_bytes()),
+        Keyboard.from_json(keyboard.to_json(), validate="off"),
+    ):
+        assert other.equals(keyboard)
+        assert other.fingerprint() == fingerprint
+        assert len(other.keys) == len(keyboard.keys)
+        assert all(key.equals(k) for key, k in zip(other.keys, keyboard.keys))
+        assert other.metadata.equals(keyboard.metadata)
+
+
+def test_edits(keyboard: Keyboard, file_name: str, load):
+    other = load(file_name)
+    fingerprint = keyboard.fingerprint()
+    if len(keyboard.keys) == 0:
+        return
+    key = keyboard.keys[len(keyboard.keys) // 2]
+    key_fingerprint = key.fingerprint()
+    text = key.labels[0].text
+    key.labels[0].text = text + "edited"
+    assert not keyboard.equals(other)
+    assert key.fingerprint() != key_fingerprint
+    key.labels[0].text = text
+    assert keyboard.equals(other)
+    assert key.fingerprint() == key_fingerprint
+    key.switch.brand = "edited"
+    assert keyboard.fingerprint() != fingerprint
+    key.switch = Switch()
+    key.x += 1
+    assert keyboard.fingerprint() != fingerprint
+    keyboard.keys.remove(key)
+    assert not keyboard.equals(other)
+    keyboard.metadata.name = "edited"
+    assert keyboard.fingerprint() != fingerprint
+
+
+def test_key_order():
+    keyboard = Keyboard.from_json([["A", "B"], ["C"]], validate="off")
+    other = Keyboard.from_json([["A", "B"], ["C"]], validate="off")
+    other.keys.reverse()
+    # compared in KLE order
+    assert keyboard.equals(other)
+    other.keys[0].y += 2
+    assert not keyboard.equals(other)
+
+
+def test_fingerprint_collisions(monkeypatch):
+    keyboard = Keyboard.from_json([["A", "B"]], validate="off")
+    other = Keyboard.from_json([["A", "C"]], validate="off")
+    monkeypatch.setattr(Keyboard, "fingerprint", lambda self: 0)
+    # equal fingerprints are confirmed
+    assert not keyboard.equals(other)
+    other.keys[1].labels[0].text = "B"
+    assert keyboard.equals(other)
+
+
+def test_removed_keys():
+    keyboard = Keyboard.from_json([["A", "B"]], validate="off")
+    key = keyboard.keys[0]
+    fingerprint = key.fingerprint()
+    keyboard.keys.remove(key)
+    # no longer notified of changes
+    key.labels[0].text = "edited"
+    assert key.fingerprint() != fingerprint
+    key.labels[0].text = "A"
+    assert key.fingerprint() == fingerprint
+
+
+def test_key_equality():
+    key = Key()
+    other = Key()
+    assert key.equals(other)
+    assert key.fingerprint() == other.fingerprint()
+    # materialized labels are the same as unpopulated labels
+    assert key.labels[5].text == ""
+    assert key.equals(other)
+    key.labels[5].size = 4
+    assert not key.equals(other)
+    key.labels[5].size = 3
+    # ints and floats compare equal
+    key.x = 0
+    key.width = 1
+    key.rotation_angle = -0.0
+    assert key.equals(other)
+    assert key.fingerprint() == other.fingerprint()
+    key.x = 0.5
+    assert not key.equals(other)
+    assert not key.equals("key")
+    assert len({k.fingerprint() for k in (key, other, copy.deepcopy(other))}) == 2
+
+
+def test_key_list_remove():
+    keys = Keyboard().keys
+    key = Key()
+    other = Key()
+    keys.extend([key, other])
+    keys.remove(other)
+    assert keys == [key]
+    # equal keys are still different keys
+    with pytest.raises(ValueError):
+        keys.remove(Key())
+    keys.remove(key)
+    assert len(keys) == 0
+
+
+def test_identity():
+    keyboard = Keyboard.from_json([["A"]], validate="off")
+    key = keyboard.keys[0]
+    other = copy.deepcopy(key)
+    # mutable, compared and hashed by identity
+    assert key.equals(other) and key != other
+    assert len({key, other}) == 2
+    assert keyboard != copy.deepcopy(keyboard)
+    assert keyboard.metadata != Metadata()
+    assert key.labels[0] != other.labels[0]
+    assert {keyboard: 1}[keyboard] == 1
+
+
+def test_other_equality():
+    label = Label()
+    other_label = Label()
+    assert label.equals(other_label)
+    other_label.color = "#ffffff"
+    assert not label.equals(other_label)
+    switch = Switch()
+    assert switch.equals(Switch())
+    switch.mount = "cherry"
+    assert not switch.equals(Switch())
+    metadata = Metadata()
+    assert metadata.equals(Metadata())
+    metadata.background.name = "carbon"
+    assert not metadata.equals(Metadata())
+    assert not metadata.equals(None)
+    assert metadata.fingerprint() != Metadata().fingerprint()
+
+
+def test_stable_fingerprints():
+    # fingerprints are meant to be persisted
+    assert Key().fingerprint() == 77134211561816203955999753106762924755
+    assert Label().fingerprint() == 293856708625802507456865820486471458089
+    assert Metadata().fingerprint() == 97259395033871142168060742543880858418
+    assert Keyboard().fingerprint() == 55338928790215398209067911044626234863
@@ -0,0 +1,133 @@
+import copy
+import pickle
+import threading
+import pytest
+from damsenviet.kle import (
+    Keyboard,
+    KeyboardCache,
+    Key,
+    Switch,
+    Background,
+)
+
+
+def test_freeze(keyboard: Keyboard):
+    frozen = keyboard.freeze()
+    assert frozen.is_frozen and not keyboard.is_frozen
+    assert frozen.equals(keyboard) and frozen != keyboard
+    assert frozen == keyboard.freeze()
+    assert hash(frozen) == hash(keyboard.freeze())
+    assert frozen.dumps() == keyboard.dumps()
+    assert frozen.freeze() is frozen
+    assert copy.deepcopy(frozen) is frozen
+    restored = pickle.loads(pickle.dumps(frozen))
+    assert restored.is_frozen
+    assert restored == frozen
+    thawed = frozen.thaw()
+    assert not thawed.is_frozen
+    assert thawed.equals(keyboard)
+    assert thawed.dumps() == keyboard.dumps()
+
+
+def test_frozen_mutations():
+    keyboard = Keyboard.from_json(
+        [{"name": "frozen"}, ["A", {"sm": "cherry"}, "B"]], validate="off"
+    )
+    frozen = keyboard.freeze()
+    key = frozen.keys[0]
+    with pytest.raises(AttributeError):
+        key.x = 1
+    with pytest.raises(AttributeError):
+        key.labels[0].text = "edited"
+    with pytest.raises(AttributeError):
+        key.switch = Switch()
+    with pytest.raises(AttributeError):
+        frozen.keys[1].switch.mount = "alps"
+    with pytest.raises(TypeError):
+        key.labels[0] = key.labels[1]
+    # missing labels are not materialized
+    label = key.labels[7]
+    assert label.text == ""
+    with pytest.raises(AttributeError):
+        label.text = "edited"
+    with pytest.raises(AttributeError):
+        frozen.metadata.name = "edited"
+    with pytest.raises(AttributeError):
+        frozen.metadata.background = Background()
+    with pytest.raises(AttributeError):
+        frozen.keys = []
+    with pytest.raises(AttributeError):
+        frozen.metadata = frozen.metadata
+    for method, args in (
+        ("append", (Key(),)),
+        ("extend", ([Key()],)),
+        ("insert", (0, Key())),
+        ("remove", (key,)),
+        ("pop", ()),
+        ("clear", ()),
+        ("sort", ()),
+        ("reverse", ()),
+        ("__setitem__", (0, Key())),
+        ("__delitem__", (0,)),
+    ):
+        with pytest.raises(TypeError):
+            getattr(frozen.keys, method)(*args)
+    with pytest.raises(TypeError):
+        frozen.keys += [Key()]
+    assert frozen.to_json() == keyboard.to_json()
+
+
+def test_original_stays_mutable():
+    keyboard = Keyboard.from_json([["A", "B"]], validate="off")
+    frozen = keyboard.freeze()
+    keyboard.keys[0].labels[0].text = "edited"
+    keyboard.keys.append(Key())
+    assert frozen.to_json() == [["A", "B"]]
+    assert not frozen.equals(keyboard)
+    # thawed copies are independent of the snapshot
+    thawed = frozen.thaw()
+    thawed.keys[0].labels[0].text = "C"
+    thawed.keys[1].switch.brand = "cherry"
+    assert frozen.to_json() == [["A", "B"]]
+    assert thawed.thaw() is not thawed
+    assert thawed.keys[0].labels[0].text == "C"
+
+
+def test_concurrent_reads(load):
+    frozen = load("tomy.json").freeze()
+    expected = frozen.dumps()
+    results = list()
+
+    def read():
+        for _ in range(5):
+            results.append(frozen.dumps() == expected and frozen.fingerprint())
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [frozen.fingerprint()] * 20
+
+
+def test_keyboard_cache():
+    cache = KeyboardCache()
+    frozen = cache.get([["A", "B"]], frozen=True)
+    assert frozen.is_frozen
+    assert cache.get('[["A","B"]]', frozen=True) is frozen
+    keyboard = cache.get([["A", "B"]])
+    assert not keyboard.is_frozen
+    assert keyboard.equals(frozen)
+    # first requests get the parsed keyboard
+    assert not cache.get([["C"]]).is_frozen
+
+
+def test_hash(load):
+    keyboard = load("ergodox.json")
+    frozen = keyboard.freeze()
+    # only snapshots hash by content, mutable objects hash by identity
+    assert len({keyboard, copy.deepcopy(keyboard)}) == 2
+    assert len({keyboard.keys[0], copy.deepcopy(keyboard.keys[0])}) == 2
+    assert len({frozen, keyboard.freeze()}) == 1
+    assert len(set(frozen.keys)) == len({key.fingerprint() for key in keyboard.keys})
+    assert hash(frozen.metadata) == hash(keyboard.freeze().metadata)
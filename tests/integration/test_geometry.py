@@ -0,0 +1,90 @@
+import pytest
+from damsenviet.kle import (
+    Keyboard,
+    Key,
+    KeyGeometry,
+)
+
+
+def assert_close(points, other_points):
+    assert len(points) == len(other_points)
+    for point, other_point in zip(points, other_points):
+        assert point == pytest.approx(other_point, abs=1e-9)
+
+
+def test_vectorized(keyboard: Keyboard):
+    pytest.importorskip("numpy")
+    geometry = keyboard.geometry(vectorized=False)
+    others = [
+        keyboard.geometry(vectorized=True),
+        KeyGeometry.from_table(keyboard.to_table(), vectorized=True),
+        KeyGeometry.from_table(keyboard.to_table(), vectorized=False),
+    ]
+    for other in others:
+        assert len(other) == len(geometry) == len(keyboard.keys)
+        assert_close([other.extent or ()], [geometry.extent or ()])
+        for i in range(len(geometry)):
+            assert_close(other.corners(i), geometry.corners(i))
+            assert_close(other.secondary_corners(i), geometry.secondary_corners(i))
+            assert_close([other.center(i)], [geometry.center(i)])
+            assert_close([other.bounds(i)], [geometry.bounds(i)])
+    arrays = others[0].to_numpy()
+    assert arrays["corners"].shape == (len(geometry), 4, 2)
+    assert arrays["bounds"].shape == (len(geometry), 4)
+
+
+def test_bounds(keyboard: Keyboard):
+    geometry = keyboard.geometry(vectorized=False)
+    for i in range(len(geometry)):
+        min_x, min_y, max_x, max_y = geometry.bounds(i)
+        for x, y in geometry.corners(i) + geometry.secondary_corners(i):
+            assert min_x <= x <= max_x and min_y <= y <= max_y
+        center_x, center_y = geometry.center(i)
+        assert min_x <= center_x <= max_x and min_y <= center_y <= max_y
+        extent = geometry.extent
+        assert extent[0] <= min_x and extent[1] <= min_y
+        assert max_x <= extent[2] and max_y <= extent[3]
+
+
+@pytest.mark.parametrize("vectorized", [False, None])
+def test_rotation(vectorized):
+    keyboard = Keyboard.from_json(
+        [[{"r": 90, "rx": 1, "ry": 1, "w": 2}, "A"], [{"r": 0, "x": 0.25}, "B"]],
+        validate="off",
+    )
+    geometry = keyboard.geometry(vectorized)
+    # rotated clockwise about (1, 1)
+    assert_close(geometry.corners(0), [(1, 1), (1, 3), (0, 3), (0, 1)])
+    assert_close([geometry.center(0)], [(0.5, 2)])
+    assert_close([geometry.bounds(0)], [(0, 1, 1, 3)])
+    # unrotated keys keep exact coordinates
+    key = keyboard.keys[1]
+    assert geometry.corners(1)[0] == (key.x, key.y)
+    assert geometry.bounds(-1) == (key.x, key.y, key.x + 1, key.y + 1)
+    assert_close([geometry.extent], [(0, 1, key.x + 1, 3)])
+
+
+@pytest.mark.parametrize("vectorized", [False, None])
+def test_secondary_shape(vectorized):
+    # ISO enter
+    keyboard = Keyboard.from_json(
+        [[{"x": 0.25, "w": 1.25, "h": 2, "w2": 1.5, "h2": 1, "x2": -0.25}, "Enter"]],
+        validate="off",
+    )
+    geometry = keyboard.geometry(vectorized)
+    assert geometry.corners(0) == [(0.25, 0), (1.5, 0), (1.5, 2), (0.25, 2)]
+    assert geometry.secondary_corners(0) == [(0, 0), (1.5, 0), (1.5, 1), (0, 1)]
+    assert geometry.bounds(0) == (0, 0, 1.5, 2)
+    assert geometry.center(0) == (0.875, 1)
+
+
+def test_empty():
+    geometry = Keyboard().geometry()
+    assert len(geometry) == 0
+    assert geometry.extent is None
+    geometry = KeyGeometry([Key()], vectorized=False)
+    assert geometry.extent == (0, 0, 1, 1)
+    with pytest.raises(IndexError):
+        geometry.corners(1)
+    with pytest.raises(IndexError):
+        geometry.bounds(-2)
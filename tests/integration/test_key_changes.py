@@ -0,0 +1,189 @@
+import io
+import tracemalloc
+import copy
+import pytest
+from damsenviet.kle import (
+    Keyboard,
+    Key,
+    Label,
+    Switch,
+    KeyList,
+)
+
+
+def cached(keyboard: Keyboard) -> Keyboard:
+    keyboard.caches_rows = True
+    # fills the row cache
+    keyboard.dumps()
+    return keyboard
+
+
+@pytest.fixture
+def keyboard(keyboard: Keyboard) -> Keyboard:
+    return cached(keyboard)
+
+
+def assert_serialized_from_scratch(keyboard: Keyboard):
+    # copies start without cached rows
+    reference = copy.deepcopy(keyboard)
+    assert keyboard.to_json() == reference.to_json()
+    assert keyboard.dumps() == reference.dumps()
+    assert keyboard.dumps(minified=True) == reference.dumps(minified=True)
+
+
+def test_key_edits(keyboard: Keyboard):
+    if len(keyboard.keys) == 0:
+        return
+    key = keyboard.keys[len(keyboard.keys) // 2]
+    key.labels[0].text = "edited"
+    assert_serialized_from_scratch(keyboard)
+    key.labels[4].size = 7
+    key.labels[0].color = "#123456"
+    assert_serialized_from_scratch(keyboard)
+    key.color = "#abcdef"
+    key.is_homing = True
+    assert_serialized_from_scratch(keyboard)
+    key.switch.brand = "cherry"
+    assert_serialized_from_scratch(keyboard)
+    key.x += 0.25
+    assert_serialized_from_scratch(keyboard)
+    key.y += 1
+    assert_serialized_from_scratch(keyboard)
+    keyboard.keys[0].rotation_angle = 15
+    assert_serialized_from_scratch(keyboard)
+
+
+def test_list_edits(keyboard: Keyboard):
+    keys = keyboard.keys
+    added = Key()
+    added.y = 0.5
+    added.labels[0].text = "added"
+    keys.append(added)
+    assert_serialized_from_scratch(keyboard)
+    keys.insert(0, copy.deepcopy(added))
+    assert_serialized_from_scratch(keyboard)
+    removed = keys.pop(len(keys) // 2)
+    assert_serialized_from_scratch(keyboard)
+    del keys[:2]
+    assert_serialized_from_scratch(keyboard)
+    keys.reverse()
+    assert_serialized_from_scratch(keyboard)
+    # removed keys are no longer tracked, putting one back is a change
+    removed.labels[0].text = "removed"
+    keys.append(removed)
+    assert_serialized_from_scratch(keyboard)
+    keys[0:1] = [removed]
+    assert_serialized_from_scratch(keyboard)
+    keys.clear()
+    assert_serialized_from_scratch(keyboard)
+
+
+def test_replaced_labels_and_switch():
+    keyboard = cached(Keyboard.from_json([["A", "B"], ["C"]], validate="off"))
+    key = keyboard.keys[1]
+    old_label = key.labels[0]
+    label = Label()
+    label.text = "X"
+    key.labels[0] = label
+    assert_serialized_from_scratch(keyboard)
+    # replaced labels no longer belong to the key
+    old_label.text = "ignored"
+    label.text = "Y"
+    assert keyboard.to_json() == [["A", "Y"], ["C"]]
+    label = Label()
+    label.text = "Z"
+    key.labels = [label]
+    assert keyboard.to_json() == [["A", "Z"], ["C"]]
+    switch = Switch()
+    switch.mount = "alps"
+    key.switch = switch
+    assert_serialized_from_scratch(keyboard)
+    switch.type = "SKCM"
+    assert_serialized_from_scratch(keyboard)
+
+
+def test_metadata_edits():
+    keyboard = cached(Keyboard.from_json([{"name": "a"}, ["A"]], validate="off"))
+    keyboard.metadata.name = "b"
+    keyboard.metadata.switch.mount = "cherry"
+    assert_serialized_from_scratch(keyboard)
+
+
+def test_abandoned_serialization():
+    keyboard = cached(Keyboard.from_json([["A", "B"], ["C"], ["D"]], validate="off"))
+    keyboard.keys[2].labels[0].text = "E"
+
+    class FailingWriter(io.StringIO):
+        def write(self, text):
+            if self.tell() > 0:
+                raise OSError("disk full")
+            return super().write(text)
+
+    with pytest.raises(OSError):
+        keyboard.dump(FailingWriter())
+    assert keyboard.to_json() == [["A", "B"], ["E"], ["D"]]
+
+
+def test_returned_rows_are_copies():
+    keyboard = cached(Keyboard.from_json([[{"fa": [1, 2]}, "A\nB"]], validate="off"))
+    keyboard_json = keyboard.to_json()
+    keyboard_json[0][0]["fa"].append(3)
+    keyboard_json[0].append("C")
+    assert keyboard.to_json() == [[{"fa": [1, 2]}, "A\nB"]]
+
+
+def test_key_list():
+    keyboard = Keyboard()
+    keyboard.keys = [Key()]
+    assert type(keyboard.keys) is KeyList
+    keys = KeyList([Key()])
+    keyboard.keys = keys
+    assert keyboard.keys is keys
+
+
+def test_caching_is_opt_in(load):
+    keyboard = load("ergodox.json")
+    assert not keyboard.caches_rows
+    text = keyboard.dumps()
+    label = keyboard.keys[0].labels[0]
+    label_text = label.text
+    label.text = "edited"
+    assert keyboard.keys._row_cache is None
+    cached(keyboard)
+    assert keyboard.keys._row_cache is not None
+    # kept by new lists of keys, dropped when turned off
+    keyboard.keys = list(keyboard.keys)
+    assert keyboard.caches_rows
+    keyboard.caches_rows = False
+    assert keyboard.keys._row_cache is None
+    label.text = label_text
+    assert keyboard.dumps() == text
+
+
+def test_dump_memory(load):
+    keyboard = Keyboard()
+    layout = load("ansi-104.json")
+    for i in range(50):
+        for key in layout.keys:
+            key = copy.deepcopy(key)
+            key.y += i * 7
+            keyboard.keys.append(key)
+
+    class DiscardingWriter:
+        size = 0
+
+        def write(self, text):
+            self.size += len(text)
+
+    writer = DiscardingWriter()
+    keyboard.dump(writer)
+    writer = DiscardingWriter()
+    tracemalloc.start()
+    try:
+        keyboard.dump(writer)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # rows are streamed, only the order of the keys is kept
+    assert peak < writer.size / 2
+    assert retained < writer.size / 20
@@ -0,0 +1,93 @@
+import copy
+import random
+from itertools import groupby
+from damsenviet.kle import (
+    Keyboard,
+    Key,
+    KeyList,
+)
+
+
+def criteria(key: Key):
+    return (
+        (key.rotation_angle + 360) % 360,
+        key.rotation_x,
+        key.rotation_y,
+        key.y,
+        key.x,
+    )
+
+
+def assert_sorted(keys: KeyList):
+    expected = sorted(keys, key=criteria)
+    assert all(a is b for a, b in zip(keys.iter_sorted(), expected))
+    assert len(list(keys.iter_sorted())) == len(expected)
+
+
+def test_iter_sorted(keyboard: Keyboard, file_name: str):
+    keys = keyboard.keys
+    assert_sorted(keys)
+    rng = random.Random(file_name)
+    for _ in range(50):
+        if len(keys) == 0:
+            keys.append(Key())
+        key = rng.choice(keys)
+        operation = rng.randrange(6)
+        if operation == 0:
+            key.x += rng.choice([-1, 0.5, 1])
+        elif operation == 1:
+            key.y += rng.choice([-1, 1])
+        elif operation == 2:
+            key.rotation_angle = rng.choice([0, -15, 345])
+        elif operation == 3:
+            keys.remove(key)
+        elif operation == 4:
+            keys.insert(rng.randrange(len(keys) + 1), copy.deepcopy(key))
+        else:
+            keys.append(copy.deepcopy(key))
+        assert_sorted(keys)
+
+
+def test_equal_positions_keep_list_order():
+    keys = KeyList([Key() for i in range(3)])
+    assert_sorted(keys)
+    keys.append(Key())
+    assert_sorted(keys)
+    keys.reverse()
+    assert_sorted(keys)
+    keys[1].x = 1
+    assert_sorted(keys)
+    keys[1].x = 0
+    assert_sorted(keys)
+
+
+def test_iter_rows_and_clusters(keyboard: Keyboard):
+    expected = sorted(keyboard.keys, key=criteria)
+    rows = list(keyboard.keys.iter_rows())
+    assert [key for row in rows for key in row] == expected
+    assert [
+        len(list(group))
+        for _, group in groupby(expected, key=lambda key: criteria(key)[:4])
+    ] == [len(row) for row in rows]
+    clusters = list(keyboard.keys.iter_clusters())
+    assert [key for cluster in clusters for key in cluster] == expected
+    for cluster in clusters:
+        assert len({criteria(key)[:3] for key in cluster}) == 1
+
+
+def test_keys_held_more_than_once():
+    keys = Keyboard.from_json([["A", "B"]], validate="off").keys
+    a, b = keys
+    keys.append(a)
+    keys.remove(a)
+    # still held, still notified
+    a.x = 5
+    assert_sorted(keys)
+    keys *= 3
+    assert len(keys) == 6
+    del keys[:5]
+    assert list(keys) == [a]
+    a.y = 1
+    assert_sorted(keys)
+    keys *= 0
+    assert list(keys.iter_sorted()) == []
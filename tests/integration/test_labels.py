@@ -0,0 +1,74 @@
+import pytest
+from copy import deepcopy
+from damsenviet.kle import (
+    Keyboard,
+    Key,
+    Label,
+)
+
+
+def test_materialized_defaults():
+    key = Key()
+    key.default_text_color = "#111111"
+    key.default_text_size = 5
+    assert key.labels.items() == []
+    label = key.labels[-1]
+    assert (label.text, label.color, label.size) == ("", "#111111", 5)
+    label.text = "Enter"
+    assert key.labels.items() == [(11, label)]
+    assert key.labels[11].text == "Enter"
+    assert len(key.labels) == 12
+    assert len(list(key.labels)) == 12
+    with pytest.raises(IndexError):
+        key.labels[12]
+
+
+def test_reads_stay_sparse():
+    keyboard = Keyboard.from_json([["A"]], validate="off")
+    key = keyboard.keys[0]
+    fingerprint = key.fingerprint()
+    assert [label.text for label in key.labels] == ["A"] + [""] * 11
+    assert key.labels[3].size == 3
+    assert [i for i, _ in key.labels.items()] == [0]
+    assert key.fingerprint() == fingerprint
+    # detached labels are inserted once changed, and track the key after
+    label = key.labels[3]
+    label.size = 5
+    assert key.labels[3] is label
+    assert [i for i, _ in key.labels.items()] == [0, 3]
+    label.text = "B"
+    restored = Keyboard.from_json(keyboard.to_json(), validate="off").keys[0]
+    assert (restored.labels[3].text, restored.labels[3].size) == ("B", 5)
+    frozen = keyboard.freeze().keys[0]
+    assert frozen.labels[5].text == ""
+    assert [i for i, _ in frozen.labels.items()] == [0, 3]
+
+
+def test_assigned_labels():
+    key = Key()
+    label = Label()
+    label.text = "A"
+    key.labels = [label]
+    assert key.labels[0] is label
+    key.labels[3] = label
+    assert [i for i, _ in key.labels.items()] == [0, 3]
+
+
+def test_copied_labels():
+    key = Key()
+    key.labels[2].text = "B"
+    copy = deepcopy(key)
+    copy.default_text_size = 7
+    assert copy.labels[2].text == "B"
+    assert copy.labels[2] is not key.labels[2]
+    # unpopulated labels follow the copied key's defaults
+    assert copy.labels[5].size == 7
+    assert key.labels[5].size == 3
+
+
+def test_sparse_deserialization(load_json):
+    keyboard = Keyboard.from_json(load_json("ansi-104.json"))
+    for key in keyboard.keys:
+        populated = key.labels.items()
+        assert len(populated) < 12
+        assert all(label.text != "" for _, label in populated)
@@ -0,0 +1,63 @@
+import json
+import pickle
+import pytest
+from damsenviet.kle import (
+    Keyboard,
+    json_dump_options,
+)
+
+
+def dumps(keyboard_json):
+    return json.dumps(keyboard_json, **json_dump_options)
+
+
+def test_pickle(keyboard_json):
+    keyboard = Keyboard.from_json(keyboard_json)
+    unpickled = pickle.loads(pickle.dumps(keyboard, pickle.HIGHEST_PROTOCOL))
+    assert dumps(keyboard_json) == dumps(unpickled.to_json())
+    for key, unpickled_key in zip(keyboard.keys, unpickled.keys):
+        # labels still materialize with their own key's defaults
+        assert [(label.text, label.color, label.size) for label in key.labels] == [
+            (label.text, label.color, label.size) for label in unpickled_key.labels
+        ]
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_load_many_ordered(input_paths, executor: str):
+    results = list(Keyboard.load_many(input_paths, workers=2, executor=executor))
+    assert [path for path, _ in results] == input_paths
+    for path, keyboard in results:
+        with open(path, "r") as input_file:
+            keyboard_json = json.load(input_file)
+        assert dumps(keyboard_json) == dumps(keyboard.to_json())
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_load_many_as_completed(input_paths, executor: str):
+    results = dict(
+        Keyboard.load_many(input_paths, workers=2, executor=executor, ordered=False)
+    )
+    assert sorted(results.keys()) == input_paths
+    assert all(type(keyboard) is Keyboard for keyboard in results.values())
+
+
+def test_load_many_errors(input_paths, tmp_path):
+    invalid_path = str(tmp_path / "invalid.json")
+    with open(invalid_path, "w") as output_file:
+        output_file.write("[1]")
+    missing_path = str(tmp_path / "missing.json")
+    results = list(
+        Keyboard.load_many(
+            [invalid_path, input_paths[0], missing_path],
+            executor="thread",
+            validate="fast",
+        )
+    )
+    assert isinstance(results[0][1], Exception)
+    assert type(results[1][1]) is Keyboard
+    assert isinstance(results[2][1], FileNotFoundError)
+
+
+def test_load_many_invalid_executor(input_paths):
+    with pytest.raises(ValueError):
+        Keyboard.load_many(input_paths, executor="fiber")
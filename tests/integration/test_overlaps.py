@@ -0,0 +1,84 @@
+from damsenviet.kle import Keyboard
+from damsenviet.kle.geometry import _rectangles_overlap
+
+
+def flattened(corners):
+    return [value for corner in corners for value in corner]
+
+
+def scanned_overlaps(keyboard, tolerance):
+    keys = [key for key in keyboard.keys if not key.is_decal]
+    geometry = Keyboard.from_json([], validate="off")
+    geometry.keys.extend(keys)
+    geometry = geometry.geometry(vectorized=False)
+    rectangles = [
+        [
+            flattened(geometry.corners(i)),
+            flattened(geometry.secondary_corners(i)),
+        ]
+        for i in range(len(geometry))
+    ]
+    pairs = list()
+    for i in range(len(keys)):
+        for j in range(i + 1, len(keys)):
+            if any(
+                _rectangles_overlap(rectangle, other_rectangle, tolerance)
+                for rectangle in rectangles[i]
+                for other_rectangle in rectangles[j]
+            ):
+                pairs.append((i, j))
+    return [(keys[i], keys[j]) for i, j in pairs]
+
+
+def identities(pairs):
+    return [(id(key), id(other_key)) for key, other_key in pairs]
+
+
+def test_overlaps(keyboard: Keyboard):
+    expected = identities(scanned_overlaps(keyboard, 1e-6))
+    assert identities(keyboard.find_overlaps(vectorized=False)) == expected
+    assert identities(keyboard.find_overlaps()) == expected
+
+
+def test_shapes():
+    keyboard = Keyboard.from_json(
+        [
+            ["A", "B"],
+            # ISO enter, only its secondary rectangle reaches over the key to
+            # its left, by a quarter unit
+            [
+                "C",
+                {"x": 0.25, "w": 1.25, "h": 2, "w2": 1.75, "h2": 1, "x2": -0.5},
+                "Enter",
+            ],
+            # duplicated key
+            ["D", {"x": -1}, "D"],
+            # rotated counter clockwise into the keys above
+            [{"r": -30, "rx": 0, "ry": 3}, "E"],
+        ],
+        validate="off",
+    )
+    a, b, c, enter, d, duplicate, e = keyboard.keys
+    pairs = identities(keyboard.find_overlaps())
+    assert pairs == identities([(c, enter), (d, duplicate), (d, e), (duplicate, e)])
+    # keys sharing an edge don't overlap, unless the tolerance is negative
+    assert (id(a), id(b)) not in pairs and (id(a), id(c)) not in pairs
+    shared = identities(keyboard.find_overlaps(tolerance=-0.01))
+    assert (id(a), id(b)) in shared and (id(a), id(c)) in shared
+    assert (id(a), id(enter)) in shared and (id(c), id(d)) in shared
+    # shallower than the tolerance
+    assert identities(keyboard.find_overlaps(tolerance=0.3)) == identities(
+        [(d, duplicate), (d, e), (duplicate, e)]
+    )
+
+
+def test_decals():
+    keyboard = Keyboard.from_json(
+        [["A", {"x": -1, "d": True}, "Legend", "B"]], validate="off"
+    )
+    a, legend, b = keyboard.keys
+    assert keyboard.find_overlaps() == []
+    assert identities(keyboard.find_overlaps(include_decals=True)) == identities(
+        [(a, legend)]
+    )
+    assert Keyboard().find_overlaps() == []
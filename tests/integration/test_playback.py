@@ -0,0 +1,80 @@
+import pytest
+from damsenviet.kle import (
+    Keyboard,
+    PlaybackState,
+    register_key_change,
+    unregister_key_change,
+    register_metadata_change,
+    unregister_metadata_change,
+)
+
+
+@pytest.fixture
+def rotation():
+    def playback_rotation(state: PlaybackState, value: float):
+        state.key.rotation_angle = value
+
+    register_key_change("rotation", playback_rotation)
+    yield
+    unregister_key_change("rotation")
+
+
+def test_unknown_key_change_ignored():
+    keyboard = Keyboard.from_json([[{"rotation": 15}, "A"]], validate="off")
+    assert keyboard.keys[0].rotation_angle == 0
+
+
+def test_register_key_change(rotation):
+    keyboard = Keyboard.from_json([[{"rotation": 15}, "A", "B"]], validate="off")
+    assert keyboard.keys[0].rotation_angle == 15
+    assert keyboard.keys[1].rotation_angle == 15
+
+
+def test_key_change_priority():
+    def playback_offset(state: PlaybackState, value: float):
+        state.key.x += value
+
+    # before rx, which resets the position
+    register_key_change("offset", playback_offset, priority=-1)
+    try:
+        keyboard = Keyboard.from_json([[{"offset": 2, "rx": 1}, "A"]], validate="off")
+    finally:
+        unregister_key_change("offset")
+    assert keyboard.keys[0].x == 1
+
+    # after every built-in property by default
+    register_key_change("offset", playback_offset)
+    try:
+        keyboard = Keyboard.from_json([[{"offset": 2, "rx": 1}, "A"]], validate="off")
+    finally:
+        unregister_key_change("offset")
+    assert keyboard.keys[0].x == 3
+
+
+def test_key_change_order_independent():
+    # KLE applies rx before x, f before f2, a before t and w before w2
+    keyboard = Keyboard.from_json(
+        [[{"x": 1, "rx": 2, "f2": 5, "f": 4, "w2": 2, "w": 3}, "A\nB"]],
+        validate="off",
+    )
+    key = keyboard.keys[0]
+    assert key.x == 3
+    assert key.default_text_size == 4
+    assert key.labels[6].size == 5
+    assert key.width == 3
+    assert key.width2 == 2
+
+
+def test_register_metadata_change():
+    def playback_description(metadata, value: str):
+        metadata.notes = value
+
+    register_metadata_change("description", playback_description)
+    try:
+        keyboard = Keyboard.from_json(
+            [{"description": "notes"}, ["A"]],
+            validate="off",
+        )
+    finally:
+        unregister_metadata_change("description")
+    assert keyboard.metadata.notes == "notes"
@@ -0,0 +1,194 @@
+import math
+import random
+import pytest
+from damsenviet.kle import (
+    Keyboard,
+    Key,
+    SpatialIndex,
+)
+
+
+def holds(corners, x, y):
+    # convex polygon, corners in clockwise order with y down
+    for (x0, y0), (x1, y1) in zip(corners, corners[1:] + corners[:1]):
+        if (x1 - x0) * (y - y0) - (y1 - y0) * (x - x0) < -1e-9:
+            return False
+    return True
+
+
+def key_holds(geometry, i, x, y):
+    return holds(geometry.corners(i), x, y) or holds(
+        geometry.secondary_corners(i), x, y
+    )
+
+
+def scanned_distance(geometry, i, x, y):
+    # distance to the edges of both rectangles, 0 inside
+    if key_holds(geometry, i, x, y):
+        return 0.0
+    distance = math.inf
+    for corners in (geometry.corners(i), geometry.secondary_corners(i)):
+        for (x0, y0), (x1, y1) in zip(corners, corners[1:] + corners[:1]):
+            length = (x1 - x0) ** 2 + (y1 - y0) ** 2
+            t = 0 if length == 0 else ((x - x0) * (x1 - x0) + (y - y0) * (y1 - y0))
+            t = 0 if length == 0 else max(0, min(1, t / length))
+            distance = min(
+                distance, math.hypot(x0 + t * (x1 - x0) - x, y0 + t * (y1 - y0) - y)
+            )
+    return distance
+
+
+def random_points(geometry, count, seed):
+    generator = random.Random(seed)
+    min_x, min_y, max_x, max_y = geometry.extent
+    return [
+        (
+            generator.uniform(min_x - 1, max_x + 1),
+            generator.uniform(min_y - 1, max_y + 1),
+        )
+        for _ in range(count)
+    ]
+
+
+def test_queries(keyboard: Keyboard, file_name: str):
+    if len(keyboard.keys) == 0:
+        assert keyboard.spatial_index().nearest(0, 0) == []
+        return
+    geometry = keyboard.geometry(vectorized=False)
+    keys = keyboard.keys
+    # compared by identity, equal keys are distinct
+    positions = {id(key): i for i, key in enumerate(keys)}
+    points = list()
+    for x, y in random_points(geometry, 20, file_name):
+        held = [key for i, key in enumerate(keys) if key_holds(geometry, i, x, y)]
+        distances = sorted(
+            scanned_distance(geometry, i, x, y) for i in range(len(keys))
+        )
+        points.append((x, y, held, distances[:3]))
+    rectangles = list()
+    for (x, y), (other_x, other_y) in zip(
+        random_points(geometry, 10, file_name),
+        random_points(geometry, 10, file_name + "other"),
+    ):
+        bounds = (min(x, other_x), min(y, other_y), max(x, other_x), max(y, other_y))
+        # keys with a corner inside the rectangle intersect it
+        inside = [
+            key
+            for i, key in enumerate(keys)
+            if any(
+                bounds[0] < corner_x < bounds[2] and bounds[1] < corner_y < bounds[3]
+                for corner_x, corner_y in geometry.corners(i)
+            )
+        ]
+        rectangles.append((bounds, inside))
+    for cell_size in (0.5, 1, 4):
+        index = keyboard.spatial_index(cell_size=cell_size)
+        assert len(index) == len(keys)
+        for x, y, held, distances in points:
+            assert index.at(x, y) == held
+            nearest = index.nearest(x, y, count=3)
+            assert len(nearest) == len(distances)
+            for key, distance in zip(nearest, distances):
+                i = positions[id(key)]
+                assert scanned_distance(geometry, i, x, y) == pytest.approx(
+                    distance, abs=1e-9
+                )
+        for bounds, inside in rectangles:
+            found = index.intersecting(*bounds)
+            found_ids = {id(key) for key in found}
+            # as do keys holding a corner or the center of the rectangle
+            for point in (
+                bounds[:2],
+                bounds[2:],
+                ((bounds[0] + bounds[2]) / 2, (bounds[1] + bounds[3]) / 2),
+            ):
+                for key in index.at(*point):
+                    assert id(key) in found_ids
+            for key in inside:
+                assert id(key) in found_ids
+            # and keys apart from the rectangle don't
+            for key in found:
+                min_x, min_y, max_x, max_y = geometry.bounds(positions[id(key)])
+                assert min_x <= bounds[2] and bounds[0] <= max_x
+                assert min_y <= bounds[3] and bounds[1] <= max_y
+
+
+def test_rotated_shapes():
+    keyboard = Keyboard.from_json(
+        [
+            [{"r": 45, "rx": 2, "ry": 2}, "A"],
+            [
+                {
+                    "r": 0,
+                    "rx": 0,
+                    "ry": 0,
+                    "x": 4,
+                    "w": 1.25,
+                    "h": 2,
+                    "w2": 1.5,
+                    "h2": 1,
+                    "x2": -0.25,
+                },
+                "Enter",
+            ],
+        ],
+        validate="off",
+    )
+    rotated, enter = keyboard.keys
+    index = keyboard.spatial_index()
+    # rotated diamond, its bounds corner is outside
+    assert index.at(2.05, 2.5) == [rotated]
+    assert index.at(2.3, 2.1) == []
+    assert index.intersecting(2.4, 2, 2.7, 2.2) == []
+    assert index.intersecting(2.1, 2, 2.7, 2.2) == [rotated]
+    # secondary shape of the ISO enter
+    assert index.at(3.9, 0.5) == [enter]
+    assert index.at(3.9, 1.5) == []
+    assert index.nearest(3.9, 1.5) == [enter]
+    assert index.nearest(2, 2.5, count=5) == [rotated, enter]
+    # edges are included
+    assert index.at(5.25, 2) == [enter]
+    assert index.intersecting(5.25, 2, 6, 3) == [enter]
+    assert index.intersecting(5.26, 2, 6, 3) == []
+
+
+def test_updates():
+    keyboard = Keyboard.from_json([["A", "B"], ["C"]], validate="off")
+    a, b, c = keyboard.keys
+    index = keyboard.spatial_index()
+    assert index.at(1.5, 0.5) == [b]
+    b.x += 10
+    assert index.at(1.5, 0.5) == []
+    assert index.at(11.5, 0.5) == [b]
+    b.rotation_angle = 90
+    b.rotation_x = 11
+    assert index.at(11.5, 0.5) == []
+    assert index.at(10.5, 0.5) == [b]
+    # other edits keep the key in place
+    b.labels[0].text = "edited"
+    assert index.at(10.5, 0.5) == [b]
+    assert index.nearest(8, 0.5, count=2) == [b, a]
+    index.remove(a)
+    assert a not in index and len(index) == 2
+    assert index.at(0.5, 0.5) == []
+    a.x = 10
+    index.add(a)
+    index.add(a)
+    assert index.intersecting(9, 0, 12, 1) == [b, a]
+    with pytest.raises(ValueError):
+        index.remove(Key())
+    index.close()
+    assert len(index) == 0
+    assert index.at(0.5, 1.5) == []
+    c.x = 1
+    index.add(c)
+    assert index.at(1.5, 1.5) == [c]
+    with pytest.raises(ValueError):
+        SpatialIndex(cell_size=0)
+
+
+def test_frozen():
+    frozen = Keyboard.from_json([["A", "B"]], validate="off").freeze()
+    index = frozen.spatial_index(cell_size=2)
+    assert index.at(1.5, 0.5) == [frozen.keys[1]]
+    assert index.nearest(-5, -5) == [frozen.keys[0]]
@@ -0,0 +1,58 @@
+import io
+import json
+import pytest
+from jsonschema.exceptions import ValidationError
+from damsenviet.kle import (
+    Keyboard,
+    Metadata,
+    json_dump_options,
+)
+from damsenviet.kle.stream import _iter_json_rows
+
+
+@pytest.mark.parametrize("mode", ["r", "rb"])
+def test_iter_keys(input_path: str, keyboard_json, mode: str):
+    keyboard = Keyboard()
+    with open(input_path, mode) as input_file:
+        keyboard.keys.extend(Keyboard.iter_keys(input_file, metadata=keyboard.metadata))
+    assert json.dumps(keyboard_json, **json_dump_options) == json.dumps(
+        keyboard.to_json(),
+        **json_dump_options,
+    )
+
+
+def test_chunk_boundaries(input_path: str):
+    with open(input_path, "rb") as input_file:
+        text = input_file.read()
+    keyboard_json = json.loads(text)
+    rows = list()
+    for row in _iter_json_rows(io.BytesIO(text), "fast", chunk_size=7):
+        rows.append(row if type(row) is dict else list(row))
+    assert rows == keyboard_json
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "[[1]]",
+        '[["a"], {"name": "metadata after a row"}]',
+        '["not a row"]',
+    ],
+)
+def test_invalid_structure(text: str):
+    with pytest.raises(ValidationError):
+        list(Keyboard.iter_keys(io.StringIO(text)))
+
+
+@pytest.mark.parametrize("text", ["", "[", '[["a",]]', '[["a"]] []'])
+def test_invalid_json(text: str):
+    with pytest.raises(json.JSONDecodeError):
+        list(Keyboard.iter_keys(io.StringIO(text)))
+
+
+def test_metadata_defaults():
+    metadata = Metadata()
+    text = '[{"switchMount": "cherry"}, ["a", "b"]]'
+    keys = list(Keyboard.iter_keys(io.StringIO(text), metadata=metadata))
+    assert metadata.switch.mount == "cherry"
+    assert [key.switch.mount for key in keys] == ["cherry", "cherry"]
@@ -0,0 +1,151 @@
+import io
+import pytest
+import xml.etree.ElementTree as ElementTree
+from damsenviet.kle import (
+    Keyboard,
+    Key,
+    render_svg,
+)
+
+namespace = "{http://www.w3.org/2000/svg}"
+
+
+def rendered(keyboard: Keyboard, **kwargs) -> ElementTree.Element:
+    fp = io.StringIO()
+    render_svg(keyboard, fp, **kwargs)
+    return ElementTree.fromstring(fp.getvalue())
+
+
+def key_groups(svg: ElementTree.Element):
+    return [
+        group
+        for group in svg.iter(f"{namespace}g")
+        if group.get("class", "").split(" ")[0] == "key"
+    ]
+
+
+def classes(group: ElementTree.Element, name: str):
+    return [element for element in group if name in element.get("class", "").split(" ")]
+
+
+def test_render(keyboard: Keyboard):
+    svg = rendered(keyboard)
+    groups = key_groups(svg)
+    assert len(groups) == len(keyboard.keys)
+    for key, group in zip(keyboard.keys, groups):
+        borders = classes(group, "border")
+        tops = classes(group, "top")
+        if key.is_decal:
+            assert borders == [] and tops == []
+        else:
+            assert len(borders) == len(tops) in (1, 2)
+            assert tops[0].get("fill") == key.color
+        assert ("ghosted" in group.get("class")) == key.is_ghosted
+        assert (len(classes(group, "homing")) == 1) == (
+            key.is_homing and not key.is_decal
+        )
+        if key.rotation_angle == 0:
+            assert group.get("transform") is None
+        else:
+            assert group.get("transform").startswith("rotate(")
+        texts = classes(group, "label")
+        indexes = [i for i, label in key.labels.items() if label.text.strip() != ""]
+        assert len(texts) <= len(indexes)
+        for text in texts:
+            i = int(text.get("class").split("-")[-1])
+            assert i in indexes
+            assert text.get("fill") == key.labels[i].color
+
+
+def test_shapes():
+    keyboard = Keyboard.from_json(
+        [
+            [{"c": "#ff0000", "t": "#00ff00"}, "Q"],
+            [
+                {"x": 0.25, "w": 1.25, "h": 2, "w2": 1.5, "h2": 1, "x2": -0.25},
+                "Enter",
+            ],
+            [{"n": True, "g": True}, "F"],
+            [{"r": 45, "rx": 1, "ry": 2}, {"d": True}, "decal"],
+        ],
+        validate="off",
+    )
+    svg = rendered(keyboard, unit=100)
+    assert svg.get("viewBox").split(" ")[:2] == ["0", "0"]
+    q, enter, f, decal = key_groups(svg)
+    border, top = classes(q, "border")[0], classes(q, "top")[0]
+    assert border.get("fill") == "#cc0000" and top.get("fill") == "#ff0000"
+    assert float(border.get("x")) == pytest.approx(100 / 108)
+    text = classes(q, "label")[0]
+    assert text.text == "Q" and text.get("fill") == "#00ff00"
+    assert text.get("text-anchor") == "start"
+    # ISO enter, both shapes are outlined then filled again
+    assert [
+        float(rectangle.get(name))
+        for rectangle in classes(enter, "border")
+        for name in ("x", "width")
+    ] == pytest.approx(
+        [25 + 100 / 108, 125 - 100 / 54, 100 / 108, 150 - 100 / 54], abs=1e-4
+    )
+    assert len(classes(enter, "fill")) == 4
+    assert len(classes(f, "homing")) == 1 and f.get("opacity") == "0.3"
+    assert decal.get("transform") == "rotate(45 100 200)"
+    assert classes(decal, "border") == []
+    assert classes(decal, "label")[0].text == "decal"
+
+
+def test_labels():
+    keyboard = Keyboard()
+    labeled = Key()
+    for i, text in enumerate("abcdefghijkl"):
+        labeled.labels[i].text = text
+        labeled.labels[i].size = 4
+    labeled.labels[9].size = 9
+    html = Key()
+    html.x = 1
+    html.labels[0].text = "<b>Bold</b> &amp; <i>co</i><br>second line"
+    keyboard.keys.extend([labeled, html])
+    labeled, html = key_groups(rendered(keyboard))
+    texts = classes(labeled, "label")
+    assert [text.text for text in texts] == list("abcdefghijkl")
+    assert [text.get("text-anchor") for text in texts] == [
+        "start",
+        "middle",
+        "end",
+    ] * 4
+    # sized by the text size, front labels within the front of the keycap
+    assert float(texts[0].get("font-size")) == 14
+    assert float(texts[9].get("font-size")) == 9
+    # rows from the top down to the front
+    ys = [float(text.get("y")) for text in texts]
+    assert ys[0] < ys[3] < ys[6] < ys[9]
+    text = classes(html, "label")[0]
+    assert text.text == "Bold & co"
+    assert [tspan.text for tspan in text] == ["second line"]
+
+
+def test_binary(load):
+    keyboard = load("ergodox.json")
+    text = io.StringIO()
+    render_svg(keyboard, text)
+    data = io.BytesIO()
+    render_svg(keyboard, data)
+    assert data.getvalue() == text.getvalue().encode("utf-8")
+    svg = rendered(Keyboard())
+    assert key_groups(svg) == [] and svg.get("width") == "0"
+
+
+def test_invalid_characters():
+    key = Key()
+    key.color = "#fff\x00"
+    key.labels[0].text = "a\x01b&#2;c\udc80d"
+    key.labels[0].color = "\ud800red"
+    keyboard = Keyboard()
+    keyboard.keys.append(key)
+    data = io.BytesIO()
+    render_svg(keyboard, data)
+    svg = ElementTree.fromstring(data.getvalue())
+    (group,) = key_groups(svg)
+    assert classes(group, "top")[0].get("fill") == "#fff"
+    text = classes(group, "label")[0]
+    assert text.text == "abcd" and text.get("fill") == "red"
@@ -0,0 +1,42 @@
+import json
+import pytest
+from damsenviet.kle import (
+    Keyboard,
+    Key,
+    KeyTable,
+    json_dump_options,
+)
+
+
+def test_table(keyboard_json):
+    keyboard = Keyboard.from_json(keyboard_json)
+    table = keyboard.to_table()
+    assert len(table) == len(keyboard.keys)
+    assert list(table.columns["x"]) == [key.x for key in keyboard.keys]
+    assert list(table.columns["is_decal"]) == [key.is_decal for key in keyboard.keys]
+    direct_table = KeyTable.from_json(keyboard_json, validate="off")
+    assert direct_table.columns == table.columns
+    assert direct_table.label_columns == table.label_columns
+    assert json.dumps(keyboard_json, **json_dump_options) == json.dumps(
+        Keyboard.from_table(table).to_json(),
+        **json_dump_options,
+    )
+
+
+def test_to_numpy(load_json):
+    numpy = pytest.importorskip("numpy")
+    table = KeyTable.from_json(load_json("iso-105.json"))
+    arrays = table.to_numpy()
+    assert arrays["x"].dtype == numpy.float64
+    assert arrays["is_decal"].dtype == numpy.bool_
+    assert arrays["width"].tolist() == list(table.columns["width"])
+    # the arrays share memory with the table
+    arrays["width"][0] = 2
+    assert table.columns["width"][0] == 2
+    rows = len(table)
+    with pytest.raises(BufferError):
+        table.append(Key())
+    assert len(table) == rows
+    del arrays
+    table.append(Key())
+    assert len(table) == rows + 1
@@ -0,0 +1,46 @@
+import json
+import pytest
+from jsonschema.exceptions import ValidationError
+from damsenviet.kle import (
+    Keyboard,
+    json_dump_options,
+)
+
+
+@pytest.mark.parametrize("validate", ["fast", "off"])
+def test_validation_modes(keyboard_json, validate: str):
+    keyboard = Keyboard.from_json(keyboard_json, validate=validate)
+    assert json.dumps(keyboard_json, **json_dump_options) == json.dumps(
+        keyboard.to_json(),
+        **json_dump_options,
+    )
+
+
+@pytest.mark.parametrize(
+    "keyboard_json",
+    [
+        {},
+        [[], {"name": "metadata after a row"}],
+        [["label", 1]],
+        ["not a row"],
+    ],
+)
+def test_invalid_structure(keyboard_json):
+    with pytest.raises(ValidationError):
+        Keyboard.from_json(keyboard_json, validate="fast")
+
+
+@pytest.mark.parametrize("alignment", [8, -1, 1.5, "1", True])
+def test_invalid_alignment(alignment):
+    keyboard_json = [[{"a": alignment}, "a"]]
+    with pytest.raises(ValidationError) as fast_error:
+        Keyboard.from_json(keyboard_json, validate="fast")
+    with pytest.raises(ValidationError) as full_error:
+        Keyboard.from_json(keyboard_json, validate="full")
+    assert fast_error.value.message == full_error.value.message
+    assert fast_error.value.path == full_error.value.path
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        Keyboard.from_json([], validate="strict")